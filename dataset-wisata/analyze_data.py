@@ -1,56 +1,262 @@
-import pandas as pd
+"""
+Streaming profiler for the merged wisata dataset.
+
+Reads the CSV in chunks and builds every statistic in a single pass with
+memory that does not grow with the file:
+
+- exact value counts while a column has at most EXACT_COUNT_LIMIT distinct
+  values, then a HyperLogLog distinct estimate only (HLL runs for every
+  column, so the switch loses nothing)
+- null rates, length histograms (power-of-two buckets) and a few samples
+- min/max/mean for numeric columns and coordinate coverage on a 1 degree grid
+
+Usage:
+    python analyze_data.py
+    python analyze_data.py wisata_indonesia_merged_clean.csv --output profile.json --chunk-rows 200000
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
 import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent
+DEFAULT_FILE = BASE_DIR / "wisata_indonesia_merged_clean.csv"
+
+DEFAULT_CHUNK_ROWS = 100_000
+EXACT_COUNT_LIMIT = 1_000
+SAMPLE_VALUES = 3
+LENGTH_BUCKETS = 20  # 0, 1, 2-3, 4-7, ... up to 2^18 and longer
+NUMERIC_COLUMNS = ['latitude', 'longitude', 'rating', 'timeMinutes']
+
+# Indonesia bounds, same as merge_datasets.py
+LAT_RANGE = (-11, 6)
+LNG_RANGE = (95, 141)
+
+
+class HyperLogLog:
+    """Distinct-count sketch: 2^precision one-byte registers, ~1.04/sqrt(2^p) error"""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: pd.Series):
+        if values.empty:
+            return
+        hashes = pd.util.hash_array(values.to_numpy(dtype=object))
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = hashes << np.uint64(self.precision)
+
+        # Leading zeros of the remaining bits, split in 32-bit halves so the
+        # float log2 stays exact
+        high = (rest >> np.uint64(32)).astype(np.float64)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        with np.errstate(divide='ignore'):
+            zeros = np.where(high > 0, 31 - np.floor(np.log2(high)),
+                             np.where(low > 0, 63 - np.floor(np.log2(low)), 64))
+        rank = np.minimum(zeros, 64 - self.precision) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            return int(round(m * np.log(m / empty)))  # Linear counting for small sets
+        return int(round(raw))
+
+
+class ColumnProfile:
+    def __init__(self, name: str, numeric: bool = False):
+        self.name = name
+        self.numeric = numeric
+        self.rows = 0
+        self.nulls = 0
+        self.counts: Dict[str, int] = {}
+        self.exact = True
+        self.hll = HyperLogLog()
+        self.samples: List[str] = []
+        self.length_histogram = np.zeros(LENGTH_BUCKETS, dtype=np.int64)
+        self.length_total = 0
+        self.length_max = 0
+        self.numeric_count = 0
+        self.numeric_invalid = 0
+        self.numeric_sum = 0.0
+        self.numeric_min = np.inf
+        self.numeric_max = -np.inf
+
+    def update(self, values: pd.Series):
+        self.rows += len(values)
+        present = values[values.str.strip() != '']
+        self.nulls += len(values) - len(present)
+        self.hll.update(present)
+
+        if self.exact:
+            for value, count in present.value_counts(sort=False).items():
+                self.counts[value] = self.counts.get(value, 0) + int(count)
+            if len(self.counts) > EXACT_COUNT_LIMIT:
+                self.exact = False
+                self.counts = {}
+
+        if len(self.samples) < SAMPLE_VALUES:
+            self.samples.extend(present.head(SAMPLE_VALUES - len(self.samples)).tolist())
+
+        lengths = present.str.len().to_numpy(dtype=np.int64)
+        buckets = np.minimum(np.ceil(np.log2(lengths + 1)).astype(np.int64), LENGTH_BUCKETS - 1)
+        self.length_histogram += np.bincount(buckets, minlength=LENGTH_BUCKETS)
+        self.length_total += int(lengths.sum())
+        self.length_max = max(self.length_max, int(lengths.max(initial=0)))
+
+        if self.numeric:
+            numbers = pd.to_numeric(present, errors='coerce').to_numpy(dtype=float)
+            valid = numbers[~np.isnan(numbers)]
+            self.numeric_invalid += len(numbers) - len(valid)
+            self.numeric_count += len(valid)
+            self.numeric_sum += float(valid.sum())
+            if len(valid):
+                self.numeric_min = min(self.numeric_min, float(valid.min()))
+                self.numeric_max = max(self.numeric_max, float(valid.max()))
+
+    def to_dict(self, top: int) -> Dict[str, Any]:
+        present = self.rows - self.nulls
+        histogram = {}
+        for bucket, count in enumerate(self.length_histogram.tolist()):
+            if count:
+                low, high = (0, 0) if bucket == 0 else (1 << (bucket - 1), (1 << bucket) - 1)
+                label = f"{low}-{high}" if bucket < LENGTH_BUCKETS - 1 else f"{low}+"
+                histogram[label] = count
+
+        profile = {
+            'nulls': self.nulls,
+            'nullRate': round(self.nulls / self.rows, 4) if self.rows else 0.0,
+            'distinct': len(self.counts) if self.exact else self.hll.estimate(),
+            'distinctExact': self.exact,
+            'topValues': sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:top] if self.exact else None,
+            'length': {
+                'mean': round(self.length_total / present, 1) if present else 0.0,
+                'max': self.length_max,
+                'histogram': histogram,
+            },
+            'samples': self.samples,
+        }
+        if self.numeric:
+            profile['numeric'] = {
+                'count': self.numeric_count,
+                'invalid': self.numeric_invalid,
+                'min': self.numeric_min if self.numeric_count else None,
+                'max': self.numeric_max if self.numeric_count else None,
+                'mean': round(self.numeric_sum / self.numeric_count, 6) if self.numeric_count else None,
+            }
+        return profile
+
+
+class CoordinateCoverage:
+    """Valid / missing / out-of-bounds coordinates and 1 degree grid occupancy"""
+
+    def __init__(self):
+        self.missing = 0
+        self.out_of_bounds = 0
+        self.grid = np.zeros((LAT_RANGE[1] - LAT_RANGE[0], LNG_RANGE[1] - LNG_RANGE[0]), dtype=np.int64)
+
+    def update(self, latitude: pd.Series, longitude: pd.Series):
+        lat = pd.to_numeric(latitude, errors='coerce').to_numpy(dtype=float)
+        lng = pd.to_numeric(longitude, errors='coerce').to_numpy(dtype=float)
+        located = ~np.isnan(lat) & ~np.isnan(lng)
+        inside = (located & (lat >= LAT_RANGE[0]) & (lat <= LAT_RANGE[1])
+                  & (lng >= LNG_RANGE[0]) & (lng <= LNG_RANGE[1]))
+        self.missing += int((~located).sum())
+        self.out_of_bounds += int((located & ~inside).sum())
+
+        # Bounds are inclusive; points on the upper edge go to the last cell
+        rows = np.minimum((lat[inside] - LAT_RANGE[0]).astype(np.int64), self.grid.shape[0] - 1)
+        cols = np.minimum((lng[inside] - LNG_RANGE[0]).astype(np.int64), self.grid.shape[1] - 1)
+        np.add.at(self.grid, (rows, cols), 1)
+
+    def to_dict(self, top: int) -> Dict[str, Any]:
+        occupied = np.argwhere(self.grid > 0)
+        busiest = sorted(((int(self.grid[r, c]), r, c) for r, c in occupied.tolist()), reverse=True)[:top]
+        return {
+            'valid': int(self.grid.sum()),
+            'missing': self.missing,
+            'outOfBounds': self.out_of_bounds,
+            'gridCellsOccupied': len(occupied),
+            'gridCellsTotal': int(self.grid.size),
+            'busiestCells': [
+                {'lat': [LAT_RANGE[0] + r, LAT_RANGE[0] + r + 1], 'lng': [LNG_RANGE[0] + c, LNG_RANGE[0] + c + 1],
+                 'count': count}
+                for count, r, c in busiest
+            ],
+        }
+
+
+def profile_csv(path: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS, top: int = 30) -> Dict[str, Any]:
+    """Profile a CSV in one streaming pass"""
+    columns: Dict[str, ColumnProfile] = {}
+    coverage = CoordinateCoverage()
+    rows = chunks = 0
+
+    for chunk in pd.read_csv(path, chunksize=chunk_rows, dtype=str, keep_default_na=False):
+        chunks += 1
+        rows += len(chunk)
+        for column in chunk.columns:
+            if column not in columns:
+                columns[column] = ColumnProfile(column, numeric=column in NUMERIC_COLUMNS)
+            columns[column].update(chunk[column])
+        if 'latitude' in chunk and 'longitude' in chunk:
+            coverage.update(chunk['latitude'], chunk['longitude'])
+
+    return {
+        'file': str(path),
+        'rows': rows,
+        'chunks': chunks,
+        'columns': {name: column.to_dict(top) for name, column in columns.items()},
+        'coordinates': coverage.to_dict(top),
+    }
+
+
+def print_profile(profile: Dict[str, Any], top: int):
+    print(f"📊 {profile['file']}: {profile['rows']:,} rows in {profile['chunks']} chunk(s)\n")
+    for name, column in profile['columns'].items():
+        distinct = f"{column['distinct']:,}" + ('' if column['distinctExact'] else ' (approx)')
+        print(f"{name}: {distinct} unique, {column['nullRate']:.1%} missing, "
+              f"mean length {column['length']['mean']}")
+        if 'numeric' in column and column['numeric']['count']:
+            numeric = column['numeric']
+            print(f"   range {numeric['min']:.4f} to {numeric['max']:.4f}, invalid {numeric['invalid']}")
+        elif column['topValues']:
+            for value, count in column['topValues'][:top]:
+                print(f"   - {value[:80]}: {count}")
+
+    coordinates = profile['coordinates']
+    print(f"\n📍 Coordinates: {coordinates['valid']:,} valid, {coordinates['missing']:,} missing, "
+          f"{coordinates['outOfBounds']:,} outside Indonesia, "
+          f"{coordinates['gridCellsOccupied']}/{coordinates['gridCellsTotal']} grid cells occupied")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the merged wisata dataset in one streaming pass')
+    parser.add_argument('csv', nargs='?', type=Path, default=DEFAULT_FILE)
+    parser.add_argument('--output', type=Path, help='profile JSON (default: <csv>.profile.json)')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument('--top', type=int, default=10, help='top values printed per column')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    profile = profile_csv(args.csv, args.chunk_rows)
+    profile['elapsedSeconds'] = round(time.perf_counter() - start, 3)
+    print_profile(profile, args.top)
+
+    output = args.output or args.csv.with_suffix('.profile.json')
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Profile saved to {output} ({profile['elapsedSeconds']}s)")
 
-df = pd.read_csv('wisata_indonesia_merged_clean.csv')
-
-print('=== UNIQUE VALUES ANALYSIS ===\n')
-
-print('1. PROVINSI (unique values):')
-prov_unique = df['provinsi'].value_counts()
-print(f'Total unique: {df["provinsi"].nunique()}')
-print(f'Top 30:\n')
-for prov, count in prov_unique.head(30).items():
-    print(f'  - {prov}: {count}')
-
-print('\n2. KOTA KABUPATEN (unique values):')
-kota_unique = df['kotaKabupaten'].value_counts()
-print(f'Total unique: {df["kotaKabupaten"].nunique()}')
-print(f'Top 40:\n')
-for kota, count in kota_unique.head(40).items():
-    print(f'  - {kota}: {count}')
-
-print('\n3. ADDRESS CITY (unique values):')
-addr_city_unique = df['addressCity'].value_counts()
-print(f'Total unique: {df["addressCity"].nunique()}')
-print(f'Top 30:\n')
-for city, count in addr_city_unique.head(30).items():
-    print(f'  - {city}: {count}')
-
-print('\n4. ADDRESS (sample dengan data):')
-addr_with_data = df[df['address'].notna() & (df['address'] != '')]
-print(f'Total address dengan data: {len(addr_with_data)}')
-print('\nSample addresses:')
-for i, addr in enumerate(addr_with_data['address'].head(10), 1):
-    print(f'{i}. {addr[:150]}')
-
-print('\n5. LAT/LONG CHECK:')
-print(f'Invalid lat (<-11 or >6): {((df["latitude"] < -11) | (df["latitude"] > 6)).sum()}')
-print(f'Invalid lng (<95 or >141): {((df["longitude"] < 95) | (df["longitude"] > 141)).sum()}')
-print(f'Missing lat: {df["latitude"].isna().sum()}')
-print(f'Missing lng: {df["longitude"].isna().sum()}')
-print(f'Lat range: {df["latitude"].min():.4f} to {df["latitude"].max():.4f}')
-print(f'Lng range: {df["longitude"].min():.4f} to {df["longitude"].max():.4f}')
-
-print('\n6. CATEGORY (unique values):')
-cat_unique = df['category'].value_counts()
-print(f'Total unique: {df["category"].nunique()}')
-print(f'All categories:\n')
-for cat, count in cat_unique.items():
-    print(f'  - {cat}: {count}')
-
-print('\n7. DATA QUALITY CHECK:')
-print(f'Rows with missing provinsi: {(df["provinsi"].isna() | (df["provinsi"] == "")).sum()}')
-print(f'Rows with missing kotaKabupaten: {(df["kotaKabupaten"].isna() | (df["kotaKabupaten"] == "")).sum()}')
-print(f'Rows with missing address: {(df["address"].isna() | (df["address"] == "")).sum()}')
-print(f'Rows with missing description: {(df["description"].isna() | (df["description"] == "")).sum()}')
 
+if __name__ == '__main__':
+    main()
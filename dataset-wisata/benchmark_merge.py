@@ -0,0 +1,314 @@
+"""
+Regression and performance benchmark for merge_datasets.py.
+
+Two checks, each run in a fresh process so its peak memory is its own:
+
+- golden: the real source CSVs are merged (no cache) and the output CSV,
+  row count and every column are compared by hash with benchmarks/golden.json,
+  so an optimization that changes the result fails loudly; the spatial
+  blocking of dedupe.py is also checked against a brute-force pair search
+  on dense random points, so a blocking change cannot silently drop pairs
+- scale: synthetic sources (synthetic_data.py) of each requested size go
+  through every merge stage with wall time per stage and peak RSS recorded
+
+Every run is appended to benchmarks/history.json (commit, versions, CPU
+count) and compared with the previous run of the same size.
+
+Usage:
+    python benchmark_merge.py
+    python benchmark_merge.py --sizes 1000 100000 --trace-memory
+    python benchmark_merge.py --update-golden
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from consistency import check_province_consistency
+from dedupe import DEFAULT_RADIUS_M, candidate_pairs, haversine_m
+from merge_cache import frame_fingerprint
+from merge_datasets import clean_source, resolve
+from source_adapters import BASE_DIR, get_sources, normalize_source
+from synthetic_data import generate_sources
+
+BENCHMARK_DIR = BASE_DIR / "benchmarks"
+GOLDEN_FILE = BENCHMARK_DIR / "golden.json"
+HISTORY_FILE = BENCHMARK_DIR / "history.json"
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+# A stage slower than the previous run by more than this is reported
+REGRESSION_THRESHOLD = 0.20
+# Stages shorter than this are noise
+MIN_COMPARED_SECONDS = 0.05
+# Blocking recall: random points in small boxes far from the equator and at both ends of the archipelago
+RECALL_POINTS = 4_000
+RECALL_BOX_DEGREES = 0.1
+RECALL_CENTERS = [(-10.0, 140.0), (5.5, 95.3), (-8.5, 115.2)]
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_pipeline(source_dir: Path, output: Path,
+                 trace_memory: bool = False) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """Merge the registered sources found in source_dir stage by stage.
+
+    Mirrors merge_datasets.merge() without the stage cache and worker pool,
+    so every stage is measured doing its full work.
+    """
+    adapters = get_sources()
+    seconds: Dict[str, float] = {}
+    traced_mb: Dict[str, float] = {}
+    if trace_memory:
+        tracemalloc.start()
+
+    def stage(name, compute):
+        if trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        value = compute()
+        seconds[name] = time.perf_counter() - start
+        if trace_memory:
+            traced_mb[name] = tracemalloc.get_traced_memory()[1] / 1e6
+        return value
+
+    # The pipeline prints per-step progress; keep the benchmark output short
+    with contextlib.redirect_stdout(io.StringIO()):
+        raw = stage('load', lambda: [pd.read_csv(source_dir / adapter.file_name) for adapter in adapters])
+        normalized = stage('normalize', lambda: [normalize_source(a, df) for a, df in zip(adapters, raw)])
+        cleaned = stage('clean', lambda: [clean_source(df) for df in normalized])
+        combined = stage('combine', lambda: pd.concat(cleaned, ignore_index=True))
+        resolve_seconds: Dict[str, float] = {}
+        merged = stage('resolve', lambda: resolve(combined, resolve_seconds))
+        stage('consistency', lambda: check_province_consistency(merged))
+        stage('write', lambda: merged.to_csv(output, index=False, encoding='utf-8'))
+
+    if trace_memory:
+        tracemalloc.stop()
+    result = {
+        'sourceRows': int(sum(len(df) for df in raw)),
+        'outputRows': len(merged),
+        'seconds': {name: round(value, 4) for name, value in seconds.items()},
+        'resolveSeconds': {name: round(value, 4) for name, value in resolve_seconds.items()},
+        'totalSeconds': round(sum(seconds.values()), 4),
+    }
+    if trace_memory:
+        result['tracedPeakMB'] = {name: round(value, 1) for name, value in traced_mb.items()}
+    return result, merged
+
+
+def benchmark_size(rows: int, seed: int, trace_memory: bool) -> Dict[str, Any]:
+    """One synthetic run (meant for a fresh process, see _in_fresh_process)"""
+    with tempfile.TemporaryDirectory(prefix='wisata-bench-') as tmp:
+        tmp = Path(tmp)
+        start = time.perf_counter()
+        generate_sources(rows, tmp / 'sources', seed=seed)
+        generate_seconds = time.perf_counter() - start
+        result, _ = run_pipeline(tmp / 'sources', tmp / 'merged.csv', trace_memory)
+    return {
+        'rows': rows,
+        'seed': seed,
+        'generateSeconds': round(generate_seconds, 3),
+        **result,
+        'peakRssMB': round(_peak_rss_mb(), 1),
+    }
+
+
+def column_hashes(df: pd.DataFrame) -> Dict[str, str]:
+    return {column: frame_fingerprint(df[[column]])[:16] for column in df.columns}
+
+
+def golden_snapshot() -> Dict[str, Any]:
+    """Hashes of the merge of the real source CSVs"""
+    with tempfile.TemporaryDirectory(prefix='wisata-golden-') as tmp:
+        output = Path(tmp) / 'merged.csv'
+        result, merged = run_pipeline(BASE_DIR, output)
+        digest = hashlib.sha256(output.read_bytes()).hexdigest()
+    return {
+        'rows': len(merged),
+        'sha256': digest,
+        'columns': column_hashes(merged),
+        'totalSeconds': result['totalSeconds'],
+        'peakRssMB': round(_peak_rss_mb(), 1),
+    }
+
+
+def blocking_recall(seed: int, radius_m: float = DEFAULT_RADIUS_M) -> Dict[str, int]:
+    """Pairs within radius_m found by candidate_pairs vs. a brute-force search, per random box"""
+    rng = np.random.default_rng(seed)
+    expected = missed = 0
+    for center_lat, center_lng in RECALL_CENTERS:
+        half = RECALL_BOX_DEGREES / 2
+        lat = center_lat + rng.uniform(-half, half, RECALL_POINTS)
+        lng = center_lng + rng.uniform(-half, half, RECALL_POINTS)
+        found = candidate_pairs(lat, lng, radius_m)
+        found = set(zip(found['a'].tolist(), found['b'].tolist()))
+        for a in range(RECALL_POINTS - 1):
+            distance = haversine_m(lat[a], lng[a], lat[a + 1:], lng[a + 1:])
+            for b in (np.flatnonzero(distance <= radius_m) + a + 1).tolist():
+                expected += 1
+                missed += (a, b) not in found
+    return {'pairs': expected, 'missed': missed}
+
+
+def check_recall(recall: Dict[str, int]) -> str:
+    """'pass' or 'fail'; prints the blocking recall"""
+    if recall['missed']:
+        print(f"   ❌ Spatial blocking missed {recall['missed']} of {recall['pairs']:,} pairs within "
+              f"{DEFAULT_RADIUS_M:.0f} m")
+        return 'fail'
+    print(f"   ✅ Spatial blocking found all {recall['pairs']:,} pairs within {DEFAULT_RADIUS_M:.0f} m")
+    return 'pass'
+
+
+def _in_fresh_process(fn, *args):
+    """Run fn in a new interpreter so ru_maxrss starts from zero"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(fn, *args).result()
+
+
+def check_golden(snapshot: Dict[str, Any], golden: Optional[Dict[str, Any]]) -> str:
+    """'pass', 'fail' or 'missing'; prints what changed"""
+    if golden is None:
+        print(f"   ⚠️  No golden file yet, run with --update-golden to create {GOLDEN_FILE.name}")
+        return 'missing'
+    if snapshot['sha256'] == golden['sha256']:
+        print(f"   ✅ Output matches golden ({snapshot['rows']} rows, sha256 {snapshot['sha256'][:12]})")
+        return 'pass'
+
+    print(f"   ❌ Output differs from golden")
+    if snapshot['rows'] != golden['rows']:
+        print(f"      - rows: {golden['rows']} -> {snapshot['rows']}")
+    for column in sorted(set(snapshot['columns']) | set(golden['columns'])):
+        if snapshot['columns'].get(column) != golden['columns'].get(column):
+            print(f"      - column changed: {column}")
+    return 'fail'
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def load_json(path: Path, default):
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def print_run(run: Dict[str, Any], previous: Optional[Dict[str, Any]]):
+    print(f"   {run['rows']:,} rows -> {run['outputRows']:,} merged in {run['totalSeconds']:.2f}s, "
+          f"peak RSS {run['peakRssMB']:.0f} MB")
+    stages = {**run['seconds'], **{f"resolve.{k}": v for k, v in run['resolveSeconds'].items()}}
+    before = {}
+    if previous:
+        before = {**previous['seconds'], **{f"resolve.{k}": v for k, v in previous['resolveSeconds'].items()}}
+    for name, seconds in stages.items():
+        line = f"      {name:<28} {seconds:8.3f}s"
+        if name in before and max(seconds, before[name]) >= MIN_COMPARED_SECONDS:
+            change = seconds / before[name] - 1 if before[name] else 0.0
+            line += f"  ({change:+.0%})"
+            if change > REGRESSION_THRESHOLD:
+                line += "  ⚠️  slower"
+        print(line)
+
+
+def previous_run(history: List[Dict[str, Any]], rows: int, seed: int) -> Optional[Dict[str, Any]]:
+    for entry in reversed(history):
+        for run in entry.get('runs', []):
+            if run['rows'] == rows and run['seed'] == seed:
+                return run
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark merge_datasets.py on golden and synthetic data')
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES,
+                        help='synthetic source rows per run (none = golden check only)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--trace-memory', action='store_true', help='also record tracemalloc peak per stage (slower)')
+    parser.add_argument('--update-golden', action='store_true', help=f'rewrite {GOLDEN_FILE.name} from this run')
+    parser.add_argument('--skip-golden', action='store_true')
+    parser.add_argument('--no-history', action='store_true', help=f'do not append to {HISTORY_FILE.name}')
+    args = parser.parse_args()
+
+    history = load_json(HISTORY_FILE, [])
+    entry = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'environment': environment(),
+        'golden': 'skipped',
+        'recall': 'skipped',
+        'runs': [],
+    }
+
+    if not args.skip_golden:
+        print("🏅 Golden check on the real source CSVs...")
+        snapshot = _in_fresh_process(golden_snapshot)
+        if args.update_golden:
+            save_json(GOLDEN_FILE, {key: snapshot[key] for key in ('rows', 'sha256', 'columns')})
+            print(f"   💾 Golden updated: {snapshot['rows']} rows, sha256 {snapshot['sha256'][:12]}")
+            entry['golden'] = 'updated'
+        else:
+            entry['golden'] = check_golden(snapshot, load_json(GOLDEN_FILE, None))
+        entry['recall'] = check_recall(blocking_recall(args.seed))
+
+    for rows in args.sizes:
+        print(f"\n⏱️  Synthetic run: {rows:,} source rows (seed {args.seed})...")
+        run = _in_fresh_process(benchmark_size, rows, args.seed, args.trace_memory)
+        print_run(run, previous_run(history, rows, args.seed))
+        entry['runs'].append(run)
+
+    if not args.no_history:
+        history.append(entry)
+        save_json(HISTORY_FILE, history)
+        print(f"\n💾 Results appended to {HISTORY_FILE}")
+
+    if 'fail' in (entry['golden'], entry['recall']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Coordinate / provinsi consistency check for the merged wisata dataset.
+
+The merge only rejects coordinates outside Indonesia's bounding box, so a
+Jakarta POI carrying Bali coordinates slips through and later breaks route
+optimization and proximity queries. This stage learns a robust centroid
+(coordinate-wise median) and spread (MAD of distances to that centroid) for
+every provinsi, flags records unusually far from their stated provinsi and
+proposes the provinsi whose centroid they fit best.
+
+Everything is one vectorized pass: a groupby for the statistics and a
+rows x provinces distance matrix for the scores.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dedupe import EARTH_RADIUS_M
+
+# A record is flagged when it is this many robust spreads past its provinsi's
+# median distance, more than MIN_OUTLIER_KM from the centroid, and closer to
+# the proposed provinsi's centroid than to its own
+DEFAULT_MAX_SCORE = 6.0
+MIN_OUTLIER_KM = 200.0
+# Floor for the spread: sources cluster around a few cities per provinsi,
+# which would otherwise make the spread far smaller than the provinsi
+MIN_SPREAD_KM = 30.0
+# Provinsi with fewer records have no reliable centroid; their records are
+# not checked but the provinsi can still be proposed
+MIN_RECORDS = 5
+# 1.4826 * MAD estimates the standard deviation of normally distributed data
+MAD_SCALE = 1.4826
+
+
+def _distance_km(lat, lng, centroid_lat, centroid_lng) -> np.ndarray:
+    """Haversine distance, broadcasting rows against centroids"""
+    lat, lng, centroid_lat, centroid_lng = map(np.radians, (lat, lng, centroid_lat, centroid_lng))
+    h = (np.sin((centroid_lat - lat) / 2) ** 2
+         + np.cos(lat) * np.cos(centroid_lat) * np.sin((centroid_lng - lng) / 2) ** 2)
+    return 2 * EARTH_RADIUS_M / 1000 * np.arcsin(np.sqrt(h))
+
+
+def province_profiles(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-provinsi centroid, median distance and robust spread (km)"""
+    located = df[df['provinsi'].fillna('').ne('') & df['latitude'].notna() & df['longitude'].notna()]
+    profiles = located.groupby('provinsi')[['latitude', 'longitude']].median()
+    profiles['records'] = located.groupby('provinsi').size()
+
+    distance = _distance_km(
+        located['latitude'].to_numpy(), located['longitude'].to_numpy(),
+        profiles.loc[located['provinsi'], 'latitude'].to_numpy(),
+        profiles.loc[located['provinsi'], 'longitude'].to_numpy(),
+    )
+    distance = pd.Series(distance, index=located.index)
+    median = distance.groupby(located['provinsi']).transform('median')
+    profiles['median_km'] = distance.groupby(located['provinsi']).median()
+    mad = (distance - median).abs().groupby(located['provinsi']).median()
+    profiles['spread_km'] = np.maximum(MAD_SCALE * mad, MIN_SPREAD_KM)
+    return profiles
+
+
+def check_province_consistency(df: pd.DataFrame, max_score: float = DEFAULT_MAX_SCORE,
+                               min_outlier_km: float = MIN_OUTLIER_KM) -> pd.DataFrame:
+    """Records that sit far from their stated provinsi, with a proposed fix.
+
+    A record's score against a provinsi is how many spreads its distance to
+    that centroid lies past the provinsi's median distance. The proposal is
+    the provinsi with the lowest score, so a large provinsi (Papua) can claim
+    points a compact one (DKI Jakarta) could not.
+    """
+    columns = ['name', 'provinsi', 'latitude', 'longitude', 'distanceKm', 'score',
+               'suggestedProvinsi', 'suggestedDistanceKm', 'suggestedScore']
+    profiles = province_profiles(df)
+    checked = df[df['provinsi'].isin(profiles.index[profiles['records'] >= MIN_RECORDS])
+                 & df['latitude'].notna() & df['longitude'].notna()]
+    if checked.empty:
+        return pd.DataFrame(columns=columns)
+
+    # rows x provinces
+    distance = _distance_km(
+        checked['latitude'].to_numpy()[:, None], checked['longitude'].to_numpy()[:, None],
+        profiles['latitude'].to_numpy()[None, :], profiles['longitude'].to_numpy()[None, :],
+    )
+    score = (distance - profiles['median_km'].to_numpy()) / profiles['spread_km'].to_numpy()
+
+    rows = np.arange(len(checked))
+    own = profiles.index.get_indexer(checked['provinsi'])
+    best = score.argmin(axis=1)
+    flagged = ((score[rows, own] > max_score) & (distance[rows, own] > min_outlier_km)
+               & (best != own) & (distance[rows, best] < distance[rows, own]))
+
+    report = pd.DataFrame({
+        'name': checked['name'].to_numpy(),
+        'provinsi': checked['provinsi'].to_numpy(),
+        'latitude': checked['latitude'].to_numpy(),
+        'longitude': checked['longitude'].to_numpy(),
+        'distanceKm': distance[rows, own].round(1),
+        'score': score[rows, own].round(2),
+        'suggestedProvinsi': profiles.index.to_numpy()[best],
+        'suggestedDistanceKm': distance[rows, best].round(1),
+        'suggestedScore': score[rows, best].round(2),
+    }, index=checked.index)[flagged]
+    return report.sort_values('score', ascending=False)
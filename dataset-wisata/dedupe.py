@@ -0,0 +1,190 @@
+"""
+Entity resolution for merged wisata destinations.
+
+Exact dedupe on name + rounded coordinates misses the same place spelled
+differently across sources ("Pantai Parangtritis" vs "Parangtritis Beach").
+This stage:
+
+1. blocks candidates with a spatial grid (cell size = radius), so only
+   points in neighbouring cells are ever compared,
+2. scores name similarity on normalized tokens (diacritics folded, English
+   place types mapped to Indonesian) with character-trigram Jaccard,
+3. clusters matching pairs with union-find and keeps the most complete
+   record of each cluster.
+
+Blocking is a hash join on cell ids, so the cost stays near-linear in the
+number of rows plus candidate pairs.
+"""
+
+import re
+import unicodedata
+from typing import FrozenSet, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_M = 6371000.0
+DEFAULT_RADIUS_M = 250.0
+DEFAULT_MIN_SIMILARITY = 0.6
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Place-type words (Indonesian and English) mapped to one type per group
+PLACE_TYPES = {
+    'pantai': 'pantai', 'beach': 'pantai',
+    'candi': 'temple', 'pura': 'temple', 'klenteng': 'temple', 'vihara': 'temple', 'temple': 'temple',
+    'masjid': 'masjid', 'mosque': 'masjid',
+    'gereja': 'gereja', 'katedral': 'gereja', 'church': 'gereja', 'cathedral': 'gereja',
+    'museum': 'museum',
+    'taman': 'taman', 'kebun': 'taman', 'park': 'taman', 'garden': 'taman',
+    'danau': 'danau', 'telaga': 'danau', 'ranu': 'danau', 'lake': 'danau',
+    'gunung': 'gunung', 'mount': 'gunung', 'mountain': 'gunung', 'mt': 'gunung',
+    'bukit': 'bukit', 'hill': 'bukit',
+    'curug': 'air_terjun', 'coban': 'air_terjun', 'grojogan': 'air_terjun', 'waterfall': 'air_terjun',
+    'goa': 'goa', 'gua': 'goa', 'cave': 'goa',
+    'pulau': 'pulau', 'island': 'pulau',
+    'pasar': 'pasar', 'market': 'pasar',
+    'benteng': 'benteng', 'fort': 'benteng', 'fortress': 'benteng',
+    'keraton': 'keraton', 'kraton': 'keraton', 'istana': 'keraton', 'palace': 'keraton',
+    'monumen': 'monumen', 'tugu': 'monumen', 'monument': 'monumen',
+    'kawah': 'kawah', 'crater': 'kawah',
+}
+PHRASES = {'air terjun': 'curug'}
+STOPWORDS = {'di', 'dan', 'the', 'of', 'and', 'wisata', 'objek'}
+
+# Columns that make a record more useful to keep as the cluster survivor
+COMPLETENESS_COLUMNS = ['address', 'description', 'rating', 'timeMinutes', 'provinsi', 'kotaKabupaten']
+
+
+def normalize_name(name) -> Tuple[str, FrozenSet[str]]:
+    """(distinctive key, place types) for a destination name"""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii').lower()
+    text = ' '.join(TOKEN_RE.findall(text))
+    for phrase, replacement in PHRASES.items():
+        text = re.sub(rf'\b{phrase}\b', replacement, text)
+
+    tokens = [token for token in text.split() if token not in STOPWORDS]
+    types = frozenset(PLACE_TYPES[token] for token in tokens if token in PLACE_TYPES)
+    distinctive = sorted({token for token in tokens if token not in PLACE_TYPES})
+    # A name made only of type words ("Pantai") is its own key
+    key = ' '.join(distinctive) if distinctive else ' '.join(sorted(types))
+    return key, types
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def _similarity(grams_a: FrozenSet[str], types_a: FrozenSet[str],
+                grams_b: FrozenSet[str], types_b: FrozenSet[str]) -> float:
+    if types_a and types_b and not types_a & types_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
+
+
+def name_similarity(a, b) -> float:
+    """Trigram Jaccard of the normalized keys; 0 when place types conflict"""
+    key_a, types_a = normalize_name(a)
+    key_b, types_b = normalize_name(b)
+    if not key_a or not key_b:
+        return 0.0
+    return _similarity(trigrams(key_a), types_a, trigrams(key_b), types_b)
+
+
+def haversine_m(lat1, lng1, lat2, lng2) -> np.ndarray:
+    lat1, lng1, lat2, lng2 = map(np.radians, (lat1, lng1, lat2, lng2))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(h))
+
+
+def candidate_pairs(latitude: np.ndarray, longitude: np.ndarray, radius_m: float) -> pd.DataFrame:
+    """Row pairs (a < b) within radius_m, blocked on a grid of radius-sized cells"""
+    lat = np.radians(latitude)
+    # One column width for the whole batch, taken at the latitude farthest from the equator: every
+    # column is then at least radius_m wide, so a pair within radius_m is at most one column apart
+    x_scale = np.cos(np.nanmax(np.abs(lat))) if np.isfinite(lat).any() else 1.0
+    cells = pd.DataFrame({
+        'row': np.arange(len(latitude)),
+        'cx': np.floor(np.radians(longitude) * x_scale * EARTH_RADIUS_M / radius_m).astype(np.int64),
+        'cy': np.floor(lat * EARTH_RADIUS_M / radius_m).astype(np.int64),
+    })
+
+    # Same cell plus half of the 8 neighbours, so each cell pair is joined once
+    pairs = []
+    for dx, dy in [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]:
+        shifted = cells.assign(cx=cells['cx'] + dx, cy=cells['cy'] + dy)
+        joined = shifted.merge(cells, on=['cx', 'cy'], suffixes=('_a', '_b'))[['row_a', 'row_b']]
+        if (dx, dy) == (0, 0):
+            joined = joined[joined['row_a'] < joined['row_b']]
+        pairs.append(joined)
+
+    pairs = pd.concat(pairs, ignore_index=True)
+    a, b = pairs['row_a'].to_numpy(), pairs['row_b'].to_numpy()
+    swap = a > b
+    pairs = pd.DataFrame({'a': np.where(swap, b, a), 'b': np.where(swap, a, b)})
+    pairs['distance_m'] = haversine_m(latitude[pairs['a']], longitude[pairs['a']],
+                                      latitude[pairs['b']], longitude[pairs['b']])
+    return pairs[pairs['distance_m'] <= radius_m].reset_index(drop=True)
+
+
+def union_find(n: int, pairs: List[Tuple[int, int]]) -> np.ndarray:
+    """Cluster id of each of n items; the id is the smallest item in its cluster"""
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in pairs:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+    return np.array([find(x) for x in range(n)])
+
+
+def find_duplicates(df: pd.DataFrame, radius_m: float = DEFAULT_RADIUS_M,
+                    min_similarity: float = DEFAULT_MIN_SIMILARITY) -> pd.DataFrame:
+    """Matching pairs (positional a, b) with distance and name similarity"""
+    pairs = candidate_pairs(df['latitude'].to_numpy(dtype=float), df['longitude'].to_numpy(dtype=float), radius_m)
+
+    # Normalize each name once; pairs then only intersect precomputed sets
+    normalized = [normalize_name(name) for name in df['name'].tolist()]
+    grams = [trigrams(key) if key else frozenset() for key, _ in normalized]
+    types = [t for _, t in normalized]
+
+    scores = np.array([
+        _similarity(grams[a], types[a], grams[b], types[b]) if grams[a] and grams[b] else 0.0
+        for a, b in zip(pairs['a'].tolist(), pairs['b'].tolist())
+    ])
+    pairs['similarity'] = scores
+    return pairs[pairs['similarity'] >= min_similarity].reset_index(drop=True)
+
+
+def resolve_duplicates(df: pd.DataFrame, radius_m: float = DEFAULT_RADIUS_M,
+                       min_similarity: float = DEFAULT_MIN_SIMILARITY) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Collapse duplicate clusters to one surviving record each.
+
+    Returns (survivors, clusters) where clusters lists every row of a
+    multi-record cluster with its cluster id and whether it survived.
+    """
+    matches = find_duplicates(df, radius_m, min_similarity)
+    cluster = union_find(len(df), list(zip(matches['a'].tolist(), matches['b'].tolist())))
+
+    # Most complete record survives; ties keep the earliest (source order)
+    present = [df[col].notna() & (df[col].astype(str).str.strip() != '') for col in COMPLETENESS_COLUMNS if col in df]
+    completeness = np.sum(present, axis=0) if present else np.zeros(len(df))
+    order = pd.DataFrame({'cluster': cluster, 'completeness': completeness, 'position': np.arange(len(df))})
+    order = order.sort_values(['cluster', 'completeness', 'position'], ascending=[True, False, True])
+    survivors = np.sort(order.drop_duplicates('cluster')['position'].to_numpy())
+
+    sizes = pd.Series(cluster).map(pd.Series(cluster).value_counts())
+    in_cluster = (sizes > 1).to_numpy()
+    clusters = df.loc[in_cluster, ['name', 'latitude', 'longitude']].assign(
+        cluster=cluster[in_cluster],
+        survivor=np.isin(np.arange(len(df)), survivors)[in_cluster],
+    ).sort_values(['cluster', 'survivor'], ascending=[True, False])
+
+    return df.iloc[survivors], clusters
@@ -0,0 +1,245 @@
+"""
+Gazetteer-driven address parser for the wisata dataset merge.
+
+Known kota/kabupaten and provinsi names (plus aliases like Jogja) come from
+gazetteer_seed.csv and from the kotaKabupaten values of the dataset itself.
+They are compiled into a token-level Aho-Corasick automaton, so each address
+is parsed in one linear scan regardless of how many names are known.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+SEED_FILE = Path(__file__).parent / "gazetteer_seed.csv"
+
+# Words and the comma separating address parts ("Street, District, City, ...")
+SCAN_RE = re.compile(r'\w+|,')
+TOKEN_RE = re.compile(r'\w+')
+TRAILING_SEP_RE = re.compile(r'[,;]\s*$')
+PLACE_PREFIX_RE = re.compile(r'^(Kota|Kabupaten|Kab\.?)\s+', re.IGNORECASE)
+
+# Island / region names that show up in kotaKabupaten but are not places
+NON_PLACE_NAMES = {
+    'jawa', 'sumatera', 'sumatra', 'sulawesi', 'kalimantan', 'nusa tenggara',
+    'western new guinea', 'indonesia',
+}
+
+
+class GazetteerEntry(NamedTuple):
+    name: str
+    level: str  # 'kota' or 'provinsi'
+    provinsi: str
+
+
+def clean_place_name(name) -> str:
+    """Normalize a raw kota/kabupaten value into a gazetteer name"""
+    if pd.isna(name):
+        return ''
+    name = ''.join(char for char in str(name) if ord(char) < 128)
+    name = re.sub(r'\s+', ' ', name).strip()
+    return PLACE_PREFIX_RE.sub('', name).strip()
+
+
+def _tokens(text: str) -> Tuple[str, ...]:
+    return tuple(TOKEN_RE.findall(text.lower()))
+
+
+class Gazetteer:
+    """Aho-Corasick automaton over the tokens of every known place name"""
+
+    def __init__(self, entries: Iterable[Tuple[GazetteerEntry, Iterable[str]]]):
+        self.entries: List[GazetteerEntry] = []
+        self._keys: Dict[Tuple[str, ...], int] = {}
+
+        # Trie: goto transitions, failure links, and (entry, length) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, int]]] = [[]]
+
+        for entry, names in entries:
+            self._add(entry, names)
+        self._build_failure_links()
+        self._parsed: Dict[str, Tuple[str, Optional[str]]] = {}
+
+    @classmethod
+    def from_seed(cls, seed_path: Path = SEED_FILE, extra_kota: Iterable = ()) -> 'Gazetteer':
+        """Build from the seed table plus extra kota names seen in the data"""
+        seed = pd.read_csv(seed_path, keep_default_na=False)
+        entries = [
+            (GazetteerEntry(row.name, row.level, row.provinsi), [row.name, *filter(None, row.aliases.split('|'))])
+            for row in seed.itertuples(index=False)
+        ]
+
+        for raw_name in dict.fromkeys(extra_kota):
+            name = clean_place_name(raw_name)
+            if name and name.lower() not in NON_PLACE_NAMES:
+                entries.append((GazetteerEntry(name, 'kota', ''), [name]))
+
+        return cls(entries)
+
+    def _add(self, entry: GazetteerEntry, names: Iterable[str]):
+        """Register an entry under its names; the first entry to claim a name keeps it"""
+        entry_idx = None
+        for name in names:
+            key = _tokens(name)
+            if not key or key in self._keys:
+                continue
+            if entry_idx is None:
+                entry_idx = len(self.entries)
+                self.entries.append(entry)
+            self._keys[key] = entry_idx
+
+            state = 0
+            for token in key:
+                if token not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][token] = len(self._goto) - 1
+                state = self._goto[state][token]
+            self._out[state].append((entry_idx, len(key)))
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def lookup(self, name: str) -> Optional[GazetteerEntry]:
+        """Entry whose name or alias is exactly `name`"""
+        entry_idx = self._keys.get(_tokens(name))
+        return self.entries[entry_idx] if entry_idx is not None else None
+
+    @property
+    def provinces(self) -> List[str]:
+        return [entry.name for entry in self.entries if entry.level == 'provinsi']
+
+    def learn_provinsi(self, kota: pd.Series, provinsi: pd.Series) -> int:
+        """Fill provinsi of data-derived kota entries from rows that have both.
+
+        Each kota takes the most common known provinsi among its rows. Seed
+        entries keep their provinsi. Returns the number of entries learned.
+        """
+        observed = pd.DataFrame({'kota': kota, 'provinsi': provinsi})
+        observed = observed[observed['kota'].ne('') & observed['provinsi'].isin(self.provinces)]
+        if observed.empty:
+            return 0
+
+        entry_of = {name: self._keys.get(_tokens(clean_place_name(name))) for name in observed['kota'].unique()}
+        observed = observed.assign(entry=observed['kota'].map(entry_of)).dropna(subset=['entry'])
+        modes = observed.groupby('entry')['provinsi'].agg(lambda values: values.value_counts().index[0])
+
+        learned = 0
+        for entry_idx, prov in modes.items():
+            entry = self.entries[int(entry_idx)]
+            if entry.level == 'kota' and not entry.provinsi:
+                self.entries[int(entry_idx)] = entry._replace(provinsi=prov)
+                learned += 1
+        return learned
+
+    def resolve_provinsi(self, name) -> str:
+        """Provinsi for a kota, provinsi or free-text place name ('' if unknown)"""
+        if pd.isna(name) or str(name).strip() == '':
+            return ''
+        entry = self.lookup(clean_place_name(name))
+        if entry is not None and entry.provinsi:
+            return entry.provinsi
+        # Otherwise any known place inside the name, e.g. "Kota Batu Malang"
+        for _, _, _, match in self.scan(str(name)):
+            if match.provinsi:
+                return match.provinsi
+        return ''
+
+    def provinsi_for(self, names: pd.Series) -> pd.Series:
+        """Vectorized resolve_provinsi: each distinct name is resolved once, then mapped"""
+        table = {name: self.resolve_provinsi(name) for name in names.dropna().unique()}
+        return names.map(table).fillna('')
+
+    def scan(self, address: str) -> List[Tuple[int, int, int, GazetteerEntry]]:
+        """All non-overlapping place matches as (part, start, end, entry).
+
+        Parts are the comma-separated pieces of the address and start/end are
+        token positions. Overlaps resolve leftmost-longest, so "Daerah
+        Istimewa Yogyakarta" wins over the kota "Yogyakarta" inside it.
+        """
+        matches = []
+        state = part = position = 0
+        for match in SCAN_RE.finditer(address.lower()):
+            token = match.group()
+            if token == ',':
+                state = 0
+                part += 1
+                continue
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for entry_idx, length in self._out[state]:
+                matches.append((part, position - length + 1, position, entry_idx))
+            position += 1
+
+        matches.sort(key=lambda m: (m[1], m[1] - m[2]))
+        resolved = []
+        last_end = -1
+        for part, start, end, entry_idx in matches:
+            if start > last_end:
+                resolved.append((part, start, end, self.entries[entry_idx]))
+                last_end = end
+        return resolved
+
+    def _extract(self, address: str) -> Tuple[str, Optional[str]]:
+        """(detail, city) from the address alone; city is None when not found"""
+        # If address is just a city/province name, return empty detail
+        if self.lookup(address) is not None and _tokens(address) == tuple(address.lower().split()):
+            return '', address
+
+        detail = address
+        city = None
+        parts = address.split(',')
+        if len(parts) > 1:
+            # Usually the last parts hold "City, Province, Island, ZIP, Indonesia":
+            # take the right-most kota, falling back to the right-most provinsi
+            matches = self.scan(address)
+            kota_matches = [m for m in matches if m[3].level == 'kota']
+            best = (kota_matches or matches)[-1] if matches else None
+            if best is not None:
+                city = best[3].name
+                detail = ','.join(parts[:best[0]]).strip()
+
+        return TRAILING_SEP_RE.sub('', detail).strip(), city
+
+    def parse_address(self, address, provinsi='', kotaKabupaten='') -> Tuple[str, str]:
+        """Split an address into (detail, city), like the old clean_address"""
+        if pd.isna(address) or address == '':
+            return '', ''
+
+        address = str(address).strip()
+        if address not in self._parsed:
+            self._parsed[address] = self._extract(address)
+        detail, city = self._parsed[address]
+
+        # If no city extracted, use provinsi/kotaKabupaten from other columns
+        if city is None:
+            city = ''
+            if kotaKabupaten and str(kotaKabupaten).strip() != '':
+                city = str(kotaKabupaten).strip()
+            elif provinsi and str(provinsi).strip() != '':
+                city = str(provinsi).strip()
+
+        return detail, city
+
+    def parse_addresses(self, addresses: pd.Series, provinsi: pd.Series,
+                        kotaKabupaten: pd.Series) -> Tuple[List[str], List[str]]:
+        """Bulk parse_address over whole columns, returning (details, cities)"""
+        parsed = [
+            self.parse_address(address, prov, kota)
+            for address, prov, kota in zip(addresses.tolist(), provinsi.tolist(), kotaKabupaten.tolist())
+        ]
+        return [p[0] for p in parsed], [p[1] for p in parsed]
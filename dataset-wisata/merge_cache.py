@@ -0,0 +1,145 @@
+"""
+Content-addressed stage cache for merge_datasets.py.
+
+Every stage result is stored as Parquet under a key made from the hashes of
+its inputs (source file contents or upstream frames) and of the code that
+produces it. A rerun reuses each stage whose key is unchanged, so editing
+or adding one source file only recomputes that source and the stages that
+combine all sources.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+import pandas as pd
+
+# Bump to invalidate every cached stage (e.g. after a Parquet layout change)
+CACHE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def code_fingerprint(*parts) -> str:
+    """Hash of the code behind a stage.
+
+    Parts can be functions (hashed by source), paths (hashed by content,
+    e.g. a helper module or the gazetteer seed) or plain values such as a
+    mapping table.
+    """
+    digest = hashlib.sha256(f"cache-v{CACHE_VERSION}".encode())
+    for part in parts:
+        if isinstance(part, Path):
+            digest.update(part.read_bytes())
+        elif callable(part):
+            digest.update(inspect.getsource(part).encode())
+        else:
+            digest.update(repr(part).encode())
+    return digest.hexdigest()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Hash of a frame's schema, index and values"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class StageCache:
+    """Parquet store of stage results keyed by input and code fingerprints"""
+
+    def __init__(self, cache_dir: Path, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._used = set()
+
+        self._manifest: Dict[str, Dict] = {'files': {}, 'outputs': {}}
+        manifest_path = self.cache_dir / MANIFEST_NAME
+        if enabled and manifest_path.exists():
+            try:
+                self._manifest.update(json.loads(manifest_path.read_text(encoding='utf-8')))
+            except (OSError, ValueError):
+                pass  # Corrupt manifest only costs a rehash
+
+    def file_fingerprint(self, path: Path) -> str:
+        """Content hash of a file, rehashed only when its size or mtime changes"""
+        path = Path(path)
+        stat = path.stat()
+        known = self._manifest['files'].get(str(path.resolve()))
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+
+        digest = _sha256_file(path)
+        self._manifest['files'][str(path.resolve())] = {
+            'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest,
+        }
+        return digest
+
+    def stage(self, name: str, inputs: Iterable[str],
+              compute: Callable[[], pd.DataFrame]) -> Tuple[pd.DataFrame, bool]:
+        """Return (frame, cached): the stored result for this key, or compute() and store it"""
+        key = hashlib.sha256('\0'.join([name, *inputs]).encode()).hexdigest()[:16]
+        path = self.cache_dir / f"{name}-{key}.parquet"
+        self._used.add(path.name)
+
+        if self.enabled and path.exists():
+            self.hits += 1
+            return pd.read_parquet(path), True
+
+        df = compute()
+        self.misses += 1
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write then rename, so an interrupted run never leaves a truncated entry
+            tmp_path = path.with_suffix('.tmp')
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+        return df, False
+
+    def output_is_current(self, output: Path, key: str) -> bool:
+        """True if `output` was written from `key` and has not been modified since"""
+        recorded = self._manifest['outputs'].get(str(Path(output).resolve()))
+        return (self.enabled and recorded is not None and recorded['key'] == key
+                and Path(output).exists() and self.file_fingerprint(output) == recorded['sha256'])
+
+    def record_output(self, output: Path, key: str):
+        self._manifest['outputs'][str(Path(output).resolve())] = {
+            'key': key, 'sha256': self.file_fingerprint(output),
+        }
+
+    def usage(self) -> Tuple[Set[str], int, int]:
+        """(entries used, hits, misses), for handing back from a worker process"""
+        return set(self._used), self.hits, self.misses
+
+    def absorb(self, usage: Tuple[Set[str], int, int]):
+        """Count stages run by a worker's cache as part of this run"""
+        used, hits, misses = usage
+        self._used |= used
+        self.hits += hits
+        self.misses += misses
+
+    def save(self, prune: bool = True):
+        """Persist the manifest and, with prune, drop stage entries this run did not use"""
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if prune:
+            for path in self.cache_dir.glob('*.parquet'):
+                if path.name not in self._used:
+                    path.unlink()
+        manifest_path = self.cache_dir / MANIFEST_NAME
+        manifest_path.write_text(json.dumps(self._manifest, indent=2), encoding='utf-8')
@@ -1,139 +1,42 @@
-import pandas as pd
-import numpy as np
-import re
-from pathlib import Path
+"""
+Merge the wisata source CSVs into wisata_indonesia_merged_clean.csv.
 
-# Path files
-BASE_DIR = Path(__file__).parent
-OUTPUT_FILE = BASE_DIR / "wisata_indonesia_merged_clean.csv"
+Usable as a library (merge() returns the clean DataFrame, e.g. for the
+Firestore importers) or as a CLI:
 
-print("🚀 Memulai merge dataset wisata Indonesia...")
-
-# 1. Load tourism_with_id.csv
-print("\n📊 Loading tourism_with_id.csv...")
-df1 = pd.read_csv(BASE_DIR / "tourism_with_id.csv")
-print(f"   ✅ Loaded {len(df1)} rows")
-
-# 2. Load wisata_indonesia_final.csv
-print("\n📊 Loading wisata_indonesia_final.csv...")
-df2 = pd.read_csv(BASE_DIR / "wisata_indonesia_final.csv")
-print(f"   ✅ Loaded {len(df2)} rows")
-
-# 3. Load wisata_indonesia_new.csv
-print("\n📊 Loading wisata_indonesia_new.csv...")
-df3 = pd.read_csv(BASE_DIR / "wisata_indonesia_new.csv")
-print(f"   ✅ Loaded {len(df3)} rows")
-
-# 4. Normalize df1 (tourism_with_id.csv)
-print("\n🔄 Normalizing tourism_with_id.csv...")
-df1_normalized = pd.DataFrame({
-    'name': df1['Place_Name'].fillna(''),
-    'category': df1['Category'].fillna(''),
-    'latitude': pd.to_numeric(df1['Lat'], errors='coerce'),
-    'longitude': pd.to_numeric(df1['Long'], errors='coerce'),
-    'address': df1['City'].fillna(''),  # Will be cleaned later
-    'description': df1['Description'].fillna(''),
-    'descriptionClean': df1['Description'].fillna(''),
-    'priceRange': df1['Price'].apply(lambda x: str(int(x)) if pd.notna(x) and x > 0 else 'Gratis'),
-    'rating': pd.to_numeric(df1['Rating'], errors='coerce'),
-    'timeMinutes': pd.to_numeric(df1['Time_Minutes'], errors='coerce'),
-    'provinsi': df1['City'].fillna(''),
-    'kotaKabupaten': df1['City'].fillna(''),
-    'source': 'tourism_with_id'
-})
-
-# 5. Normalize df2 (wisata_indonesia_final.csv)
-print("🔄 Normalizing wisata_indonesia_final.csv...")
-df2_normalized = pd.DataFrame({
-    'name': df2['nama_wisata'].fillna(''),
-    'category': df2['kategori'].fillna(''),
-    'latitude': pd.to_numeric(df2['latitude'], errors='coerce'),
-    'longitude': pd.to_numeric(df2['longitude'], errors='coerce'),
-    'address': df2['alamat'].fillna(''),
-    'description': df2['deskripsi'].fillna(''),
-    'descriptionClean': df2['deskripsi'].fillna(''),
-    'priceRange': 'Tidak diketahui',
-    'rating': np.nan,
-    'timeMinutes': np.nan,
-    'provinsi': df2['provinsi'].fillna(''),
-    'kotaKabupaten': df2['kota_kabupaten'].fillna(''),
-    'source': 'wisata_indonesia_final'
-})
-
-# 6. Normalize df3 (wisata_indonesia_new.csv)
-print("🔄 Normalizing wisata_indonesia_new.csv...")
-df3_normalized = pd.DataFrame({
-    'name': df3['nama_wisata'].fillna(''),
-    'category': df3['kategori'].fillna(''),
-    'latitude': pd.to_numeric(df3['latitude'], errors='coerce'),
-    'longitude': pd.to_numeric(df3['longitude'], errors='coerce'),
-    'address': df3['alamat'].fillna(''),
-    'description': df3['deskripsi_bersih'].fillna(''),
-    'descriptionClean': df3['deskripsi_bersih'].fillna(''),
-    'priceRange': 'Tidak diketahui',
-    'rating': np.nan,
-    'timeMinutes': np.nan,
-    'provinsi': df3['provinsi'].fillna(''),
-    'kotaKabupaten': df3['kota_kabupaten'].fillna(''),
-    'source': 'wisata_indonesia_new'
-})
-
-# 7. Combine all dataframes
-print("\n🔗 Combining all datasets...")
-df_combined = pd.concat([df1_normalized, df2_normalized, df3_normalized], ignore_index=True)
-print(f"   ✅ Combined: {len(df_combined)} rows")
-
-# 8. Remove duplicates based on name + coordinates (within 0.001 tolerance)
-print("\n🔍 Removing duplicates...")
-df_combined['name_lower'] = df_combined['name'].str.lower().str.strip()
-df_combined['lat_round'] = df_combined['latitude'].round(3)
-df_combined['lng_round'] = df_combined['longitude'].round(3)
-
-# Remove rows with invalid coordinates
-df_combined = df_combined[
-    (df_combined['latitude'].notna()) & 
-    (df_combined['longitude'].notna()) &
-    (df_combined['latitude'].between(-11, 6)) &
-    (df_combined['longitude'].between(95, 141))
-]
+    python merge_datasets.py
+    python merge_datasets.py --sources wisata_indonesia_final wisata_indonesia_new --workers 2
 
-# Deduplicate: keep first occurrence
-df_combined = df_combined.drop_duplicates(
-    subset=['name_lower', 'lat_round', 'lng_round'],
-    keep='first'
-)
+Sources are registered in source_adapters.py.
+"""
 
-# Remove helper columns
-df_combined = df_combined.drop(columns=['name_lower', 'lat_round', 'lng_round', 'source'])
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
-print(f"   ✅ After deduplication: {len(df_combined)} rows")
+import pandas as pd
 
-# 9. Clean and fill missing values
-print("\n🧹 Cleaning data...")
+import dedupe
+import gazetteer as gazetteer_module
+import text_cleaning
+from consistency import check_province_consistency
+from dedupe import resolve_duplicates
+from gazetteer import SEED_FILE, Gazetteer
+from merge_cache import StageCache, code_fingerprint, frame_fingerprint
+from source_adapters import SOURCE_ADAPTERS, get_sources, normalize_source
+from text_cleaning import clean_text_series
 
-# Helper function to clean text
-def clean_text(text):
-    if pd.isna(text):
-        return ''
-    text = str(text)
-    # Remove newlines and tabs
-    text = text.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
-    # Remove multiple spaces
-    text = re.sub(r'\s+', ' ', text)
-    # Remove special characters yang tidak perlu (keep punctuation normal: .,;:()-/)
-    text = re.sub(r'[^\w\s.,;:()\-/]', '', text)
-    # Remove leading/trailing spaces
-    text = text.strip()
-    return text
-
-# Clean name
-df_combined['name'] = df_combined['name'].apply(lambda x: clean_text(x) if pd.notna(x) else '')
-
-# Clean category - fix typos and normalize to lowercase
-print("   Cleaning categories...")
-df_combined['category'] = df_combined['category'].str.strip().str.lower()
-
-category_fixes = {
+# Path files
+BASE_DIR = Path(__file__).parent
+OUTPUT_FILE = BASE_DIR / "wisata_indonesia_merged_clean.csv"
+CONSISTENCY_REPORT_FILE = BASE_DIR / "wisata_indonesia_consistency_report.csv"
+# Cached stage results (Parquet), see merge_cache.py
+CACHE_DIR = BASE_DIR / ".merge_cache"
+
+CATEGORY_FIXES = {
     'wisate alam': 'wisata alam',
     'wisawi alam': 'wisata alam',
     'wisath alam': 'wisata alam',
@@ -144,90 +47,8 @@ category_fixes = {
     'cafe view': 'wisata kuliner',
     'wisata lampion': 'taman hiburan'
 }
-df_combined['category'] = df_combined['category'].replace(category_fixes)
-
-# Clean description - remove unwanted characters
-print("   Cleaning descriptions...")
-df_combined['description'] = df_combined['description'].apply(
-    lambda x: clean_text(x) if pd.notna(x) and x != '' else ''
-)
-df_combined['descriptionClean'] = df_combined['description'].copy()
-
-# Clean address - extract detail and city
-print("   Cleaning addresses...")
-def clean_address(address, provinsi='', kotaKabupaten=''):
-    if pd.isna(address) or address == '':
-        return '', ''
-    
-    address = str(address).strip()
-    
-    # If address is just a city/province name, return empty detail
-    city_patterns = [
-        r'^(Jakarta|Bandung|Surabaya|Yogyakarta|Semarang|Medan|Makassar|Palembang|Denpasar|Bali)$',
-        r'^(Jawa (Barat|Tengah|Timur))$',
-        r'^(Sumatera (Utara|Selatan|Barat))$',
-    ]
-    
-    for pattern in city_patterns:
-        if re.match(pattern, address, re.IGNORECASE):
-            return '', address
-    
-    # Extract province/city from address if found
-    detail = address
-    city = ''
-    
-    # Common patterns in Indonesian addresses
-    # Pattern: "Street, District, City, Province, Indonesia"
-    parts = address.split(',')
-    
-    if len(parts) > 1:
-        # Usually last few parts contain city/province
-        # Try to identify city from parts
-        for i, part in enumerate(reversed(parts)):
-            part = part.strip()
-            if part.lower() in ['indonesia', 'id']:
-                continue
-            # Check if part matches known cities/provinces
-            city_candidates = [
-                'Jakarta', 'Bandung', 'Surabaya', 'Yogyakarta', 'Semarang',
-                'Medan', 'Makassar', 'Palembang', 'Denpasar', 'Bali',
-                'Jawa Barat', 'Jawa Tengah', 'Jawa Timur',
-                'Sumatera Utara', 'Sumatera Selatan', 'Sumatera Barat'
-            ]
-            for candidate in city_candidates:
-                if candidate.lower() in part.lower():
-                    city = candidate
-                    # Remove city and everything after from detail
-                    city_idx = len(parts) - i - 1
-                    detail = ','.join(parts[:city_idx]).strip()
-                    detail = re.sub(r'[,;]\s*$', '', detail).strip()
-                    break
-            if city:
-                break
-    
-    # If no city extracted, use provinsi/kotaKabupaten from other columns
-    if not city:
-        if kotaKabupaten and str(kotaKabupaten).strip() != '':
-            city = str(kotaKabupaten).strip()
-        elif provinsi and str(provinsi).strip() != '':
-            city = str(provinsi).strip()
-    
-    # Clean detail
-    detail = re.sub(r'[,;]\s*$', '', detail).strip()
-    
-    return detail, city
-
-# Apply address cleaning
-address_cleaned = df_combined.apply(
-    lambda row: clean_address(row['address'], row['provinsi'], row['kotaKabupaten']),
-    axis=1
-)
-df_combined['address'] = [a[0] for a in address_cleaned]
-df_combined['addressCity'] = [a[1] for a in address_cleaned]
-
-# Normalize provinsi
-print("   Normalizing provinces...")
-provinsi_mapping = {
+
+PROVINSI_MAPPING = {
     'jakarta': 'DKI Jakarta',
     'bandung': 'Jawa Barat',
     'yogyakarta': 'Daerah Istimewa Yogyakarta',
@@ -266,31 +87,50 @@ provinsi_mapping = {
     '': ''
 }
 
+COLUMN_ORDER = [
+    'name', 'category', 'latitude', 'longitude', 'address', 'addressCity',
+    'description', 'descriptionClean', 'priceRange', 'rating', 'timeMinutes',
+    'provinsi', 'kotaKabupaten'
+]
+
+
+def clean_source(df):
+    """Row-level cleaning that does not depend on other rows or sources.
+
+    Cleaned name/description go to helper columns: deduplication still sees
+    the raw values, and the cleaned ones replace them after it.
+    """
+    df = df.copy()
+    # Clean name and description (vectorized, see text_cleaning.clean_text_series)
+    df['name_clean'] = clean_text_series(df['name'])
+    df['description_clean'] = clean_text_series(df['description'])
+    # Clean category - fix typos and normalize to lowercase
+    df['category'] = df['category'].str.strip().str.lower().replace(CATEGORY_FIXES)
+    return df
+
+
 def normalize_provinsi(prov):
     if pd.isna(prov) or prov == '':
         return ''
     prov_lower = str(prov).strip().lower()
-    return provinsi_mapping.get(prov_lower, prov.strip())
+    return PROVINSI_MAPPING.get(prov_lower, prov.strip())
 
-df_combined['provinsi'] = df_combined['provinsi'].apply(normalize_provinsi)
 
-# Normalize kota/kabupaten
-print("   Normalizing cities...")
 def normalize_kota(kota):
     if pd.isna(kota) or kota == '':
         return ''
     kota = str(kota).strip()
-    
+
     # Remove unicode characters (keep only ASCII and common Indonesian chars)
     # Remove characters outside ASCII range except spaces and hyphens
     kota = ''.join(char if ord(char) < 128 or char in [' ', '-'] else '' for char in kota)
     kota = re.sub(r'\s+', ' ', kota)  # Clean multiple spaces
     kota = kota.strip()
-    
+
     # Remove common prefixes
     kota = re.sub(r'^(Kota|Kabupaten|Kab\.|Kota\.)\s*', '', kota, flags=re.IGNORECASE)
     kota = kota.strip()
-    
+
     # Fix common typos/misnames
     kota_fixes = {
         'Daerah Khusus ibukota Jakarta': 'Jakarta',
@@ -300,130 +140,317 @@ def normalize_kota(kota):
         'Jogja': 'Yogyakarta',
         'Jogjakarta': 'Yogyakarta'
     }
-    
+
     for old, new in kota_fixes.items():
         if old.lower() in kota.lower():
             kota = new
             break
-    
+
     # If just "Sulawesi" or "Sumatera", try to infer from provinsi
     if kota.lower() in ['sulawesi', 'sumatera']:
         return ''  # Will be filled from provinsi
-    
+
     return kota
 
-df_combined['kotaKabupaten'] = df_combined['kotaKabupaten'].apply(normalize_kota)
-
-# Fill missing provinsi from kotaKabupaten if possible
-print("   Filling missing provinsi...")
-for idx, row in df_combined.iterrows():
-    if pd.isna(row['provinsi']) or row['provinsi'] == '':
-        if pd.notna(row['kotaKabupaten']) and row['kotaKabupaten'] != '':
-            kota = str(row['kotaKabupaten']).lower()
-            if 'jakarta' in kota:
-                df_combined.at[idx, 'provinsi'] = 'DKI Jakarta'
-            elif 'yogyakarta' in kota or 'jogja' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Daerah Istimewa Yogyakarta'
-            elif 'bandung' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Jawa Barat'
-            elif 'surabaya' in kota or 'malang' in kota or 'batu' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Jawa Timur'
-            elif 'semarang' in kota or 'surakarta' in kota or 'magelang' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Jawa Tengah'
-            elif 'denpasar' in kota or 'badung' in kota or 'gianyar' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Bali'
-            elif 'mataram' in kota or 'lombok' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Nusa Tenggara Barat'
-            elif 'makassar' in kota or 'kendari' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Sulawesi Selatan'
-            elif 'samarinda' in kota or 'balikpapan' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Kalimantan Timur'
-            elif 'palembang' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Sumatera Selatan'
-            elif 'medan' in kota:
-                df_combined.at[idx, 'provinsi'] = 'Sumatera Utara'
-        
-        # Also check addressCity
-        if (pd.isna(row['provinsi']) or row['provinsi'] == '') and pd.notna(row['addressCity']) and row['addressCity'] != '':
-            addr_city = str(row['addressCity']).lower()
-            if 'jakarta' in addr_city:
-                df_combined.at[idx, 'provinsi'] = 'DKI Jakarta'
-            elif 'yogyakarta' in addr_city or 'jogja' in addr_city:
-                df_combined.at[idx, 'provinsi'] = 'Daerah Istimewa Yogyakarta'
-            elif 'jawa barat' in addr_city or 'bandung' in addr_city:
-                df_combined.at[idx, 'provinsi'] = 'Jawa Barat'
-            elif 'jawa timur' in addr_city or 'surabaya' in addr_city:
-                df_combined.at[idx, 'provinsi'] = 'Jawa Timur'
-            elif 'jawa tengah' in addr_city or 'semarang' in addr_city:
-                df_combined.at[idx, 'provinsi'] = 'Jawa Tengah'
-            elif 'bali' in addr_city:
-                df_combined.at[idx, 'provinsi'] = 'Bali'
-
-# Validate and fix lat/long
-print("   Validating lat/long...")
-# Indonesia bounds: lat -11 to 6, lng 95 to 141
-invalid_lat = (df_combined['latitude'] < -11) | (df_combined['latitude'] > 6)
-invalid_lng = (df_combined['longitude'] < 95) | (df_combined['longitude'] > 141)
-
-if invalid_lat.sum() > 0:
-    print(f"   ⚠️  Found {invalid_lat.sum()} invalid latitudes, removing...")
-    df_combined = df_combined[~invalid_lat]
-
-if invalid_lng.sum() > 0:
-    print(f"   ⚠️  Found {invalid_lng.sum()} invalid longitudes, removing...")
-    df_combined = df_combined[~invalid_lng]
-
-# Round lat/long to 6 decimal places (good precision for maps)
-df_combined['latitude'] = df_combined['latitude'].round(6)
-df_combined['longitude'] = df_combined['longitude'].round(6)
-
-# Improve address quality - fill empty address with reasonable default
-print("   Improving address quality...")
-for idx, row in df_combined.iterrows():
-    if (pd.isna(row['address']) or row['address'] == '') and pd.notna(row['name']):
-        # If no address but have name, create minimal address from name
-        name = str(row['name']).strip()
-        if pd.notna(row['kotaKabupaten']) and str(row['kotaKabupaten']).strip() != '':
-            df_combined.at[idx, 'address'] = f"{name}, {row['kotaKabupaten']}"
-        elif pd.notna(row['provinsi']) and str(row['provinsi']).strip() != '':
-            df_combined.at[idx, 'address'] = f"{name}, {row['provinsi']}"
-
-# Remove imageUrl and imagePath columns if they exist
-print("   Removing image columns...")
-columns_to_drop = [col for col in ['imageUrl', 'imagePath'] if col in df_combined.columns]
-if columns_to_drop:
-    df_combined = df_combined.drop(columns=columns_to_drop)
-
-print(f"   ✅ Cleaned: {len(df_combined)} rows")
-
-# 10. Reorder columns
-column_order = [
-    'name', 'category', 'latitude', 'longitude', 'address', 'addressCity',
-    'description', 'descriptionClean', 'priceRange', 'rating', 'timeMinutes',
-    'provinsi', 'kotaKabupaten'
-]
-df_combined = df_combined[column_order]
-
-# 11. Save to CSV
-print(f"\n💾 Saving to {OUTPUT_FILE}...")
-df_combined.to_csv(OUTPUT_FILE, index=False, encoding='utf-8')
-print(f"   ✅ Saved successfully!")
-
-# 12. Summary statistics
-print("\n📈 Summary Statistics:")
-print(f"   Total destinations: {len(df_combined)}")
-print(f"   Unique categories: {df_combined['category'].nunique()}")
-print(f"   Categories: {df_combined['category'].value_counts().head(10).to_dict()}")
-print(f"   Provinces: {df_combined['provinsi'].nunique()}")
-print(f"   Top 10 Provinces:")
-for prov, count in df_combined['provinsi'].value_counts().head(10).items():
-    if prov != '':
-        print(f"      - {prov}: {count}")
-
-print(f"\n   Missing data:")
-print(f"      - provinsi: {df_combined['provinsi'].isna().sum() + (df_combined['provinsi'] == '').sum()}")
-print(f"      - kotaKabupaten: {df_combined['kotaKabupaten'].isna().sum() + (df_combined['kotaKabupaten'] == '').sum()}")
-print(f"      - address: {df_combined['address'].isna().sum() + (df_combined['address'] == '').sum()}")
-
-print(f"\n✅ Merge completed! Output: {OUTPUT_FILE}")
 
+def stopwatch(timings):
+    """lap(name) records the seconds since the previous lap into timings (no-op when None)"""
+    last = [time.perf_counter()]
+
+    def lap(name):
+        now = time.perf_counter()
+        if timings is not None:
+            timings[name] = now - last[0]
+        last[0] = now
+    return lap
+
+
+def resolve(df_combined, timings=None):
+    """Cross-source stage: dedupe, address parsing and provinsi/kota fills.
+
+    Pass a dict as timings to get the seconds spent in each step (used by
+    benchmark_merge.py).
+    """
+    lap = stopwatch(timings)
+    # Remove duplicates based on name + coordinates (within 0.001 tolerance)
+    print("\n🔍 Removing duplicates...")
+    df_combined['name_lower'] = df_combined['name'].str.lower().str.strip()
+    df_combined['lat_round'] = df_combined['latitude'].round(3)
+    df_combined['lng_round'] = df_combined['longitude'].round(3)
+
+    # Remove rows with invalid coordinates
+    df_combined = df_combined[
+        (df_combined['latitude'].notna()) &
+        (df_combined['longitude'].notna()) &
+        (df_combined['latitude'].between(-11, 6)) &
+        (df_combined['longitude'].between(95, 141))
+    ]
+
+    # Deduplicate: keep first occurrence
+    df_combined = df_combined.drop_duplicates(
+        subset=['name_lower', 'lat_round', 'lng_round'],
+        keep='first'
+    )
+    lap('exact_dedupe')
+
+    # Entity resolution: the same place under another name/source nearby
+    # (e.g. "Pantai Parangtritis" vs "Parangtritis Beach")
+    df_combined, duplicate_clusters = resolve_duplicates(df_combined)
+    print(f"   ✅ Merged {duplicate_clusters['cluster'].nunique()} near-duplicate clusters "
+          f"({(~duplicate_clusters['survivor']).sum()} rows dropped)")
+
+    # Swap in the cleaned name/description and remove helper columns
+    df_combined = df_combined.assign(name=df_combined['name_clean'], description=df_combined['description_clean'])
+    df_combined['descriptionClean'] = df_combined['description'].copy()
+    df_combined = df_combined.drop(columns=['name_lower', 'lat_round', 'lng_round', 'source',
+                                            'name_clean', 'description_clean'])
+
+    print(f"   ✅ After deduplication: {len(df_combined)} rows")
+    lap('entity_resolution')
+
+    # Clean and fill missing values
+    print("\n🧹 Cleaning data...")
+
+    # Clean address - extract detail and city
+    print("   Cleaning addresses...")
+    # Known places: seed gazetteer plus every kota/kabupaten seen in the data
+    gazetteer = Gazetteer.from_seed(extra_kota=df_combined['kotaKabupaten'])
+    df_combined['address'], df_combined['addressCity'] = gazetteer.parse_addresses(
+        df_combined['address'], df_combined['provinsi'], df_combined['kotaKabupaten']
+    )
+    lap('addresses')
+
+    # Normalize provinsi
+    print("   Normalizing provinces...")
+    df_combined['provinsi'] = df_combined['provinsi'].apply(normalize_provinsi)
+
+    # Normalize kota/kabupaten
+    print("   Normalizing cities...")
+    df_combined['kotaKabupaten'] = df_combined['kotaKabupaten'].apply(normalize_kota)
+
+    # Fill missing provinsi from kotaKabupaten, then addressCity, via the gazetteer
+    print("   Filling missing provinsi...")
+    learned = gazetteer.learn_provinsi(df_combined['kotaKabupaten'], df_combined['provinsi'])
+    kota_known = sum(1 for entry in gazetteer.entries if entry.level == 'kota' and entry.provinsi)
+    print(f"      Gazetteer: {kota_known} kota with provinsi ({learned} learned from data)")
+
+    missing_provinsi = df_combined['provinsi'].isna() | (df_combined['provinsi'] == '')
+    missing_before = missing_provinsi.sum()
+    from_kota = gazetteer.provinsi_for(df_combined.loc[missing_provinsi, 'kotaKabupaten'])
+    from_city = gazetteer.provinsi_for(df_combined.loc[missing_provinsi, 'addressCity'])
+    inferred = from_kota.where(from_kota != '', from_city)
+    df_combined.loc[missing_provinsi, 'provinsi'] = inferred
+
+    print(f"      Missing provinsi: {missing_before}")
+    print(f"      - filled from kotaKabupaten: {(from_kota != '').sum()}")
+    print(f"      - filled from addressCity: {((from_kota == '') & (from_city != '')).sum()}")
+    print(f"      - still missing: {(inferred == '').sum()}")
+
+    lap('provinsi_kota')
+
+    # Validate and fix lat/long
+    print("   Validating lat/long...")
+    # Indonesia bounds: lat -11 to 6, lng 95 to 141
+    invalid_lat = (df_combined['latitude'] < -11) | (df_combined['latitude'] > 6)
+    invalid_lng = (df_combined['longitude'] < 95) | (df_combined['longitude'] > 141)
+
+    if invalid_lat.sum() > 0:
+        print(f"   ⚠️  Found {invalid_lat.sum()} invalid latitudes, removing...")
+        df_combined = df_combined[~invalid_lat]
+
+    if invalid_lng.sum() > 0:
+        print(f"   ⚠️  Found {invalid_lng.sum()} invalid longitudes, removing...")
+        df_combined = df_combined[~invalid_lng]
+
+    # Round lat/long to 6 decimal places (good precision for maps)
+    df_combined['latitude'] = df_combined['latitude'].round(6)
+    df_combined['longitude'] = df_combined['longitude'].round(6)
+
+    # Improve address quality - fill empty address with reasonable default
+    print("   Improving address quality...")
+    # If no address but have name, create minimal address from name + kota (or provinsi)
+    missing_address = (df_combined['address'].isna() | (df_combined['address'] == '')) & df_combined['name'].notna()
+    has_kota = df_combined['kotaKabupaten'].notna() & (df_combined['kotaKabupaten'].astype(str).str.strip() != '')
+    has_provinsi = df_combined['provinsi'].notna() & (df_combined['provinsi'].astype(str).str.strip() != '')
+    name_prefix = df_combined['name'].astype(str).str.strip() + ', '
+
+    fill_kota = missing_address & has_kota
+    fill_provinsi = missing_address & ~has_kota & has_provinsi
+    df_combined.loc[fill_kota, 'address'] = name_prefix[fill_kota] + df_combined.loc[fill_kota, 'kotaKabupaten'].astype(str)
+    df_combined.loc[fill_provinsi, 'address'] = name_prefix[fill_provinsi] + df_combined.loc[fill_provinsi, 'provinsi'].astype(str)
+
+    # Remove imageUrl and imagePath columns if they exist
+    print("   Removing image columns...")
+    columns_to_drop = [col for col in ['imageUrl', 'imagePath'] if col in df_combined.columns]
+    if columns_to_drop:
+        df_combined = df_combined.drop(columns=columns_to_drop)
+
+    print(f"   ✅ Cleaned: {len(df_combined)} rows")
+
+    # Reorder columns
+    df_combined = df_combined[COLUMN_ORDER]
+    lap('finalize')
+    return df_combined
+
+
+def print_summary(df_combined):
+    print("\n📈 Summary Statistics:")
+    print(f"   Total destinations: {len(df_combined)}")
+    print(f"   Unique categories: {df_combined['category'].nunique()}")
+    print(f"   Categories: {df_combined['category'].value_counts().head(10).to_dict()}")
+    print(f"   Provinces: {df_combined['provinsi'].nunique()}")
+    print(f"   Top 10 Provinces:")
+    for prov, count in df_combined['provinsi'].value_counts().head(10).items():
+        if prov != '':
+            print(f"      - {prov}: {count}")
+
+    print(f"\n   Missing data:")
+    print(f"      - provinsi: {df_combined['provinsi'].isna().sum() + (df_combined['provinsi'] == '').sum()}")
+    print(f"      - kotaKabupaten: {df_combined['kotaKabupaten'].isna().sum() + (df_combined['kotaKabupaten'] == '').sum()}")
+    print(f"      - address: {df_combined['address'].isna().sum() + (df_combined['address'] == '').sum()}")
+
+
+def _clean_code():
+    return code_fingerprint(clean_source, CATEGORY_FIXES, Path(text_cleaning.__file__))
+
+
+def prepare_source(name, cache_dir, use_cache, file_hash):
+    """Normalize and clean one registered source through the stage cache.
+
+    Runs in a worker process: the parent owns the manifest, so it passes the
+    file hash in and absorbs the returned cache usage.
+    """
+    adapter = SOURCE_ADAPTERS[name]
+    cache = StageCache(cache_dir, enabled=use_cache)
+    normalized, normalize_cached = cache.stage(
+        f"normalize-{name}",
+        [file_hash, adapter.fingerprint()],
+        lambda: normalize_source(adapter, adapter.load()),
+    )
+    cleaned, clean_cached = cache.stage(
+        f"clean-{name}",
+        [frame_fingerprint(normalized), _clean_code()],
+        lambda: clean_source(normalized),
+    )
+    return cleaned, normalize_cached and clean_cached, cache.usage()
+
+
+def merge(sources=None, cache=None, workers=None):
+    """Run the merge pipeline and return the clean dataset (nothing is written).
+
+    sources limits the merge to some registered adapters (default: all).
+    Sources are loaded, normalized and cleaned in parallel worker processes;
+    workers defaults to one per source, capped at the CPU count.
+    """
+    cache = cache if cache is not None else StageCache(CACHE_DIR)
+    adapters = get_sources(sources)
+    if not adapters:
+        raise ValueError("No sources to merge")
+
+    # 1. Load, normalize and clean each source; a source is only reprocessed
+    # when its file or the code of its stage changes
+    workers = max(1, min(workers or os.cpu_count() or 1, len(adapters)))
+    print(f"\n📊 Loading {len(adapters)} sources with {workers} worker(s)...")
+    jobs = [(adapter.name, cache.cache_dir, cache.enabled, cache.file_fingerprint(adapter.path))
+            for adapter in adapters]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(prepare_source, *zip(*jobs)))
+    else:
+        results = [prepare_source(*job) for job in jobs]
+
+    cleaned_frames = []
+    for adapter, (cleaned, cached, usage) in zip(adapters, results):
+        cache.absorb(usage)
+        print(f"   {'♻️  Cached' if cached else '✅ Loaded'} {adapter.file_name}: {len(cleaned)} rows")
+        cleaned_frames.append(cleaned)
+
+    # 2. Combine all dataframes
+    print("\n🔗 Combining all datasets...")
+    df_combined = pd.concat(cleaned_frames, ignore_index=True)
+    print(f"   ✅ Combined: {len(df_combined)} rows")
+
+    # 3. Dedupe, parse addresses and fill provinsi across sources
+    resolve_code = code_fingerprint(
+        resolve, normalize_provinsi, normalize_kota, PROVINSI_MAPPING, COLUMN_ORDER,
+        Path(dedupe.__file__), Path(gazetteer_module.__file__), SEED_FILE,
+    )
+    df_combined, cached = cache.stage(
+        "resolve",
+        [frame_fingerprint(df_combined), resolve_code],
+        lambda: resolve(df_combined),
+    )
+    if cached:
+        print("\n♻️  Sources unchanged, reusing cached deduplicated dataset")
+
+    # A partial merge must not prune the cached stages of the other sources
+    cache.save(prune=sources is None)
+    return df_combined
+
+
+def write_output(df_combined, output, cache):
+    """Save to CSV, skipped when the file already holds this exact result"""
+    output_key = frame_fingerprint(df_combined)
+    print(f"\n💾 Saving to {output}...")
+    if cache.output_is_current(output, output_key):
+        print(f"   ♻️  Output already up to date")
+        return
+    df_combined.to_csv(output, index=False, encoding='utf-8')
+    if cache.enabled:
+        cache.record_output(output, output_key)
+        cache.save(prune=False)
+    print(f"   ✅ Saved successfully!")
+
+
+def report_consistency(df_combined, report_path):
+    """Flag records whose coordinates don't fit their provinsi (see consistency.py)"""
+    print("\n🧭 Checking coordinate/provinsi consistency...")
+    flagged = check_province_consistency(df_combined)
+    flagged.to_csv(report_path, index=False, encoding='utf-8')
+    if flagged.empty:
+        print("   ✅ All records fit their provinsi")
+        return
+    print(f"   ⚠️  {len(flagged)} records far from their provinsi (report: {report_path})")
+    for row in flagged.head(5).itertuples(index=False):
+        print(f"      - {row.name}: {row.provinsi} ({row.distanceKm:.0f} km away), "
+              f"closer to {row.suggestedProvinsi} ({row.suggestedDistanceKm:.0f} km)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Merge the wisata source CSVs into one clean dataset')
+    parser.add_argument('--output', type=Path, default=OUTPUT_FILE, help='merged CSV path')
+    parser.add_argument('--sources', nargs='+', metavar='NAME', help='registered sources to merge (default: all)')
+    parser.add_argument('--list-sources', action='store_true', help='print registered sources and exit')
+    parser.add_argument('--workers', type=int, help='worker processes for loading sources (default: one per source)')
+    parser.add_argument('--cache-dir', type=Path, default=CACHE_DIR, help='stage cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='recompute every stage and keep no cache')
+    parser.add_argument('--consistency-report', type=Path, default=CONSISTENCY_REPORT_FILE,
+                        help='CSV of records whose coordinates do not fit their provinsi')
+    args = parser.parse_args()
+
+    if args.list_sources:
+        for adapter in get_sources():
+            print(f"{adapter.name}\t{adapter.file_name}")
+        return
+
+    print("🚀 Memulai merge dataset wisata Indonesia...")
+    cache = StageCache(args.cache_dir, enabled=not args.no_cache)
+    try:
+        df_combined = merge(args.sources, cache=cache, workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+
+    write_output(df_combined, args.output, cache)
+    if cache.enabled:
+        print(f"   ♻️  Stage cache: {cache.hits} reused, {cache.misses} recomputed ({args.cache_dir})")
+
+    report_consistency(df_combined, args.consistency_report)
+
+    # Summary statistics
+    print_summary(df_combined)
+
+    print(f"\n✅ Merge completed! Output: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
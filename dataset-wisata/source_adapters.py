@@ -0,0 +1,149 @@
+"""
+Source adapters for the wisata dataset merge.
+
+Each source CSV is described by a SourceAdapter: which raw column feeds each
+column of the common schema, constants for columns the source lacks, and
+converters for values that need more than a rename. Adding a dataset is one
+register_source() call; merge_datasets.py loads every registered source in
+parallel and merges them in registration order (earlier sources win exact
+duplicates).
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from merge_cache import code_fingerprint
+
+BASE_DIR = Path(__file__).parent
+
+# Common schema of a normalized source frame
+NORMALIZED_COLUMNS = [
+    'name', 'category', 'latitude', 'longitude', 'address', 'description',
+    'descriptionClean', 'priceRange', 'rating', 'timeMinutes', 'provinsi',
+    'kotaKabupaten',
+]
+NUMERIC_COLUMNS = {'latitude', 'longitude', 'rating', 'timeMinutes'}
+
+
+class SourceAdapter(NamedTuple):
+    name: str
+    file_name: str
+    columns: Dict[str, str]  # normalized column -> raw column
+    defaults: Dict[str, Any] = {}  # normalized column -> constant
+    converters: Dict[str, Callable[[pd.Series], pd.Series]] = {}  # applied to the raw column
+
+    @property
+    def path(self) -> Path:
+        return BASE_DIR / self.file_name
+
+    def fingerprint(self) -> str:
+        """Hash of the mapping and converter code (function reprs hold addresses)"""
+        return code_fingerprint(
+            normalize_source, self.name, self.file_name, self.columns, self.defaults,
+            sorted(self.converters), *self.converters.values(),
+        )
+
+    def load(self) -> pd.DataFrame:
+        return pd.read_csv(self.path)
+
+
+SOURCE_ADAPTERS: Dict[str, SourceAdapter] = {}
+
+
+def register_source(adapter: SourceAdapter) -> SourceAdapter:
+    missing = set(NORMALIZED_COLUMNS) - set(adapter.columns) - set(adapter.defaults)
+    if missing:
+        raise ValueError(f"Source {adapter.name} does not map columns: {sorted(missing)}")
+    SOURCE_ADAPTERS[adapter.name] = adapter
+    return adapter
+
+
+def get_sources(names: List[str] = None) -> List[SourceAdapter]:
+    """Registered adapters in merge order, optionally limited to `names`"""
+    if names is None:
+        return list(SOURCE_ADAPTERS.values())
+    unknown = [name for name in names if name not in SOURCE_ADAPTERS]
+    if unknown:
+        raise ValueError(f"Unknown sources: {unknown} (known: {list(SOURCE_ADAPTERS)})")
+    return [adapter for name, adapter in SOURCE_ADAPTERS.items() if name in names]
+
+
+def normalize_source(adapter: SourceAdapter, df: pd.DataFrame) -> pd.DataFrame:
+    """Map a raw source frame onto NORMALIZED_COLUMNS plus `source`"""
+    normalized = {}
+    for column in NORMALIZED_COLUMNS:
+        if column not in adapter.columns:
+            normalized[column] = adapter.defaults[column]
+            continue
+        raw = df[adapter.columns[column]]
+        if column in adapter.converters:
+            normalized[column] = adapter.converters[column](raw)
+        elif column in NUMERIC_COLUMNS:
+            normalized[column] = pd.to_numeric(raw, errors='coerce')
+        else:
+            normalized[column] = raw.fillna('')
+    normalized['source'] = adapter.name
+    return pd.DataFrame(normalized)
+
+
+def price_label(price: pd.Series) -> pd.Series:
+    """Ticket price in rupiah as text, 'Gratis' when free or unknown"""
+    return price.apply(lambda x: str(int(x)) if pd.notna(x) and x > 0 else 'Gratis')
+
+
+register_source(SourceAdapter(
+    name='tourism_with_id',
+    file_name='tourism_with_id.csv',
+    columns={
+        'name': 'Place_Name',
+        'category': 'Category',
+        'latitude': 'Lat',
+        'longitude': 'Long',
+        'address': 'City',  # Will be cleaned later
+        'description': 'Description',
+        'descriptionClean': 'Description',
+        'priceRange': 'Price',
+        'rating': 'Rating',
+        'timeMinutes': 'Time_Minutes',
+        'provinsi': 'City',
+        'kotaKabupaten': 'City',
+    },
+    converters={'priceRange': price_label},
+))
+
+register_source(SourceAdapter(
+    name='wisata_indonesia_final',
+    file_name='wisata_indonesia_final.csv',
+    columns={
+        'name': 'nama_wisata',
+        'category': 'kategori',
+        'latitude': 'latitude',
+        'longitude': 'longitude',
+        'address': 'alamat',
+        'description': 'deskripsi',
+        'descriptionClean': 'deskripsi',
+        'provinsi': 'provinsi',
+        'kotaKabupaten': 'kota_kabupaten',
+    },
+    defaults={'priceRange': 'Tidak diketahui', 'rating': np.nan, 'timeMinutes': np.nan},
+))
+
+register_source(SourceAdapter(
+    name='wisata_indonesia_new',
+    file_name='wisata_indonesia_new.csv',
+    columns={
+        'name': 'nama_wisata',
+        'category': 'kategori',
+        'latitude': 'latitude',
+        'longitude': 'longitude',
+        'address': 'alamat',
+        'description': 'deskripsi_bersih',
+        'descriptionClean': 'deskripsi_bersih',
+        'provinsi': 'provinsi',
+        'kotaKabupaten': 'kota_kabupaten',
+    },
+    defaults={'priceRange': 'Tidak diketahui', 'rating': np.nan, 'timeMinutes': np.nan},
+))
@@ -0,0 +1,120 @@
+"""
+Synthetic wisata source CSVs at any scale, for benchmark_merge.py.
+
+Rows are resampled from the real source files (so every column keeps its
+real format) and then perturbed the way scraped data is messy:
+
+- names get a distinguishing word and coordinates move by tens of km, so
+  resampled rows are new places rather than exact duplicates
+- addresses get random case, doubled spaces, postal codes or go missing
+- categories get the typos merge_datasets.CATEGORY_FIXES repairs
+- a share of rows are re-entered in another source as near-duplicates
+  ("Pantai X" -> "X Beach", coordinates a few meters off)
+- a few rows get invalid coordinates or an empty name
+"""
+
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from source_adapters import BASE_DIR, get_sources
+
+NAME_WORDS = [
+    'Indah', 'Asri', 'Baru', 'Permai', 'Sari', 'Lestari', 'Jaya', 'Makmur', 'Elok', 'Raya',
+    'Timur', 'Barat', 'Utara', 'Selatan', 'Tengah', 'Hijau', 'Biru', 'Mas', 'Agung', 'Kencana',
+]
+CATEGORY_TYPOS = ['wisate alam', 'wisawi alam', 'wisath alam', 'wisatr alam', 'wisaub alam',
+                  'wisawa alam', 'wisata  religi', 'cafe view', 'wisata lampion']
+ENGLISH_TYPES = {'Pantai': 'Beach', 'Danau': 'Lake', 'Gunung': 'Mount', 'Bukit': 'Hill', 'Pulau': 'Island'}
+
+COORDINATE_JITTER_DEG = 0.3  # ~33 km
+DUPLICATE_JITTER_DEG = 0.0005  # ~55 m
+DEFAULT_DUPLICATE_RATE = 0.05
+DEFAULT_INVALID_RATE = 0.01
+
+
+def _english_name(name: str) -> str:
+    """"Pantai Kuta" -> "Kuta Beach"; other names get a "Wisata " prefix"""
+    first, _, rest = name.partition(' ')
+    if first in ENGLISH_TYPES and rest:
+        return f"{rest} {ENGLISH_TYPES[first]}"
+    return f"Wisata {name}"
+
+
+def _messy_addresses(addresses: pd.Series, rng: np.random.Generator) -> pd.Series:
+    """10% upper case, 10% doubled spaces, 10% with a postal code, 5% empty"""
+    addresses = addresses.fillna('').astype(str)
+    postal = pd.Series(rng.integers(10000, 99999, len(addresses)).astype(str), index=addresses.index)
+    roll = rng.random(len(addresses))
+    messy = np.select(
+        [roll < 0.10, roll < 0.20, roll < 0.30, roll < 0.35],
+        [addresses.str.upper(), addresses.str.replace(', ', ',  ', regex=False), addresses + ', ' + postal, ''],
+        default=addresses,
+    )
+    return pd.Series(messy, index=addresses.index, dtype=object)
+
+
+def _synthesize_source(template: pd.DataFrame, columns: Dict[str, str], rows: int,
+                       rng: np.random.Generator) -> pd.DataFrame:
+    df = template.sample(rows, replace=True, random_state=rng).reset_index(drop=True)
+    name, lat, lng = columns['name'], columns['latitude'], columns['longitude']
+
+    words = np.array(NAME_WORDS, dtype=object)[rng.integers(0, len(NAME_WORDS), rows)]
+    df[name] = df[name].fillna('').astype(str) + ' ' + words
+    df[lat] = pd.to_numeric(df[lat], errors='coerce') + rng.normal(0, COORDINATE_JITTER_DEG, rows)
+    df[lng] = pd.to_numeric(df[lng], errors='coerce') + rng.normal(0, COORDINATE_JITTER_DEG, rows)
+
+    # Sources that keep a real address column (tourism_with_id reuses City)
+    if columns['address'] not in (columns['kotaKabupaten'], columns['provinsi']):
+        df[columns['address']] = _messy_addresses(df[columns['address']], rng)
+
+    category = columns['category']
+    typo = rng.random(rows) < 0.10
+    df.loc[typo, category] = np.array(CATEGORY_TYPOS, dtype=object)[rng.integers(0, len(CATEGORY_TYPOS), typo.sum())]
+    return df
+
+
+def generate_sources(rows: int, out_dir: Path, seed: int = 42,
+                     duplicate_rate: float = DEFAULT_DUPLICATE_RATE,
+                     invalid_rate: float = DEFAULT_INVALID_RATE) -> Dict[str, Path]:
+    """Write one synthetic CSV per registered source (same file names) into out_dir"""
+    rng = np.random.default_rng(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    adapters = get_sources()
+    templates = {adapter.name: pd.read_csv(BASE_DIR / adapter.file_name) for adapter in adapters}
+    total = sum(len(template) for template in templates.values())
+    # Keep the real share of rows per source
+    sizes = {name: max(1, round(rows * len(template) / total)) for name, template in templates.items()}
+
+    frames = {
+        adapter.name: _synthesize_source(templates[adapter.name], adapter.columns, sizes[adapter.name], rng)
+        for adapter in adapters
+    }
+
+    # Near-duplicates: copy rows of one source into another under another name
+    for target in adapters[1:]:
+        target_df, target_cols = frames[target.name], target.columns
+        source = adapters[rng.integers(0, len(adapters))]
+        source_df, source_cols = frames[source.name], source.columns
+        count = int(len(target_df) * duplicate_rate)
+        src = rng.integers(0, len(source_df), count)
+        dst = rng.choice(len(target_df), count, replace=False)
+        target_df.loc[dst, target_cols['name']] = [_english_name(n) for n in source_df[source_cols['name']].iloc[src]]
+        for coord in ('latitude', 'longitude'):
+            target_df.loc[dst, target_cols[coord]] = (
+                source_df[source_cols[coord]].iloc[src].to_numpy() + rng.normal(0, DUPLICATE_JITTER_DEG, count)
+            )
+
+    paths = {}
+    for adapter in adapters:
+        df, columns = frames[adapter.name], adapter.columns
+        broken = rng.random(len(df)) < invalid_rate
+        df.loc[broken, columns['latitude']] = 0.0  # Null Island
+        df.loc[rng.random(len(df)) < invalid_rate, columns['name']] = np.nan
+        paths[adapter.name] = out_dir / adapter.file_name
+        df.to_csv(paths[adapter.name], index=False)
+    return paths
@@ -0,0 +1,57 @@
+"""
+Text cleaning helpers for the wisata dataset merge.
+
+`clean_text_series` is the vectorized version of `clean_text`: a whole column
+is cleaned at once with precompiled patterns instead of `Series.apply` per row.
+Its output must stay byte-identical to `clean_text`.
+"""
+
+import re
+
+import pandas as pd
+
+# Any whitespace run (including \n, \r, \t) becomes a single space
+WHITESPACE_RE = re.compile(r'\s+')
+# Karakter spesial yang tidak perlu (keep punctuation normal: .,;:()-/)
+SPECIAL_CHARS_RE = re.compile(r'[^\w\s.,;:()\-/]+')
+
+
+def clean_text(text):
+    """Clean a single text value (scalar reference for clean_text_series)"""
+    if pd.isna(text):
+        return ''
+    text = str(text)
+    # Remove newlines and tabs
+    text = text.replace('\n', ' ').replace('\r', ' ').replace('\t', ' ')
+    # Remove multiple spaces
+    text = WHITESPACE_RE.sub(' ', text)
+    # Remove special characters yang tidak perlu (keep punctuation normal: .,;:()-/)
+    text = SPECIAL_CHARS_RE.sub('', text)
+    # Remove leading/trailing spaces
+    text = text.strip()
+    return text
+
+
+def _clean_value(text: str) -> str:
+    """clean_text for a value that is already a str.
+
+    str.split() and the regex \\s share the same whitespace definition, so
+    split/join collapses whitespace runs exactly like WHITESPACE_RE but in C.
+    Leading/trailing spaces it drops would be stripped at the end anyway.
+    """
+    return SPECIAL_CHARS_RE.sub('', ' '.join(text.split())).strip()
+
+
+def clean_text_series(series: pd.Series) -> pd.Series:
+    """Clean a whole text column, byte-identical to clean_text per value.
+
+    Each distinct text is cleaned once and broadcast back, since the sources
+    repeat descriptions such as "Deskripsi tidak ditemukan" and share rows
+    across files. Dedup uses a plain dict: pd.factorize hashes strings as C
+    strings and would merge values that differ after an embedded NUL.
+    Cleaning stays on Python's `re` engine: Arrow's RE2 kernels treat \\w as
+    ASCII-only and would strip non-ASCII letters.
+    """
+    values = series.where(series.notna(), '').astype(str).tolist()
+    cleaned = {text: _clean_value(text) for text in dict.fromkeys(values)}
+    return pd.Series([cleaned[text] for text in values], index=series.index, name=series.name, dtype=object)
@@ -0,0 +1,103 @@
+// Embedding decoding for Firestore documents
+// Mirrors scripts/embedding_codec.py: embeddings are stored as a number array,
+// little-endian float32 / float16 bytes, or a Firestore vector, and the
+// document's `embeddingEncoding` field says which (absent for arrays).
+// They live in side collections keyed by the catalog document's ID (see
+// scripts/embedding_store.py), so catalog reads never download them.
+
+import type { EmbeddingEncoding, StoredEmbedding } from '@/types';
+
+export const EMBEDDING_FIELD = 'embedding';
+export const ENCODING_FIELD = 'embeddingEncoding';
+export const EMBEDDING_DIMENSION = 768;
+export const EMBEDDING_COLLECTIONS = {
+  destinations: 'destination_embeddings',
+  umkm: 'umkm_embeddings',
+} as const;
+
+// IEEE 754 half precision -> number
+function halfToFloat(bits: number): number {
+  const sign = bits & 0x8000 ? -1 : 1;
+  const exponent = (bits >> 10) & 0x1f;
+  const fraction = bits & 0x03ff;
+
+  if (exponent === 0) {
+    return sign * 2 ** -14 * (fraction / 1024); // Subnormal
+  }
+  if (exponent === 0x1f) {
+    return fraction ? NaN : sign * Infinity;
+  }
+  return sign * 2 ** (exponent - 15) * (1 + fraction / 1024);
+}
+
+function toBytes(value: unknown): Uint8Array | null {
+  if (value instanceof Uint8Array) {
+    return value; // Also covers Node's Buffer (Admin SDK)
+  }
+  if (value && typeof (value as { toUint8Array?: unknown }).toUint8Array === 'function') {
+    return (value as { toUint8Array: () => Uint8Array }).toUint8Array(); // Web SDK Bytes
+  }
+  return null;
+}
+
+function decodeBytes(bytes: Uint8Array, encoding?: EmbeddingEncoding): Float32Array {
+  // Without a recorded encoding, tell the two apart by the expected dimension
+  const isHalf = encoding === 'float16' ||
+    (encoding !== 'float32' && bytes.byteLength === EMBEDDING_DIMENSION * 2);
+  const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+
+  if (isHalf) {
+    const out = new Float32Array(bytes.byteLength / 2);
+    for (let i = 0; i < out.length; i++) {
+      out[i] = halfToFloat(view.getUint16(i * 2, true));
+    }
+    return out;
+  }
+
+  const out = new Float32Array(bytes.byteLength / 4);
+  for (let i = 0; i < out.length; i++) {
+    out[i] = view.getFloat32(i * 4, true);
+  }
+  return out;
+}
+
+// Decode any stored form; null when missing or empty
+export function decodeEmbedding(
+  value: StoredEmbedding | null | undefined,
+  encoding?: EmbeddingEncoding
+): Float32Array | null {
+  if (value == null) {
+    return null;
+  }
+
+  let decoded: Float32Array;
+  const bytes = toBytes(value);
+  if (bytes) {
+    decoded = decodeBytes(bytes, encoding);
+  } else if (Array.isArray(value)) {
+    decoded = Float32Array.from(value);
+  } else if (typeof (value as { toArray?: unknown }).toArray === 'function') {
+    decoded = Float32Array.from((value as { toArray: () => number[] }).toArray()); // VectorValue
+  } else {
+    return null;
+  }
+
+  return decoded.length > 0 ? decoded : null;
+}
+
+// Decoded embedding of a document's data
+export function documentEmbedding(data: Record<string, any> | null | undefined): Float32Array | null {
+  if (!data) {
+    return null;
+  }
+  return decodeEmbedding(data[EMBEDDING_FIELD], data[ENCODING_FIELD]);
+}
+
+// Short description for logs instead of dumping every element
+export function describeEmbedding(data: Record<string, any> | null | undefined): string {
+  const embedding = documentEmbedding(data);
+  if (!embedding) {
+    return 'none';
+  }
+  return `${data?.[ENCODING_FIELD] ?? 'array'} of ${embedding.length} floats`;
+}
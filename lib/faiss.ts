@@ -4,6 +4,7 @@
 import fs from 'fs';
 import path from 'path';
 import { createGeminiClient } from './gemini';
+import { COLLECTIONS, getCatalogPointer } from './firestore';
 // Hapus import fs/path jika Anda beralih ke Database Cloud (Firestore/Pinecone)
 // atau pertahankan jika ingin membaca file JSON vektor statis.
 import type { FAISSSearchResult, Category, Province } from '@/types';
@@ -24,24 +25,57 @@ export interface SearchOptions {
 }
 
 export class FAISSClient {
+  private indexRoot: string;
   private indexPath: string;
   private mappingPath: string;
+  private generation: string | null = null;
   private dimension: number;
   private index: any = null; // FAISS index instance
   private indexMapping: FAISSSearchResult[] = [];
   private isLoaded: boolean = false;
 
   constructor(config: FAISSConfig) {
+    this.indexRoot = config.indexPath;
     this.indexPath = path.join(config.indexPath, 'faiss_index.idx');
     this.mappingPath = path.join(config.indexPath, 'index_mapping.json');
     this.dimension = config.dimension;
   }
 
+  /**
+   * Point at the index of the active catalog generation (its faissIndex
+   * directory under the index root), or the root when none is active
+   */
+  private async resolveIndexDir(): Promise<string> {
+    const pointer = await getCatalogPointer(COLLECTIONS.DESTINATIONS);
+    this.generation = pointer.generation;
+    if (pointer.faissIndex) {
+      const dir = path.join(this.indexRoot, pointer.faissIndex);
+      if (fs.existsSync(dir)) return dir;
+      console.warn(`⚠️  No FAISS index for generation ${pointer.generation} at ${dir}, using ${this.indexRoot}`);
+    }
+    return this.indexRoot;
+  }
+
+  /**
+   * Reload when another catalog generation was activated since the last load
+   */
+  private async refresh(): Promise<void> {
+    const pointer = await getCatalogPointer(COLLECTIONS.DESTINATIONS);
+    if (pointer.generation !== this.generation) {
+      // A failed reload keeps serving the index already in memory
+      await this.loadIndex().catch(() => undefined);
+    }
+  }
+
   /**
    * Load FAISS index and mapping from disk
    */
   async loadIndex(): Promise<void> {
     try {
+      const indexDir = await this.resolveIndexDir();
+      this.indexPath = path.join(indexDir, 'faiss_index.idx');
+      this.mappingPath = path.join(indexDir, 'index_mapping.json');
+
       // For now, we'll use a simple in-memory implementation
       // In production, you'd use faiss-node or @xenova/transformers
 
@@ -96,6 +130,7 @@ export class FAISSClient {
     if (!this.isLoaded) {
       throw new Error('FAISS index not loaded. Call loadIndex() first.');
     }
+    await this.refresh();
 
     try {
       const {
@@ -11,11 +11,14 @@ import {
   where,
   orderBy,
   limit,
+  startAfter,
   Timestamp,
   QueryConstraint,
 } from 'firebase/firestore';
-import type { DocumentData } from 'firebase/firestore';
+import type { DocumentData, QueryDocumentSnapshot } from 'firebase/firestore';
 import { db } from './firebase';
+import { coveringCells, distanceKm } from './geo-cells';
+import { matchesTerms, tokenQuery } from './search-tokens';
 import type {
   Destination,
   PaginationOptions,
@@ -25,6 +28,9 @@ import type {
   LocalGuide,
   UserProfile,
   Itinerary,
+  CatalogPointer,
+  CatalogStats,
+  SearchTokens,
 } from '@/types';
 
 // Collection names
@@ -36,6 +42,67 @@ export const COLLECTIONS = {
   LOCAL_GUIDES: 'local_guides',
 } as const;
 
+// Full imports write a new catalog generation (destinations__g<timestamp>)
+// and switch readers by rewriting one pointer document, _catalog/destinations.
+// The pointer is cached briefly; without one the base collection is read.
+export const CATALOG_POINTER_COLLECTION = '_catalog';
+const CATALOG_POINTER_TTL_MS = 60 * 1000;
+const catalogPointers = new Map<string, { pointer: CatalogPointer; expiresAt: number }>();
+
+export async function getCatalogPointer(base: string): Promise<CatalogPointer> {
+  const cached = catalogPointers.get(base);
+  if (cached && cached.expiresAt > Date.now()) {
+    return cached.pointer;
+  }
+
+  let pointer: CatalogPointer = { generation: null, collection: base, faissIndex: null };
+  try {
+    const snapshot = await getDoc(doc(db, CATALOG_POINTER_COLLECTION, base));
+    const data = snapshot.exists() ? snapshot.data() : null;
+    if (data?.collection) {
+      pointer = {
+        generation: data.generation ?? null,
+        collection: data.collection,
+        faissIndex: data.faissIndex ?? null,
+        previous: data.previous ?? null,
+      };
+    }
+  } catch (error) {
+    console.warn(`Catalog pointer for ${base} unavailable, reading ${base}:`, error);
+  }
+  catalogPointers.set(base, { pointer, expiresAt: Date.now() + CATALOG_POINTER_TTL_MS });
+  return pointer;
+}
+
+// Collection currently serving a catalog (destinations or its active generation)
+export const resolveCollection = async (base: string): Promise<string> =>
+  (await getCatalogPointer(base)).collection;
+
+// Summary counts the importer stores in _stats/{collection}; null when there are none
+export const STATS_COLLECTION = '_stats';
+const catalogStats = new Map<string, { stats: CatalogStats | null; expiresAt: number }>();
+
+export async function getCatalogStats(base: string): Promise<CatalogStats | null> {
+  const collectionName = await resolveCollection(base);
+  const cached = catalogStats.get(collectionName);
+  if (cached && cached.expiresAt > Date.now()) {
+    return cached.stats;
+  }
+
+  let stats: CatalogStats | null = null;
+  try {
+    const snapshot = await getDoc(doc(db, STATS_COLLECTION, collectionName));
+    stats = snapshot.exists() ? (snapshot.data() as CatalogStats) : null;
+  } catch (error) {
+    console.warn(`Stats for ${collectionName} unavailable:`, error);
+  }
+  catalogStats.set(collectionName, { stats, expiresAt: Date.now() + CATALOG_POINTER_TTL_MS });
+  return stats;
+}
+
+// Candidates read per page by a token query before the remaining words are checked
+const TOKEN_PAGE_SIZE = 200;
+
 // Generic Firestore operations
 export class FirestoreService {
   // Get document by ID
@@ -110,6 +177,62 @@ export class FirestoreService {
     }
   }
 
+  // Documents within radiusKm of a point: one `in` query on the geohash cells
+  // around it (lib/geo-cells.ts), then the exact distance. null when the
+  // radius needs more cells than one query allows.
+  static async queryNear<T extends { latitude: number; longitude: number }>(
+    collectionName: string,
+    latitude: number,
+    longitude: number,
+    radiusKm: number,
+    constraints: QueryConstraint[] = []
+  ): Promise<T[] | null> {
+    const covering = coveringCells(latitude, longitude, radiusKm);
+    if (!covering) return null;
+
+    const candidates = await this.queryDocuments<T>(collectionName, [
+      where(covering.field, 'in', covering.cells),
+      ...constraints,
+    ]);
+    return candidates.filter(candidate =>
+      distanceKm(latitude, longitude, candidate.latitude, candidate.longitude) <= radiusKm
+    );
+  }
+
+  // Documents whose search tokens match every word of text: one
+  // `array-contains` query (lib/search-tokens.ts), the other words checked
+  // here. Candidates are read a page at a time until `limit` match or the
+  // query runs out, so a common word cannot hide later matches. prefix
+  // matches words as typed so far. null when text has no word.
+  static async queryTokens<T extends SearchTokens>(
+    collectionName: string,
+    text: string,
+    options: { prefix?: boolean; limit?: number; constraints?: QueryConstraint[] } = {}
+  ): Promise<T[] | null> {
+    const { prefix = true, limit: maxResults = 20, constraints = [] } = options;
+    const tokens = tokenQuery(text, prefix);
+    if (!tokens) return null;
+
+    const candidates = query(
+      collection(db, collectionName),
+      where(tokens.field, 'array-contains', tokens.value),
+      ...constraints,
+      limit(TOKEN_PAGE_SIZE)
+    );
+    const matches: T[] = [];
+    let last: QueryDocumentSnapshot<DocumentData> | undefined;
+    while (matches.length < maxResults) {
+      const page = await getDocs(last ? query(candidates, startAfter(last)) : candidates);
+      for (const snapshot of page.docs) {
+        const candidate = { id: snapshot.id, ...snapshot.data() } as T;
+        if (matchesTerms(candidate.searchTokens, tokens.terms, prefix)) matches.push(candidate);
+      }
+      if (page.docs.length < TOKEN_PAGE_SIZE) break;
+      last = page.docs[page.docs.length - 1];
+    }
+    return matches.slice(0, maxResults);
+  }
+
   // Query with multiple constraints
   static async queryDocuments<T>(
     collectionName: string,
@@ -159,7 +282,7 @@ export class FirestoreService {
 // Destination-specific functions
 export class DestinationService {
   static async getById(id: string): Promise<Destination | null> {
-    return FirestoreService.getDocument<Destination>(COLLECTIONS.DESTINATIONS, id);
+    return FirestoreService.getDocument<Destination>(await resolveCollection(COLLECTIONS.DESTINATIONS), id);
   }
 
   static async getAll(options: PaginationOptions & {
@@ -199,7 +322,7 @@ export class DestinationService {
       const sortOptions = options.sort || { field: 'createdAt', direction: 'desc' };
 
       const destinations = await FirestoreService.queryDocuments<Destination>(
-        COLLECTIONS.DESTINATIONS,
+        await resolveCollection(COLLECTIONS.DESTINATIONS),
         constraints,
         {
           limit: options.limit,
@@ -221,7 +344,7 @@ export class DestinationService {
 
   static async getByProvince(province: string, limit = 50): Promise<Destination[]> {
     return FirestoreService.queryDocuments<Destination>(
-      COLLECTIONS.DESTINATIONS,
+      await resolveCollection(COLLECTIONS.DESTINATIONS),
       [where('provinsi', '==', province)],
       { limit }
     );
@@ -229,17 +352,24 @@ export class DestinationService {
 
   static async getCultural(limit = 50): Promise<Destination[]> {
     return FirestoreService.queryDocuments<Destination>(
-      COLLECTIONS.DESTINATIONS,
+      await resolveCollection(COLLECTIONS.DESTINATIONS),
       [where('isCultural', '==', true)],
       { limit }
     );
   }
 
   static async searchByName(name: string, limit = 20): Promise<Destination[]> {
+    const collectionName = await resolveCollection(COLLECTIONS.DESTINATIONS);
+    const stats = await getCatalogStats(COLLECTIONS.DESTINATIONS);
+    if (stats?.searchIndexed) {
+      const matches = await FirestoreService.queryTokens<Destination>(collectionName, name, { limit });
+      if (matches) return matches;
+    }
+
     // Note: Firestore doesn't have full-text search
     // This is a simple contains search - use FAISS for semantic search
     return FirestoreService.queryDocuments<Destination>(
-      COLLECTIONS.DESTINATIONS,
+      collectionName,
       [], // No constraints for now
       { limit: 1000 } // Get all and filter client-side
     ).then(destinations =>
@@ -272,6 +402,29 @@ export class UMKMService {
       { limit }
     );
   }
+
+  static async searchByName(name: string, limit = 20): Promise<UMKM[]> {
+    const stats = await getCatalogStats(COLLECTIONS.UMKM);
+    if (stats?.searchIndexed) {
+      const matches = await FirestoreService.queryTokens<UMKM>(COLLECTIONS.UMKM, name, { limit });
+      if (matches) return matches;
+    }
+    return (await this.getAll(1000))
+      .filter(umkm => umkm.name.toLowerCase().includes(name.toLowerCase()))
+      .slice(0, limit);
+  }
+
+  static async getNear(latitude: number, longitude: number, radiusKm = 10): Promise<UMKM[]> {
+    const stats = await getCatalogStats(COLLECTIONS.UMKM);
+    if (stats?.geoIndexed) {
+      const nearby = await FirestoreService.queryNear<UMKM>(COLLECTIONS.UMKM, latitude, longitude, radiusKm);
+      if (nearby) return nearby;
+    }
+    // Cells missing (see scripts/backfill-geo-cells.py) or radius too large
+    return (await this.getAll(1000)).filter(umkm =>
+      distanceKm(latitude, longitude, umkm.latitude, umkm.longitude) <= radiusKm
+    );
+  }
 }
 
 // Local Guide-specific functions
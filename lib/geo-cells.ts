@@ -0,0 +1,103 @@
+// Geohash cells for proximity queries
+// Mirrors scripts/geo_cells.py: destinations and UMKM carry `geohash`
+// (precision 9) and `geohash3` .. `geohash6`. A lookup asks for the cells
+// around a point with one `in` query on a single field (served by the
+// automatic index, so it also works on catalog generations) and then
+// filters by exact distance.
+
+export const GEOHASH_FIELD = 'geohash';
+export const CELL_PRECISIONS = [3, 4, 5, 6] as const;
+export const MAX_QUERY_CELLS = 30; // Firestore's limit for `in`
+
+const BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz';
+const EARTH_RADIUS_KM = 6371;
+const KM_PER_DEGREE = 111.32;
+
+export type CellPrecision = (typeof CELL_PRECISIONS)[number];
+
+export const cellField = (precision: CellPrecision): string => `${GEOHASH_FIELD}${precision}`;
+
+export function encodeGeohash(latitude: number, longitude: number, precision = 9): string {
+  const latRange = [-90, 90];
+  const lngRange = [-180, 180];
+  let hash = '';
+  let value = 0;
+  let bits = 0;
+  let evenBit = true; // Longitude first
+
+  while (hash.length < precision) {
+    const range = evenBit ? lngRange : latRange;
+    const coordinate = evenBit ? longitude : latitude;
+    const mid = (range[0] + range[1]) / 2;
+    value <<= 1;
+    if (coordinate >= mid) {
+      value |= 1;
+      range[0] = mid;
+    } else {
+      range[1] = mid;
+    }
+    evenBit = !evenBit;
+
+    if (++bits === 5) {
+      hash += BASE32[value];
+      bits = 0;
+      value = 0;
+    }
+  }
+  return hash;
+}
+
+// Cell height and width in degrees
+function cellSpan(precision: number): [number, number] {
+  const bits = 5 * precision;
+  const lngBits = Math.ceil(bits / 2);
+  const latBits = Math.floor(bits / 2);
+  return [180 / 2 ** latBits, 360 / 2 ** lngBits];
+}
+
+/**
+ * Cells covering the box around a point at the finest precision that needs
+ * at most MAX_QUERY_CELLS of them; null when even the coarsest needs more
+ */
+export function coveringCells(
+  latitude: number,
+  longitude: number,
+  radiusKm: number
+): { field: string; cells: string[] } | null {
+  const dLat = radiusKm / KM_PER_DEGREE;
+  const dLng = radiusKm / (KM_PER_DEGREE * Math.max(Math.cos((latitude * Math.PI) / 180), 0.01));
+  const south = Math.max(-90, latitude - dLat);
+  const north = Math.min(90, latitude + dLat);
+
+  for (const precision of [...CELL_PRECISIONS].reverse()) {
+    const [latSpan, lngSpan] = cellSpan(precision);
+    const firstRow = Math.floor((south + 90) / latSpan);
+    const firstCol = Math.floor((longitude - dLng + 180) / lngSpan);
+    const rows = Math.floor((north + 90) / latSpan) - firstRow + 1;
+    const cols = Math.floor((longitude + dLng + 180) / lngSpan) - firstCol + 1;
+    if (rows * cols > MAX_QUERY_CELLS) continue;
+
+    const cells = new Set<string>();
+    for (let row = 0; row < rows; row++) {
+      for (let col = 0; col < cols; col++) {
+        const cellLat = (firstRow + row + 0.5) * latSpan - 90;
+        const cellLng = ((((firstCol + col + 0.5) * lngSpan) % 360) + 360) % 360 - 180; // Wraps at 180
+        cells.add(encodeGeohash(cellLat, cellLng, precision));
+      }
+    }
+    return { field: cellField(precision), cells: [...cells] };
+  }
+  return null;
+}
+
+/**
+ * Great-circle distance in km (Haversine)
+ */
+export function distanceKm(lat1: number, lng1: number, lat2: number, lng2: number): number {
+  const dLat = ((lat2 - lat1) * Math.PI) / 180;
+  const dLng = ((lng2 - lng1) * Math.PI) / 180;
+  const a =
+    Math.sin(dLat / 2) ** 2 +
+    Math.cos((lat1 * Math.PI) / 180) * Math.cos((lat2 * Math.PI) / 180) * Math.sin(dLng / 2) ** 2;
+  return 2 * EARTH_RADIUS_KM * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
+}
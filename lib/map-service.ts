@@ -6,7 +6,7 @@
 import { db } from './firebase';
 import { collection, query, where, getDocs, doc, getDoc } from 'firebase/firestore';
 import type { Destination } from '../types';
-import { serializeFirestoreData } from './firestore';
+import { COLLECTIONS, FirestoreService, getCatalogStats, resolveCollection, serializeFirestoreData } from './firestore';
 
 export interface MapBounds {
   north: number;
@@ -34,6 +34,9 @@ export interface DestinationFilter {
   bounds?: MapBounds;
 }
 
+// Matches returned by an indexed name search
+const SEARCH_LIMIT = 200;
+
 /**
  * Map Service class for handling all map-related operations
  */
@@ -43,7 +46,7 @@ export class MapService {
    */
   static async getAllDestinations(): Promise<Destination[]> {
     try {
-      const destinationsRef = collection(db, 'destinations');
+      const destinationsRef = collection(db, await resolveCollection(COLLECTIONS.DESTINATIONS));
       const querySnapshot = await getDocs(destinationsRef);
 
       return querySnapshot.docs.map(doc => {
@@ -64,7 +67,7 @@ export class MapService {
    */
   static async getDestinationById(id: string): Promise<Destination | null> {
     try {
-      const docRef = doc(db, 'destinations', id);
+      const docRef = doc(db, await resolveCollection(COLLECTIONS.DESTINATIONS), id);
       const docSnap = await getDoc(docRef);
 
       if (docSnap.exists()) {
@@ -86,6 +89,18 @@ export class MapService {
    */
   static async searchDestinations(searchTerm: string): Promise<Destination[]> {
     try {
+      const stats = await getCatalogStats(COLLECTIONS.DESTINATIONS);
+      if (stats?.searchIndexed) {
+        const matches = await FirestoreService.queryTokens<Destination>(
+          await resolveCollection(COLLECTIONS.DESTINATIONS),
+          searchTerm,
+          { limit: SEARCH_LIMIT }
+        );
+        if (matches) {
+          return matches.map(dest => serializeFirestoreData(dest));
+        }
+      }
+
       const allDestinations = await this.getAllDestinations();
 
       const lowerSearchTerm = searchTerm.toLowerCase();
@@ -174,10 +189,15 @@ export class MapService {
   }
 
   /**
-   * Get unique categories
+   * Get unique categories (from the import's stats document when there is one)
    */
   static async getCategories(): Promise<string[]> {
     try {
+      const stats = await getCatalogStats(COLLECTIONS.DESTINATIONS);
+      if (stats?.byCategory) {
+        return Object.keys(stats.byCategory);
+      }
+
       const destinations = await this.getAllDestinations();
       const categories = [...new Set(destinations.map(d => d.category))];
       return categories.filter(cat => cat) as string[];
@@ -188,10 +208,15 @@ export class MapService {
   }
 
   /**
-   * Get unique provinces
+   * Get unique provinces (from the import's stats document when there is one)
    */
   static async getProvinces(): Promise<string[]> {
     try {
+      const stats = await getCatalogStats(COLLECTIONS.DESTINATIONS);
+      if (stats?.byProvinsi) {
+        return Object.keys(stats.byProvinsi);
+      }
+
       const destinations = await this.getAllDestinations();
       const provinces = [...new Set(destinations.map(d => d.provinsi))];
       return provinces.filter(prov => prov) as string[];
@@ -202,7 +227,8 @@ export class MapService {
   }
 
   /**
-   * Get destinations near a location (simple distance-based)
+   * Get destinations near a location: a geohash cell query when the catalog
+   * has cells, otherwise a box filter over all destinations
    */
   static async getDestinationsNear(
     lat: number,
@@ -210,6 +236,19 @@ export class MapService {
     radiusKm: number = 10
   ): Promise<Destination[]> {
     try {
+      const stats = await getCatalogStats(COLLECTIONS.DESTINATIONS);
+      if (stats?.geoIndexed) {
+        const nearby = await FirestoreService.queryNear<Destination>(
+          await resolveCollection(COLLECTIONS.DESTINATIONS),
+          lat,
+          lng,
+          radiusKm
+        );
+        if (nearby) {
+          return nearby.map(dest => serializeFirestoreData(dest));
+        }
+      }
+
       const destinations = await this.getAllDestinations();
       const radiusDegrees = radiusKm / 111; // Rough conversion km to degrees
 
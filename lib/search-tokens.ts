@@ -0,0 +1,51 @@
+// Search tokens for indexed name lookups
+// Mirrors scripts/search_tokens.py: destinations and UMKM carry
+// `searchTokens` (folded words of name, category and region) and
+// `searchPrefixes` (their 2..10 character prefixes). A lookup is one
+// `array-contains` query on the longest word, served by the automatic
+// array index, with the remaining words checked in the client.
+// Longest is a heuristic for selective: Firestore keeps no per-token
+// counts, and long words are usually rarer ('borobudur' vs 'candi').
+// Callers page through the candidates, so a poor pick only costs reads.
+
+export const TOKENS_FIELD = 'searchTokens';
+export const PREFIXES_FIELD = 'searchPrefixes';
+export const MIN_TOKEN_LENGTH = 2;
+export const MIN_PREFIX_LENGTH = 2;
+export const MAX_PREFIX_LENGTH = 10;
+
+// Same folding as doc_ids.normalize_key: accents stripped, lowercase,
+// anything but ASCII letters and digits separates words
+export function searchTerms(text: string): string[] {
+  const words = text
+    .normalize('NFKD')
+    .replace(/[^\x00-\x7f]/g, '')
+    .toLowerCase()
+    .split(/[^a-z0-9]+/)
+    .filter(word => word.length >= MIN_TOKEN_LENGTH);
+  return Array.from(new Set(words));
+}
+
+export interface TokenQuery {
+  field: string;
+  value: string;
+  terms: string[];
+}
+
+// Keyword mode matches whole words; prefix mode (type-ahead) matches words
+// that start with each term. null when the text has no usable term.
+export function tokenQuery(text: string, prefix = true): TokenQuery | null {
+  const terms = searchTerms(text);
+  if (terms.length === 0) return null;
+  const longest = terms.reduce((a, b) => (b.length > a.length ? b : a));
+  return prefix
+    ? { field: PREFIXES_FIELD, value: longest.slice(0, MAX_PREFIX_LENGTH), terms }
+    : { field: TOKENS_FIELD, value: longest, terms };
+}
+
+export function matchesTerms(tokens: string[] | undefined, terms: string[], prefix = true): boolean {
+  if (!tokens) return false;
+  return terms.every(term =>
+    prefix ? tokens.some(token => token.startsWith(term)) : tokens.includes(term)
+  );
+}
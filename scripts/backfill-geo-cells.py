@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backfill geohash cell fields
+
+Adds the geo_cells.py fields to documents written before the importers
+computed them, so proximity queries can use them. Collections are read a
+page at a time with a projection on the coordinates; cells are computed
+for the whole page at once and merged into the documents that lack them
+or carry stale ones. Finally the collection's stats document
+(catalog_stats.py) is marked geoIndexed, which is what the app checks
+before switching from a full scan to cell queries.
+
+Usage:
+    uv run python scripts/backfill-geo-cells.py --dry-run
+    uv run python scripts/backfill-geo-cells.py
+    uv run python scripts/backfill-geo-cells.py --collection umkm
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore, initialize_app
+
+from catalog_generations import active_collection
+from catalog_stats import write_stats
+from firestore_batches import commit_batches
+from geo_cells import CELL_PRECISIONS, GEOHASH_FIELD, add_geo_fields, cell_field
+
+DEFAULT_COLLECTIONS = ['destinations', 'umkm']
+DEFAULT_PAGE_SIZE = 1000
+CELL_FIELDS = [GEOHASH_FIELD] + [cell_field(precision) for precision in CELL_PRECISIONS]
+
+
+def backfill_collection(db, collection: str, dry_run: bool = False,
+                        page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    stats = {'documents': 0, 'updated': 0, 'unlocated': 0, 'failed': 0}
+    ref = db.collection(collection)
+    query = ref.select(['latitude', 'longitude'] + CELL_FIELDS).order_by('__name__').limit(page_size)
+    last = None
+
+    while True:
+        page = list((query.start_after(last) if last is not None else query).stream())
+        if not page:
+            break
+        last = page[-1]
+        stats['documents'] += len(page)
+
+        current = [snapshot.to_dict() or {} for snapshot in page]
+        computed = add_geo_fields([{key: data.get(key) for key in ('latitude', 'longitude')} for data in current])
+        writes = []
+        for snapshot, data, cells in zip(page, current, computed):
+            if GEOHASH_FIELD not in cells:
+                stats['unlocated'] += 1
+                continue
+            update = {field: cells[field] for field in CELL_FIELDS if data.get(field) != cells[field]}
+            if update:
+                writes.append((ref.document(snapshot.id), update))
+        stats['updated'] += len(writes)
+        if dry_run or not writes:
+            continue
+
+        report = commit_batches(db, writes, merge=True)
+        stats['failed'] += len(report.failed)
+        for error in report.errors[:3]:
+            print(f"   ⚠️  {error}")
+        print(f"   {stats['documents']} documents read, {stats['updated']} updated")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add geohash cell fields to existing documents')
+    parser.add_argument('--collection', action='append',
+                        help=f"collection to backfill (repeatable, default: {', '.join(DEFAULT_COLLECTIONS)}; "
+                             f"destinations means the active generation)")
+    parser.add_argument('--dry-run', action='store_true', help='only count what would change')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    load_dotenv('.env.local')
+    service_account_path = os.path.join(os.getcwd(), 'serviceAccountKey.json')
+    initialize_app(credentials.Certificate(service_account_path))
+    db = firestore.client()
+
+    failed = 0
+    for name in args.collection or DEFAULT_COLLECTIONS:
+        collection = active_collection(db, name) if name == 'destinations' else name
+        print(f"🌐 {'Checking' if args.dry_run else 'Backfilling'} {collection}...")
+        start = time.perf_counter()
+        stats = backfill_collection(db, collection, args.dry_run, args.page_size)
+        failed += stats['failed']
+        print(f"✅ {collection}: {stats['documents']} documents, {stats['updated']} "
+              f"{'to update' if args.dry_run else 'updated'}, {stats['unlocated']} without coordinates "
+              f"({time.perf_counter() - start:.1f}s)")
+        if not args.dry_run and not stats['failed']:
+            write_stats(db, collection, {'count': stats['documents'], 'geoIndexed': True}, merge=True)
+
+    if failed:
+        print(f"❌ {failed} documents failed, rerun to retry them")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Backfill search token fields
+
+Adds the search_tokens.py fields to documents written before the importers
+generated them, a page at a time with a projection on the source fields,
+merging only into documents whose tokens are missing or stale. Finally the
+collection's stats document (catalog_stats.py) is marked searchIndexed,
+which is what the app checks before switching from filtering the whole
+collection to token queries.
+
+Usage:
+    uv run python scripts/backfill-search-tokens.py --dry-run
+    uv run python scripts/backfill-search-tokens.py
+    uv run python scripts/backfill-search-tokens.py --collection umkm
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore, initialize_app
+
+from catalog_generations import active_collection
+from catalog_stats import write_stats
+from firestore_batches import commit_batches
+from search_tokens import PREFIXES_FIELD, SOURCE_FIELDS, TOKENS_FIELD, search_fields
+
+DEFAULT_COLLECTIONS = ['destinations', 'umkm']
+DEFAULT_PAGE_SIZE = 1000
+TOKEN_FIELDS = [TOKENS_FIELD, PREFIXES_FIELD]
+
+
+def backfill_collection(db, collection: str, dry_run: bool = False,
+                        page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    stats = {'documents': 0, 'updated': 0, 'failed': 0}
+    ref = db.collection(collection)
+    query = ref.select(list(SOURCE_FIELDS) + TOKEN_FIELDS).order_by('__name__').limit(page_size)
+    last = None
+
+    while True:
+        page = list((query.start_after(last) if last is not None else query).stream())
+        if not page:
+            break
+        last = page[-1]
+        stats['documents'] += len(page)
+
+        writes = []
+        for snapshot in page:
+            data = snapshot.to_dict() or {}
+            fields = search_fields(data)
+            update = {field: fields[field] for field in TOKEN_FIELDS if data.get(field) != fields[field]}
+            if update:
+                writes.append((ref.document(snapshot.id), update))
+        stats['updated'] += len(writes)
+        if dry_run or not writes:
+            continue
+
+        report = commit_batches(db, writes, merge=True)
+        stats['failed'] += len(report.failed)
+        for error in report.errors[:3]:
+            print(f"   ⚠️  {error}")
+        print(f"   {stats['documents']} documents read, {stats['updated']} updated")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Add search token fields to existing documents')
+    parser.add_argument('--collection', action='append',
+                        help=f"collection to backfill (repeatable, default: {', '.join(DEFAULT_COLLECTIONS)}; "
+                             f"destinations means the active generation)")
+    parser.add_argument('--dry-run', action='store_true', help='only count what would change')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    load_dotenv('.env.local')
+    service_account_path = os.path.join(os.getcwd(), 'serviceAccountKey.json')
+    initialize_app(credentials.Certificate(service_account_path))
+    db = firestore.client()
+
+    failed = 0
+    for name in args.collection or DEFAULT_COLLECTIONS:
+        collection = active_collection(db, name) if name == 'destinations' else name
+        print(f"🔤 {'Checking' if args.dry_run else 'Backfilling'} {collection}...")
+        start = time.perf_counter()
+        stats = backfill_collection(db, collection, args.dry_run, args.page_size)
+        failed += stats['failed']
+        print(f"✅ {collection}: {stats['documents']} documents, {stats['updated']} "
+              f"{'to update' if args.dry_run else 'updated'} ({time.perf_counter() - start:.1f}s)")
+        if not args.dry_run and not stats['failed']:
+            write_stats(db, collection, {'count': stats['documents'], 'searchIndexed': True}, merge=True)
+
+    if failed:
+        print(f"❌ {failed} documents failed, rerun to retry them")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
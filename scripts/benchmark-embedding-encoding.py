@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embedding encoding benchmark
+
+Compares the embedding encodings of embedding_codec.py on a destination-
+sized document: storage size (Firestore's size rules), wire size (the
+encoded Write protobuf), batches needed for an upload, encode and decode
+time per document, and how far cosine similarity moves from float32.
+It also compares a catalog read (what map-service.ts and the API routes
+fetch) with the embedding inline and in its side collection
+(embedding_store.py).
+
+Vectors come from the saved FAISS index when there is one, otherwise
+random unit vectors are used.
+
+Usage:
+    uv run python scripts/benchmark-embedding-encoding.py
+    uv run python scripts/benchmark-embedding-encoding.py --docs 20000 --index ./faiss_index
+"""
+
+import argparse
+import os
+import sys
+import time
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import numpy as np
+from google.cloud.firestore_v1 import _helpers
+from google.cloud.firestore_v1.types import document, write
+
+from embedding_codec import EMBEDDING_DIMENSION, ENCODINGS, decode_embedding, encode_embedding
+from firestore_batches import estimate_size, plan_batches
+
+# A typical destination document without its embedding
+SAMPLE_DOCUMENT = {
+    'name': 'Candi Borobudur',
+    'category': 'budaya',
+    'description': 'Candi Buddha terbesar di dunia, dibangun pada abad ke-9 oleh wangsa Syailendra. ' * 3,
+    'descriptionClean': 'Candi Buddha terbesar di dunia, dibangun pada abad ke-9.',
+    'provinsi': 'jawa-tengah',
+    'kotaKabupaten': 'Magelang',
+    'address': 'Jl. Badrawati, Borobudur, Magelang',
+    'latitude': -7.6079,
+    'longitude': 110.2038,
+    'rating': 4.7,
+    'priceRange': 'sedang',
+    'timeMinutes': 180,
+    'isCultural': True,
+    'contentHash': '0123456789abcdef',
+}
+DOCUMENT_PATH = 'projects/p/databases/(default)/documents/destinations/candi-borobudur-3f2a9c0d41b7'
+
+
+class _Ref:
+    path = DOCUMENT_PATH.split('/documents/')[1]
+
+
+def load_vectors(docs: int, index_path: str, seed: int) -> np.ndarray:
+    if os.path.exists(os.path.join(index_path, 'faiss_index.idx')):
+        from semantic_dedupe import load_index
+        vectors, _ = load_index(index_path)
+        if len(vectors):
+            print(f"📂 Using {len(vectors)} vectors from {index_path}")
+            return np.resize(vectors, (docs, vectors.shape[1])).astype(np.float32)
+    print(f"🎲 No saved index, using {docs} random unit vectors")
+    vectors = np.random.default_rng(seed).standard_normal((docs, EMBEDDING_DIMENSION)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def wire_size(fields) -> int:
+    pb = write.Write(update={'name': DOCUMENT_PATH, 'fields': _helpers.encode_dict(fields)})
+    return write.Write.pb(pb).ByteSize()
+
+
+def parse_seconds(fields, repeat: int) -> float:
+    """Time to deserialize a Document response carrying fields, per document"""
+    payload = document.Document.pb(document.Document(name=DOCUMENT_PATH, fields=_helpers.encode_dict(fields)))
+    raw = payload.SerializeToString()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        type(payload).FromString(raw)
+    return (time.perf_counter() - start) / repeat
+
+
+def catalog_reads(vectors: np.ndarray) -> dict:
+    """Bytes and parse time of one catalog document, embedding inline vs side collection"""
+    inline = {**SAMPLE_DOCUMENT, 'embedding': vectors[0].tolist()}
+    return {
+        'inlineWire': wire_size(inline),
+        'leanWire': wire_size(SAMPLE_DOCUMENT),
+        'inlineParseUs': parse_seconds(inline, 2000) * 1e6,
+        'leanParseUs': parse_seconds(SAMPLE_DOCUMENT, 2000) * 1e6,
+    }
+
+
+def benchmark(encoding: str, vectors: np.ndarray) -> dict:
+    values = [vector.tolist() for vector in vectors]  # Gemini returns Python floats
+
+    start = time.perf_counter()
+    encoded = [encode_embedding(value, encoding) for value in values]
+    encode_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = np.stack([decode_embedding(fields['embedding'], fields.get('embeddingEncoding'))
+                        for fields in encoded])
+    decode_seconds = time.perf_counter() - start
+
+    documents = [{**SAMPLE_DOCUMENT, **fields} for fields in encoded]
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    decoded_unit = decoded / np.linalg.norm(decoded, axis=1, keepdims=True)
+    # Similarity of each vector to its neighbour, before and after the round trip
+    drift = np.abs(np.sum(unit * np.roll(unit, 1, axis=0), axis=1)
+                   - np.sum(decoded_unit * np.roll(decoded_unit, 1, axis=0), axis=1))
+    return {
+        'storage': estimate_size(documents[0]),
+        'embeddingStorage': estimate_size(encoded[0]),
+        'wire': wire_size(documents[0]),
+        'batches': len(plan_batches([(_Ref, doc) for doc in documents])),
+        'encodeUs': encode_seconds / len(values) * 1e6,
+        'decodeUs': decode_seconds / len(values) * 1e6,
+        'maxCosineDrift': float(drift.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare embedding encodings for Firestore documents')
+    parser.add_argument('--docs', type=int, default=10000, help='documents per encoding')
+    parser.add_argument('--index', default=os.getenv('FAISS_INDEX_PATH', './faiss_index'), help='FAISS index directory')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    vectors = load_vectors(args.docs, args.index, args.seed)
+    results = {encoding: benchmark(encoding, vectors) for encoding in ENCODINGS}
+    baseline = results['array']
+
+    print(f"\n📊 {args.docs:,} documents, {vectors.shape[1]} dimensions\n")
+    print(f"{'encoding':<9} {'embedding':>10} {'document':>10} {'wire':>10} {'vs array':>9} "
+          f"{'batches':>8} {'encode':>10} {'decode':>10} {'cos drift':>10}")
+    for encoding, r in results.items():
+        print(f"{encoding:<9} {r['embeddingStorage']:>9,}B {r['storage']:>9,}B {r['wire']:>9,}B "
+              f"{r['wire'] / baseline['wire']:>8.0%} {r['batches']:>8} "
+              f"{r['encodeUs']:>8.1f}us {r['decodeUs']:>8.1f}us {r['maxCosineDrift']:>10.1e}")
+
+    reads = catalog_reads(vectors)
+    print(f"\n📖 Catalog document read (array embedding inline vs side collection)")
+    print(f"   inline: {reads['inlineWire']:>7,}B, {reads['inlineParseUs']:.1f}us to parse")
+    print(f"   lean:   {reads['leanWire']:>7,}B, {reads['leanParseUs']:.1f}us to parse "
+          f"({reads['inlineWire'] / reads['leanWire']:.1f}x smaller, "
+          f"{reads['inlineParseUs'] / reads['leanParseUs']:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
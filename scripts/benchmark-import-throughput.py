@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Import throughput benchmark on the Firestore emulator
+
+Runs each upload strategy the scripts have used over the same synthetic
+dataset and reports documents per second, commit latency (p50 / p95) and
+retries:
+
+    per-doc          one set() per document
+    batch-50         sequential WriteBatch commits of 50 (seed scripts)
+    batch-100        sequential WriteBatch commits of 100
+    batch-500        sequential WriteBatch commits of 500 (old setup-firebase-data)
+    commit-batches   firestore_batches.commit_batches: byte-budgeted batches, 8 in flight
+    bulk-writer      BulkWriter in parallel mode, as import-data.py uploads
+
+Latency is per commit request; for the BulkWriter, which does not expose
+its batches, it is per write from enqueue to acknowledgement. Sequential
+strategies retry transient errors like commit_batches does, so retry
+counts are comparable.
+
+The emulator is started with `firebase emulators:start --only firestore`
+(port from firebase.json) unless FIRESTORE_EMULATOR_HOST already points at
+a running one, and its data is cleared before every run. Emulator numbers
+are for comparing strategies with each other, not for predicting
+production throughput: the emulator has no quota ramp-up and commits on a
+single node.
+
+Usage:
+    uv run python scripts/benchmark-import-throughput.py
+    uv run python scripts/benchmark-import-throughput.py --docs 20000 --payload-bytes 4000
+    uv run python scripts/benchmark-import-throughput.py --strategy batch-500 --strategy bulk-writer --embedding-dims 768
+    FIRESTORE_EMULATOR_HOST=localhost:8080 uv run python scripts/benchmark-import-throughput.py --json bench.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import numpy as np
+from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions, SendMode
+
+from doc_ids import destination_id
+from embedding_codec import DEFAULT_ENCODING, ENCODINGS, encode_embedding
+from firestore_batches import BACKOFF_SECONDS, MAX_ROUNDS, RETRYABLE_ERRORS, commit_batches
+
+DEFAULT_PROJECT = 'palapa-budayago'  # package.json "emulator" script
+DEFAULT_EMULATOR_PORT = 8080  # When firebase.json has none
+EMULATOR_START_TIMEOUT = 90
+COLLECTION = 'benchmark_destinations'
+BULK_INITIAL_OPS_PER_SECOND = 500
+BULK_MAX_OPS_PER_SECOND = 10000
+BULK_MAX_ATTEMPTS = 8
+# gRPC codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, INTERNAL, UNAVAILABLE
+RETRYABLE_CODES = {4, 8, 10, 13, 14}
+
+
+class StrategyResult(NamedTuple):
+    strategy: str
+    documents: int
+    written: int
+    seconds: float
+    commits: int
+    p50_ms: float
+    p95_ms: float
+    retries: int
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.written / self.seconds if self.seconds else 0.0
+
+
+Writes = List[Tuple[Any, Dict[str, Any]]]
+
+
+def synthetic_destinations(docs: int, payload_bytes: int, embedding_dims: int,
+                           encoding: str, seed: int) -> List[Dict[str, Any]]:
+    """Destination-shaped documents with a description of about payload_bytes"""
+    rng = np.random.default_rng(seed)
+    latitudes = rng.uniform(-11, 6, docs)
+    longitudes = rng.uniform(95, 141, docs)
+    filler = ('Candi Buddha terbesar di dunia, dibangun pada abad ke-9 oleh wangsa Syailendra. '
+              * (payload_bytes // 80 + 1))[:payload_bytes]
+    vectors = None
+    if embedding_dims:
+        vectors = rng.standard_normal((docs, embedding_dims)).astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    destinations = []
+    for i in range(docs):
+        dest = {
+            'name': f'Destinasi Benchmark {i}',
+            'category': 'budaya',
+            'description': filler,
+            'provinsi': 'jawa-tengah',
+            'kotaKabupaten': 'Magelang',
+            'latitude': float(latitudes[i]),
+            'longitude': float(longitudes[i]),
+            'rating': 4.5,
+            'priceRange': 'sedang',
+            'isCultural': True,
+            'source': 'benchmark',
+        }
+        if vectors is not None:
+            dest.update(encode_embedding(vectors[i].tolist(), encoding))
+        destinations.append(dest)
+    return destinations
+
+
+def _retrying(commit: Callable[[], None]) -> Tuple[float, int]:
+    """(seconds of the successful attempt, retries) of a commit, with commit_batches' backoff"""
+    attempt = 0
+    while True:
+        start = time.perf_counter()
+        try:
+            commit()
+        except RETRYABLE_ERRORS:
+            attempt += 1
+            if attempt == MAX_ROUNDS:
+                raise
+            time.sleep(BACKOFF_SECONDS * (2 ** (attempt - 1)))
+            continue
+        return time.perf_counter() - start, attempt
+
+
+def run_per_doc(db, writes: Writes) -> Tuple[List[float], int, int]:
+    latencies, retries = [], 0
+    for ref, data in writes:
+        seconds, retried = _retrying(lambda: ref.set(data))
+        latencies.append(seconds)
+        retries += retried
+    return latencies, retries, len(writes)
+
+
+def sequential_batches(size: int) -> Callable[[Any, Writes], Tuple[List[float], int, int]]:
+    def run(db, writes: Writes) -> Tuple[List[float], int, int]:
+        latencies, retries = [], 0
+        for start in range(0, len(writes), size):
+            batch = db.batch()
+            for ref, data in writes[start:start + size]:
+                batch.set(ref, data)
+            seconds, retried = _retrying(batch.commit)
+            latencies.append(seconds)
+            retries += retried
+        return latencies, retries, len(writes)
+    return run
+
+
+class _TimedBatch:
+    """WriteBatch whose successful commit() records its latency"""
+
+    def __init__(self, batch, latencies: List[float], lock: threading.Lock):
+        self._batch, self._latencies, self._lock = batch, latencies, lock
+
+    def set(self, *args, **kwargs):
+        return self._batch.set(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._batch.delete(*args, **kwargs)
+
+    def commit(self):
+        start = time.perf_counter()
+        result = self._batch.commit()
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+        return result
+
+
+class _TimedClient:
+    """Client whose batches are timed; everything else is passed through"""
+
+    def __init__(self, db):
+        self._db, self.latencies, self._lock = db, [], threading.Lock()
+
+    def batch(self):
+        return _TimedBatch(self._db.batch(), self.latencies, self._lock)
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+def run_commit_batches(db, writes: Writes) -> Tuple[List[float], int, int]:
+    timed = _TimedClient(db)
+    report = commit_batches(timed, writes)
+    if report.errors:
+        print(f"   ⚠️  {report.errors[0]}")
+    return timed.latencies, report.retried_batches, report.written
+
+
+def run_bulk_writer(db, writes: Writes) -> Tuple[List[float], int, int]:
+    enqueued: Dict[str, float] = {}
+    latencies: List[float] = []
+    failed, retries = [0], [0]
+    lock = threading.Lock()
+
+    def on_success(reference, result, bulk_writer):
+        with lock:
+            latencies.append(time.perf_counter() - enqueued[reference.path])
+
+    def on_error(failure, bulk_writer) -> bool:
+        with lock:
+            if failure.code in RETRYABLE_CODES and failure.attempts < BULK_MAX_ATTEMPTS:
+                retries[0] += 1
+                return True
+            failed[0] += 1
+        return False
+
+    writer = db.bulk_writer(BulkWriterOptions(
+        initial_ops_per_second=BULK_INITIAL_OPS_PER_SECOND,
+        max_ops_per_second=BULK_MAX_OPS_PER_SECOND,
+        mode=SendMode.parallel,
+        retry=BulkRetry.exponential,
+    ))
+    writer.on_write_result(on_success)
+    writer.on_write_error(on_error)
+    for ref, data in writes:
+        enqueued[ref.path] = time.perf_counter()
+        writer.set(ref, data)
+    writer.close()
+    return latencies, retries[0], len(writes) - failed[0]
+
+
+STRATEGIES: Dict[str, Callable[[Any, Writes], Tuple[List[float], int, int]]] = {
+    'per-doc': run_per_doc,
+    'batch-50': sequential_batches(50),
+    'batch-100': sequential_batches(100),
+    'batch-500': sequential_batches(500),
+    'commit-batches': run_commit_batches,
+    'bulk-writer': run_bulk_writer,
+}
+
+
+def run_strategy(db, strategy: str, destinations: List[Dict[str, Any]]) -> StrategyResult:
+    collection = db.collection(COLLECTION)
+    writes = [(collection.document(destination_id(dest)), dest) for dest in destinations]
+    start = time.perf_counter()
+    latencies, retries, written = STRATEGIES[strategy](db, writes)
+    seconds = time.perf_counter() - start
+    p50, p95 = np.percentile(latencies, [50, 95]) * 1000 if latencies else (0.0, 0.0)
+    return StrategyResult(strategy, len(writes), written, seconds, len(latencies),
+                          float(p50), float(p95), retries)
+
+
+def emulator_port(config_path: str = 'firebase.json') -> int:
+    """Firestore emulator port the firebase CLI will use"""
+    try:
+        with open(config_path, encoding='utf-8') as f:
+            return int(json.load(f)['emulators']['firestore']['port'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return DEFAULT_EMULATOR_PORT
+
+
+class Emulator:
+    """The Firestore emulator: reuses FIRESTORE_EMULATOR_HOST, else starts one"""
+
+    def __init__(self, project: str):
+        self.project = project
+        self.host = os.getenv('FIRESTORE_EMULATOR_HOST') or f'localhost:{emulator_port()}'
+        self.process: Optional[subprocess.Popen] = None
+
+    def _ready(self) -> bool:
+        try:
+            with urllib.request.urlopen(f'http://{self.host}/', timeout=2) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def start(self):
+        if self._ready():
+            print(f"🔌 Using the emulator at {self.host}")
+        else:
+            firebase = shutil.which('firebase')
+            if firebase is None:
+                raise RuntimeError("firebase CLI not found (npm install -g firebase-tools), "
+                                   "or set FIRESTORE_EMULATOR_HOST to a running emulator")
+            print(f"🚀 Starting the Firestore emulator on {self.host}...")
+            self.process = subprocess.Popen(
+                [firebase, 'emulators:start', '--only', 'firestore', '--project', self.project],
+                stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT,
+                start_new_session=os.name != 'nt',
+            )
+            deadline = time.monotonic() + EMULATOR_START_TIMEOUT
+            while not self._ready():
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"Firestore emulator did not start on {self.host}")
+                time.sleep(0.5)
+        os.environ['FIRESTORE_EMULATOR_HOST'] = self.host
+        return firestore.Client(project=self.project)
+
+    def clear(self):
+        """Delete every document in the emulator's database"""
+        request = urllib.request.Request(
+            f'http://{self.host}/emulator/v1/projects/{self.project}/databases/(default)/documents',
+            method='DELETE')
+        urllib.request.urlopen(request, timeout=60).close()
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        # SIGINT lets the CLI shut the Java emulator down with it
+        if os.name == 'nt':
+            self.process.terminate()
+        else:
+            os.killpg(self.process.pid, signal.SIGINT)
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare Firestore upload strategies on the emulator')
+    parser.add_argument('--docs', type=int, default=5000, help='documents per run')
+    parser.add_argument('--payload-bytes', type=int, default=1000, help='description size per document')
+    parser.add_argument('--embedding-dims', type=int, default=0, help='inline embedding size (0 for none)')
+    parser.add_argument('--encoding', choices=ENCODINGS, default=DEFAULT_ENCODING, help='embedding encoding')
+    parser.add_argument('--strategy', action='append', choices=list(STRATEGIES),
+                        help='strategy to run (repeatable, default: all)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per strategy, the fastest is reported')
+    parser.add_argument('--project', default=DEFAULT_PROJECT)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='also write the results to this file')
+    args = parser.parse_args()
+
+    destinations = synthetic_destinations(args.docs, args.payload_bytes, args.embedding_dims,
+                                          args.encoding, args.seed)
+    emulator = Emulator(args.project)
+    try:
+        db = emulator.start()
+        results = []
+        for strategy in args.strategy or list(STRATEGIES):
+            runs = []
+            for run in range(args.repeat):
+                emulator.clear()  # Every run creates documents; overwrites would be a different workload
+                result = run_strategy(db, strategy, destinations)
+                print(f"   {strategy} run {run + 1}: {result.docs_per_second:,.0f} docs/s")
+                runs.append(result)
+            results.append(max(runs, key=lambda result: result.docs_per_second))
+        emulator.clear()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        emulator.stop()
+
+    print(f"\n📊 {args.docs:,} documents, {args.payload_bytes:,}B description"
+          + (f", {args.embedding_dims}-dim {args.encoding} embedding" if args.embedding_dims else '') + "\n")
+    print(f"{'strategy':<15} {'docs/s':>9} {'seconds':>8} {'commits':>8} {'p50':>9} {'p95':>9} {'retries':>8} {'failed':>7}")
+    for r in results:
+        print(f"{r.strategy:<15} {r.docs_per_second:>9,.0f} {r.seconds:>8.1f} {r.commits:>8} "
+              f"{r.p50_ms:>7.1f}ms {r.p95_ms:>7.1f}ms {r.retries:>8} {r.documents - r.written:>7}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'docs': args.docs,
+                'payloadBytes': args.payload_bytes,
+                'embeddingDims': args.embedding_dims,
+                'encoding': args.encoding,
+                'results': [{**r._asdict(), 'docsPerSecond': r.docs_per_second} for r in results],
+            }, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
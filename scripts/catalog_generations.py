@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Blue/green catalog generations
+
+A full import used to rewrite `destinations` in place, so for the length
+of the upload the app served a mix of old and new documents next to a
+FAISS index built for neither. Imports now write a new generation:
+
+    destinations__g20261018T222249             catalog documents
+    destination_embeddings__g20261018T222249   embeddings (embedding_store.py)
+    faiss_index/generations/g20261018T222249/  FAISS index and mapping
+
+and only when all of it is written is the generation activated, by
+setting a single pointer document the app reads:
+
+    _catalog/destinations  {generation, collection, faissIndex, previous, activatedAt}
+
+Without a pointer readers use the plain `destinations` collection and the
+index at the FAISS_INDEX_PATH root, so trees imported before keep working.
+Generations older than the newest `keep` (and not the rollback target) are
+deleted afterwards, several collections in parallel.
+
+Usage:
+    from catalog_generations import activate, active_collection, generation_collection, new_generation
+
+    generation = new_generation()
+    collection = generation_collection('destinations', generation)   # write here
+    activate(db, 'destinations', generation, documents=len(destinations))
+"""
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from catalog_stats import delete_stats
+from embedding_store import embedding_collection
+from firestore_sync import delete_documents, delete_hash_index
+
+POINTER_COLLECTION = '_catalog'
+GENERATION_SEPARATOR = '__'
+GENERATIONS_DIR = 'generations'
+DEFAULT_KEEP = 2  # The active generation and the one before it
+DELETE_PAGE_SIZE = 1000
+GC_WORKERS = 4
+
+
+class CatalogPointer(NamedTuple):
+    base: str
+    generation: Optional[str]   # None: no generation active, the base collection is served
+    collection: str
+    faiss_index: Optional[str]  # Relative to FAISS_INDEX_PATH, None for the root
+    previous: Optional[str]
+
+
+def new_generation() -> str:
+    """Generation ID; IDs sort in the order they were created"""
+    return 'g' + datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+
+
+def generation_collection(base: str, generation: Optional[str]) -> str:
+    return f"{base}{GENERATION_SEPARATOR}{generation}" if generation else base
+
+
+def generation_index_path(index_root: str, generation: Optional[str]) -> str:
+    return os.path.join(index_root, GENERATIONS_DIR, generation) if generation else index_root
+
+
+def _pointer_ref(db, base: str):
+    return db.collection(POINTER_COLLECTION).document(base)
+
+
+def read_pointer(db, base: str) -> CatalogPointer:
+    snapshot = _pointer_ref(db, base).get()
+    data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+    generation = data.get('generation')
+    return CatalogPointer(base, generation, data.get('collection', generation_collection(base, generation)),
+                          data.get('faissIndex'), data.get('previous'))
+
+
+def active_collection(db, base: str) -> str:
+    return read_pointer(db, base).collection
+
+
+def active_index_path(db, base: str, index_root: str) -> str:
+    pointer = read_pointer(db, base)
+    return os.path.join(index_root, pointer.faiss_index) if pointer.faiss_index else index_root
+
+
+def activate(db, base: str, generation: Optional[str], documents: Optional[int] = None) -> CatalogPointer:
+    """Point readers at generation (None: back to the base collection) with one write"""
+    current = read_pointer(db, base)
+    if generation is None:
+        _pointer_ref(db, base).delete()
+        return CatalogPointer(base, None, base, None, current.generation)
+
+    data = {
+        'generation': generation,
+        'collection': generation_collection(base, generation),
+        'faissIndex': f"{GENERATIONS_DIR}/{generation}",
+        'previous': current.generation if current.generation != generation else current.previous,
+        'activatedAt': datetime.now(timezone.utc),
+    }
+    if documents is not None:
+        data['documents'] = documents
+    _pointer_ref(db, base).set(data)
+    return CatalogPointer(base, generation, data['collection'], data['faissIndex'], data['previous'])
+
+
+def list_generations(db, base: str) -> List[str]:
+    """Generations of base present in Firestore, oldest first"""
+    prefix = base + GENERATION_SEPARATOR
+    return sorted(ref.id[len(prefix):] for ref in db.collections() if ref.id.startswith(prefix))
+
+
+def delete_collection(db, collection: str, page_size: int = DELETE_PAGE_SIZE) -> int:
+    """Delete every document of a collection, a page at a time; returns documents deleted"""
+    query = db.collection(collection).select([]).order_by('__name__').limit(page_size)
+    deleted, last = 0, None
+    while True:
+        page = list((query.start_after(last) if last is not None else query).stream())
+        if not page:
+            break
+        last = page[-1]
+        report = delete_documents(db, collection, [snapshot.id for snapshot in page])
+        deleted += report.written
+    delete_hash_index(db, collection)
+    delete_stats(db, collection)
+    return deleted
+
+
+def collectable_generations(pointer: CatalogPointer, generations: List[str], keep: int = DEFAULT_KEEP) -> List[str]:
+    """Generations safe to delete: older than the newest keep up to the active one, never the rollback target.
+
+    Generations newer than the active one may be an import in progress and are left alone.
+    """
+    if pointer.generation is None:
+        return []
+    history = [generation for generation in generations if generation <= pointer.generation]
+    kept = set(history[-keep:]) if keep > 0 else set()
+    kept.update({pointer.generation, pointer.previous})
+    return [generation for generation in history if generation not in kept]
+
+
+def garbage_collect(db, base: str, keep: int = DEFAULT_KEEP, index_root: Optional[str] = None,
+                    include_base: bool = False, dry_run: bool = False,
+                    workers: int = GC_WORKERS) -> Dict[str, int]:
+    """Delete old generations (catalog, embeddings, sync index, stats, local FAISS files) in parallel.
+
+    include_base also deletes the pre-generation base collection, once it
+    is no longer the rollback target. Returns {collection: documents deleted}.
+    """
+    pointer = read_pointer(db, base)
+    doomed = collectable_generations(pointer, list_generations(db, base), keep)
+    collections = [generation_collection(base, generation) for generation in doomed]
+    if include_base and pointer.generation is not None and pointer.previous is not None:
+        collections.append(base)
+    collections += [embedding_collection(collection) for collection in list(collections)]
+    if dry_run or not collections:
+        return {collection: 0 for collection in collections}
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        deleted = dict(zip(collections, executor.map(lambda collection: delete_collection(db, collection),
+                                                     collections)))
+    if index_root:
+        for generation in doomed:
+            shutil.rmtree(generation_index_path(index_root, generation), ignore_errors=True)
+    return deleted
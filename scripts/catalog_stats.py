@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Precomputed catalog statistics
+
+MapService.getCategories / getProvinces and the verify steps of the setup
+scripts derived counts and distinct values by reading every document.
+Importers now compute them in one vectorized pass over the records they
+wrote and store a single summary document per collection:
+
+    _stats/{collection}   e.g. _stats/destinations__g20261018T222249
+
+    count, updatedAt
+    byProvinsi / byCategory / byKotaKabupaten / byPriceRange   {value: count}
+    rating           {edges: [0, 0.5, ..., 5], counts: [...], mean}
+    culturalCount
+    taxonomy         [{category, count, culturalCount, provinces: [...]}]
+    geoIndexed       True when every record with coordinates has geohash cells (geo_cells.py)
+    searchIndexed    True when every record has search tokens (search_tokens.py)
+
+Fields a collection's records lack (UMKM have no kotaKabupaten) are left
+out. Readers fall back to scanning when a collection has no summary yet.
+Collections several scripts write to (umkm) are summarized from the
+stored documents instead, read with a projection on the summarized fields.
+
+Usage:
+    from catalog_stats import compute_stats, load_stats, write_stats
+
+    write_stats(db, collection, compute_stats(destinations))
+    write_stats(db, 'umkm', collection_stats(db, 'umkm'))
+    stats = load_stats(db, collection)   # dict or None
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from geo_cells import GEOHASH_FIELD, has_coordinates
+from search_tokens import TOKENS_FIELD
+
+STATS_COLLECTION = '_stats'
+COUNT_FIELDS = {
+    'provinsi': 'byProvinsi',
+    'category': 'byCategory',
+    'kotaKabupaten': 'byKotaKabupaten',
+    'priceRange': 'byPriceRange',
+}
+RATING_EDGES = np.linspace(0, 5, 11)  # 0.5-star bins
+# Fields compute_stats reads, for summarizing stored documents
+STATS_FIELDS = [*COUNT_FIELDS, 'rating', 'isCultural', 'latitude', 'longitude', GEOHASH_FIELD, TOKENS_FIELD]
+DEFAULT_PAGE_SIZE = 1000
+
+
+def _value_counts(column: pd.Series) -> Dict[str, int]:
+    values = column.dropna().astype(str).str.strip()
+    counts = values[values != ''].value_counts()
+    return {str(value): int(count) for value, count in counts.items()}
+
+
+def compute_stats(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summary document of a collection's records"""
+    fields = [field for field in (*COUNT_FIELDS, 'rating', 'isCultural')
+              if any(field in record for record in records[:1000])]
+    df = pd.DataFrame.from_records(records, columns=fields)
+    stats: Dict[str, Any] = {'count': len(df)}
+
+    for field, key in COUNT_FIELDS.items():
+        if field in df:
+            stats[key] = _value_counts(df[field])
+
+    if 'rating' in df:
+        ratings = pd.to_numeric(df['rating'], errors='coerce').dropna().clip(0, 5)
+        counts, _ = np.histogram(ratings, bins=RATING_EDGES)
+        stats['rating'] = {
+            'edges': RATING_EDGES.tolist(),
+            'counts': counts.tolist(),
+            'mean': round(float(ratings.mean()), 3) if len(ratings) else None,
+        }
+
+    cultural = df['isCultural'].fillna(False).astype(bool) if 'isCultural' in df else None
+    if cultural is not None:
+        stats['culturalCount'] = int(cultural.sum())
+
+    stats['geoIndexed'] = all(GEOHASH_FIELD in record for record in records if has_coordinates(record))
+    stats['searchIndexed'] = all(TOKENS_FIELD in record for record in records)
+
+    if 'category' in df:
+        taxonomy = []
+        for category, group in df.groupby('category'):
+            if not str(category).strip():
+                continue
+            entry = {'category': str(category), 'count': len(group)}
+            if cultural is not None:
+                entry['culturalCount'] = int(cultural[group.index].sum())
+            if 'provinsi' in df:
+                entry['provinces'] = sorted(_value_counts(group['provinsi']))
+            taxonomy.append(entry)
+        stats['taxonomy'] = sorted(taxonomy, key=lambda entry: (-entry['count'], entry['category']))
+    return stats
+
+
+def collection_stats(db, collection: str, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """Summary document of everything stored in a collection, read a page at a time with a projection"""
+    query = db.collection(collection).select(STATS_FIELDS).order_by('__name__').limit(page_size)
+    records, last = [], None
+    while True:
+        page = list((query.start_after(last) if last is not None else query).stream())
+        if not page:
+            break
+        last = page[-1]
+        records.extend(snapshot.to_dict() or {} for snapshot in page)
+    return compute_stats(records)
+
+
+def _stats_ref(db, collection: str):
+    return db.collection(STATS_COLLECTION).document(collection)
+
+
+def write_stats(db, collection: str, stats: Dict[str, Any], merge: bool = False):
+    """Store a collection's summary; merge=True updates only the given fields"""
+    _stats_ref(db, collection).set({**stats, 'collection': collection,
+                                    'updatedAt': datetime.now(timezone.utc)}, merge=merge)
+
+
+def load_stats(db, collection: str) -> Optional[Dict[str, Any]]:
+    snapshot = _stats_ref(db, collection).get()
+    return snapshot.to_dict() if snapshot.exists else None
+
+
+def delete_stats(db, collection: str):
+    _stats_ref(db, collection).delete()
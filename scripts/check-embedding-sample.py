@@ -5,9 +5,12 @@ Check if embeddings are properly generated (not all zeros)
 """
 
 import os
+import numpy as np
 from dotenv import load_dotenv
 from firebase_admin import initialize_app, firestore, credentials
 
+from embedding_store import load_embedding
+
 def check_embedding_sample():
     """Check sample embedding values"""
     print("🔍 Checking Embedding Sample...")
@@ -33,18 +36,20 @@ def check_embedding_sample():
 
         doc = docs[0]
         data = doc.to_dict()
-        embedding = data.get('embedding', [])
+        # Kept in destination_embeddings (embedding_store.py), inline for unmigrated documents
+        embedding = load_embedding(db, 'destinations', doc.id, data)
 
         print(f"📄 Sample destination: {data.get('name', 'Unknown')}")
         print(f"📍 Provinsi: {data.get('provinsi', 'Unknown')}")
-        print(f"📊 Embedding length: {len(embedding)}")
 
-        if len(embedding) == 0:
+        if embedding is None:
             print("❌ No embedding found!")
             return
 
+        print(f"📊 Embedding length: {len(embedding)}")
+
         # Check if all zeros
-        all_zeros = all(x == 0.0 for x in embedding)
+        all_zeros = not embedding.any()
         if all_zeros:
             print("❌ ALL EMBEDDINGS ARE ZERO!")
             return
@@ -56,15 +61,13 @@ def check_embedding_sample():
         print("Last 10:", embedding[-10:])
 
         # Check statistics
-        import numpy as np
-        embedding_array = np.array(embedding)
         print("\n📊 Statistics:")
-        print(f"  Mean: {embedding_array.mean():.6f}")
-        print(f"  Std: {embedding_array.std():.6f}")
-        print(f"  Min: {embedding_array.min():.6f}")
-        print(f"  Max: {embedding_array.max():.6f}")
+        print(f"  Mean: {embedding.mean():.6f}")
+        print(f"  Std: {embedding.std():.6f}")
+        print(f"  Min: {embedding.min():.6f}")
+        print(f"  Max: {embedding.max():.6f}")
         # Check for diversity (non-zero values)
-        non_zero_count = sum(1 for x in embedding if x != 0.0)
+        non_zero_count = int(np.count_nonzero(embedding))
         print(f"Non-zero values: {non_zero_count}/{len(embedding)} ({non_zero_count/len(embedding)*100:.1f}%)")
 
         if non_zero_count > len(embedding) * 0.5:  # More than 50% non-zero
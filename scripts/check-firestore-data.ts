@@ -5,7 +5,8 @@
  */
 
 import { initializeApp } from 'firebase/app';
-import { getFirestore, collection, getDocs, collectionGroup } from 'firebase/firestore';
+import { getFirestore, collection, doc, getCountFromServer, getDoc, getDocs, limit, query } from 'firebase/firestore';
+import { describeEmbedding, EMBEDDING_FIELD } from '../lib/embedding-codec';
 
 const firebaseConfig = {
   apiKey: process.env.NEXT_PUBLIC_FIREBASE_API_KEY!,
@@ -27,25 +28,42 @@ const COLLECTIONS_TO_CHECK = [
   'itineraries',
 ];
 
-async function checkCollection(collectionName: string): Promise<{
+// The catalog generation the app reads (scripts/catalog_generations.py), else the base collection
+async function resolveCollection(base: string): Promise<string> {
+  const pointer = await getDoc(doc(db, '_catalog', base));
+  return (pointer.exists() && pointer.data().collection) || base;
+}
+
+// Counted by the server (one read per 1000 index entries) plus one sample document,
+// instead of downloading the whole collection
+async function checkCollection(base: string): Promise<{
   name: string;
   count: number;
   status: 'OK' | 'EMPTY' | 'ERROR';
   error?: string;
   sampleData?: any;
 }> {
+  let collectionName = base;
   try {
+    collectionName = await resolveCollection(base);
     const col = collection(db, collectionName);
-    const snapshot = await getDocs(col);
-    const count = snapshot.size;
+    const [countSnapshot, snapshot] = await Promise.all([
+      getCountFromServer(col),
+      getDocs(query(col, limit(1))),
+    ]);
+    const count = countSnapshot.data().count;
 
     let sampleData = undefined;
-    if (count > 0) {
+    if (snapshot.size > 0) {
       const firstDoc = snapshot.docs[0];
+      const data = firstDoc.data();
       sampleData = {
         id: firstDoc.id,
-        ...firstDoc.data()
+        ...data
       };
+      if (EMBEDDING_FIELD in data) {
+        sampleData[EMBEDDING_FIELD] = describeEmbedding(data); // Bytes do not stringify usefully
+      }
     }
 
     return {
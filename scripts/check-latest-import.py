@@ -8,6 +8,10 @@ import os
 from dotenv import load_dotenv
 from firebase_admin import initialize_app, firestore, credentials
 
+from catalog_generations import active_collection
+from collection_checks import count, run_checks, sample
+from embedding_store import load_embeddings
+
 def check_latest_import():
     """Check the latest imported destinations"""
     print("🔍 Checking Latest Imported Data...")
@@ -23,26 +27,39 @@ def check_latest_import():
         initialize_app(cred)
         db = firestore.client()
 
-        # Query destinations collection - get all and sort by some field
-        destinations_ref = db.collection('destinations')
-        docs = list(destinations_ref.stream())
+        # Count on the server; read only the last 10 documents (by ID, the order the
+        # collection streams in), and only the fields shown
+        collection = active_collection(db, 'destinations')
+        destinations_ref = db.collection(collection)
+        known_names = ['Monumen Nasional', 'Kota Tua', 'Dunia Fantasi']
+        latest = destinations_ref.order_by('__name__', direction=firestore.Query.DESCENDING)
+        checks = {
+            'total': lambda: count(destinations_ref),
+            'recent': lambda: sample(latest, ['name', 'category', 'provinsi', 'latitude', 'longitude'], limit=10),
+        }
+        checks.update({name: (lambda name=name: count(destinations_ref.where('name', '==', name)))
+                       for name in known_names})
+        results = run_checks(checks)
+        for name, result in results.items():
+            if result.error:
+                raise RuntimeError(f"{name} check failed: {result.error}")
 
-        print(f"✅ Found {len(docs)} total documents in destinations collection")
+        print(f"✅ Found {results['total'].value} total documents in {collection}")
 
-        # Get the last 10 documents (most recently added)
-        recent_docs = docs[-10:] if len(docs) >= 10 else docs
+        recent_docs = results['recent'].value[::-1]
+        embeddings = load_embeddings(db, collection, [doc_id for doc_id, _ in recent_docs])
 
         print(f"\n📍 Last {len(recent_docs)} destinations (most recent):")
         print("-" * 60)
 
-        for i, doc in enumerate(recent_docs, 1):
-            data = doc.to_dict()
+        for i, (doc_id, data) in enumerate(recent_docs, 1):
             name = data.get('name', 'NO_NAME')
             category = data.get('category', 'NO_CATEGORY')
             provinsi = data.get('provinsi', 'NO_PROVINSI')
             latitude = data.get('latitude', 0)
             longitude = data.get('longitude', 0)
-            has_embedding = 'embedding' in data
+            embedding = embeddings.get(doc_id)
+            has_embedding = embedding is not None
 
             print(f"{i:2d}. {name}")
             print(f"    📂 Category: {category}")
@@ -50,19 +67,13 @@ def check_latest_import():
             print(f"    🗺️  Coordinates: {latitude}, {longitude}")
             print(f"    🤖 Embedding: {'✅' if has_embedding else '❌'}")
             if has_embedding:
-                embedding_len = len(data['embedding'])
-                print(f"    📊 Embedding size: {embedding_len}")
+                print(f"    📊 Embedding size: {len(embedding)}")
             print()
 
         # Check specific known destinations
         print("🔍 Checking specific known destinations:")
-        known_names = ['Monumen Nasional', 'Kota Tua', 'Dunia Fantasi']
         for name in known_names:
-            # Note: Firestore doesn't support direct name queries efficiently
-            # This is just for verification
-            query = destinations_ref.where('name', '==', name).limit(1)
-            results = list(query.stream())
-            status = "✅ FOUND" if results else "❌ NOT FOUND"
+            status = "✅ FOUND" if results[name].value else "❌ NOT FOUND"
             print(f"  - {name}: {status}")
 
     except Exception as e:
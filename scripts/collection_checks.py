@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server-side collection checks
+
+The verify and check scripts streamed whole collections to take len() or
+print a few fields, so verifying 100k documents meant 100k document
+downloads. The helpers here let Firestore do the work:
+
+    count(query)                        COUNT aggregation, one read per 1000 index entries
+    aggregate(query, sums, averages)    COUNT / SUM / AVG in one request
+    count_by(query, field, values)      one COUNT per value, in parallel
+    embedding_count(db, collection)     documents with an embedding side document
+    inline_embedding_count(db, coll.)   legacy documents still carrying one inline
+    sample(query, fields, limit)        a few documents, only the fields shown
+    run_checks(checks)                  independent checks on a thread pool
+
+Usage:
+    from collection_checks import count, count_by, run_checks
+
+    results = run_checks({
+        'umkm': lambda: count(db.collection('umkm')),
+        'categories': lambda: count_by(db.collection('umkm'), 'category', ['batik', 'kuliner']),
+    })
+    if results['umkm'].error is None:
+        print(results['umkm'].value)
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from embedding_codec import EMBEDDING_FIELD
+from embedding_store import EMBEDDING_COLLECTIONS, embedding_collection
+
+DEFAULT_WORKERS = 8
+MAX_AGGREGATIONS = 5  # Firestore limit per aggregation query
+
+
+class CheckResult(NamedTuple):
+    value: Any
+    error: Optional[str]
+    seconds: float
+
+
+def count(query) -> int:
+    """Number of documents matching a query or collection, counted by the server"""
+    return int(query.count(alias='count').get()[0][0].value)
+
+
+def aggregate(query, sums: Sequence[str] = (), averages: Sequence[str] = ()) -> Dict[str, Optional[float]]:
+    """{'count', 'sum_<field>', 'avg_<field>'} of a query in one request; avg is None without values"""
+    if 1 + len(sums) + len(averages) > MAX_AGGREGATIONS:
+        raise ValueError(f"At most {MAX_AGGREGATIONS - 1} sums and averages per query")
+    aggregation = query.count(alias='count')
+    for field in sums:
+        aggregation = aggregation.sum(field, alias=f'sum_{field}')
+    for field in averages:
+        aggregation = aggregation.avg(field, alias=f'avg_{field}')
+    return {result.alias: result.value for result in aggregation.get()[0]}
+
+
+def count_by(query, field: str, values: Iterable[Any], workers: int = DEFAULT_WORKERS) -> Dict[Any, int]:
+    """{value: count} of documents with field == value, one COUNT per value"""
+    values = list(values)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(values) or 1))) as executor:
+        counts = executor.map(lambda value: count(query.where(field, '==', value)), values)
+        return dict(zip(values, counts))
+
+
+def embedding_count(db, collection: str) -> int:
+    """Documents with an embedding side document (inline ones for collections without side documents)"""
+    if collection.partition('__')[0] not in EMBEDDING_COLLECTIONS:
+        return inline_embedding_count(db, collection)
+    return count(db.collection(embedding_collection(collection)))
+
+
+def inline_embedding_count(db, collection: str) -> int:
+    """Documents still carrying an inline embedding; after migrate-embeddings.py --keep-inline
+    these also have a side document, so the two counts are not added up"""
+    return count(db.collection(collection).where(EMBEDDING_FIELD, '!=', None))
+
+
+def sample(query, fields: Sequence[str], limit: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
+    """(id, fields) of up to limit documents, read with a projection"""
+    return [(snapshot.id, snapshot.to_dict() or {}) for snapshot in query.select(list(fields)).limit(limit).stream()]
+
+
+def _timed(check: Callable[[], Any]) -> CheckResult:
+    start = time.perf_counter()
+    try:
+        return CheckResult(check(), None, time.perf_counter() - start)
+    except Exception as e:
+        return CheckResult(None, str(e), time.perf_counter() - start)
+
+
+def run_checks(checks: Dict[str, Callable[[], Any]], workers: int = DEFAULT_WORKERS) -> Dict[str, CheckResult]:
+    """Run independent checks concurrently; a failing check reports its error instead of raising"""
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(checks) or 1))) as executor:
+        futures = {name: executor.submit(_timed, check) for name, check in checks.items()}
+        return {name: future.result() for name, future in futures.items()}
@@ -16,6 +16,8 @@ if sys.stdout.encoding != 'utf-8':
 from firebase_admin import initialize_app, firestore, credentials
 from tqdm import tqdm
 
+from doc_ids import guide_id
+
 # Load environment
 load_dotenv('.env.local')
 
@@ -146,7 +148,8 @@ def create_local_guides():
     with tqdm(total=len(LOCAL_GUIDES), desc="Creating guides") as pbar:
         for guide in LOCAL_GUIDES:
             try:
-                db.collection('local_guides').add({
+                # Deterministic ID: a rerun overwrites instead of duplicating
+                db.collection('local_guides').document(guide_id(guide)).set({
                     **guide,
                     'verified': True,
                     'createdAt': firestore.SERVER_TIMESTAMP,
@@ -17,6 +17,11 @@ from firebase_admin import initialize_app, firestore, credentials
 from tqdm import tqdm
 from datetime import datetime
 
+from catalog_stats import collection_stats, write_stats
+from doc_ids import umkm_id
+from geo_cells import add_geo_fields
+from search_tokens import add_search_fields
+
 # Load environment
 load_dotenv('.env.local')
 
@@ -70,10 +75,13 @@ def create_umkm_data():
     # Upload UMKM data
     print(f"\n[UMKM] Uploading {len(UMKM_DATA)} UMKM records...")
 
+    add_geo_fields(UMKM_DATA)  # Geohash cells for proximity queries
+    add_search_fields(UMKM_DATA)  # Tokens for name lookups
     with tqdm(total=len(UMKM_DATA), desc="Creating UMKM") as pbar:
         for umkm in UMKM_DATA:
             try:
-                db.collection('umkm').add({
+                # Deterministic ID: a rerun overwrites instead of duplicating
+                db.collection('umkm').document(umkm_id(umkm)).set({
                     **umkm,
                     'verified': True,
                     'createdAt': firestore.SERVER_TIMESTAMP,
@@ -84,6 +92,9 @@ def create_umkm_data():
                 print(f"[ERROR] Failed to create UMKM {umkm['name']}: {e}")
                 pbar.update(1)
 
+    # Summary the app checks before using geohash cell and token queries
+    write_stats(db, 'umkm', collection_stats(db, 'umkm'))
+
     print("\n[SUCCESS] UMKM data created successfully!")
     print(f"[SUMMARY] Total UMKM created: {len(UMKM_DATA)}")
     print(f"  - Batik: 5")
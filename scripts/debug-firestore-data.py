@@ -8,6 +8,9 @@ import os
 from dotenv import load_dotenv
 from firebase_admin import initialize_app, firestore, credentials
 
+from embedding_codec import document_embedding
+from embedding_store import load_embedding
+
 def debug_firestore_data():
     """Debug Firestore data content"""
     print("🔍 Debugging Firestore Data...")
@@ -44,9 +47,13 @@ def debug_firestore_data():
             print("🔍 Field analysis:")
             for key, value in data.items():
                 if key == 'embedding':
-                    print(f"  {key}: [array of {len(value)} floats]")
+                    embedding = document_embedding(data)
+                    size = 0 if embedding is None else len(embedding)
+                    print(f"  {key}: [{data.get('embeddingEncoding', 'array')} of {size} floats, inline]")
                 else:
                     print(f"  {key}: {value} ({type(value).__name__})")
+            embedding = load_embedding(db, 'destinations', doc.id, data)
+            print(f"  Embedding: {'none' if embedding is None else f'{len(embedding)} floats'}")
 
         # Try to query by name if exists
         print("\n🔍 Checking for specific destinations...")
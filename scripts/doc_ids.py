@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deterministic Firestore document IDs
+
+Importers and seeders used auto IDs, so every rerun added a second copy of
+each document. IDs here are derived from the normalized name, coordinates
+rounded to ~11 m and an optional source, so writing a record with set()
+is an upsert: re-running any import converges to the same document set.
+
+IDs read as "<name-slug>-<hash>", e.g. "candi-borobudur-3f2a9c0d41b7".
+
+Usage:
+    from doc_ids import destination_id, unique_by_id
+
+    pairs, dropped = unique_by_id(destinations, destination_id)
+    writes = [(collection.document(doc_id), dest) for doc_id, dest in pairs]
+"""
+
+import hashlib
+import math
+import re
+import unicodedata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+COORDINATE_DECIMALS = 4  # ~11 m, absorbs float noise between sources and reruns
+MAX_SLUG_LENGTH = 48
+HASH_LENGTH = 12
+
+
+def normalize_key(text: Any) -> str:
+    """Lowercase ASCII slug: accents stripped, runs of other characters -> '-'"""
+    text = unicodedata.normalize('NFKD', str(text or '')).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def _coordinate(value: Optional[float]) -> str:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return ''
+    if math.isnan(value):
+        return ''
+    # round() then format, so -0.00001 and 0.0 agree
+    return f"{round(value, COORDINATE_DECIMALS) + 0.0:.{COORDINATE_DECIMALS}f}"
+
+
+def stable_id(name: Any, latitude: Optional[float] = None, longitude: Optional[float] = None,
+              source: str = '') -> str:
+    """Document ID for a named place; the same inputs always give the same ID"""
+    key = '|'.join([normalize_key(source), normalize_key(name), _coordinate(latitude), _coordinate(longitude)])
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    slug = normalize_key(name)[:MAX_SLUG_LENGTH].strip('-') or 'item'
+    return f"{slug}-{digest}"
+
+
+def destination_id(destination: Dict[str, Any]) -> str:
+    return stable_id(destination.get('name'), destination.get('latitude'), destination.get('longitude'),
+                     destination.get('source', ''))
+
+
+def umkm_id(umkm: Dict[str, Any]) -> str:
+    return stable_id(umkm.get('name'), umkm.get('latitude'), umkm.get('longitude'))
+
+
+def guide_id(guide: Dict[str, Any]) -> str:
+    """Guides have no coordinates; their city keeps namesakes apart"""
+    return stable_id(f"{guide.get('name', '')} {guide.get('location', '')}")
+
+
+def unique_by_id(records: List[Dict[str, Any]],
+                 id_fn: Callable[[Dict[str, Any]], str]) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+    """(id, record) pairs with later records that map to an already seen ID dropped.
+
+    Two records with one ID would be written to the same document, the last
+    one winning, while both kept their own FAISS vector.
+    """
+    seen = set()
+    pairs = []
+    for record in records:
+        doc_id = id_fn(record)
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        pairs.append((doc_id, record))
+    return pairs, len(records) - len(pairs)
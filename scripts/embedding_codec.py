@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compact embedding encoding for Firestore documents
+
+A 768-float embedding stored as a Firestore array costs ~6 KB of storage
+and ~10 KB on the wire per document (every element is a tagged double).
+Stored as little-endian bytes it is 3 KB (float32) or 1.5 KB (float16).
+The document also records `embeddingEncoding`, so readers know how to
+decode it; documents written before have a plain array and no encoding.
+
+Encodings:
+    array    list of floats (the original layout)
+    float32  '<f4' bytes, lossless for Gemini embeddings as used by FAISS
+    float16  '<f2' bytes, cosine similarity changes by ~1e-4
+    vector   Firestore vector type (needed for find_nearest, stored as doubles)
+
+The TypeScript counterpart is lib/embedding-codec.ts.
+
+Usage:
+    from embedding_codec import document_embedding, encode_embedding
+
+    doc.update(encode_embedding(values, 'float16'))   # {'embedding': ..., 'embeddingEncoding': ...}
+    vector = document_embedding(snapshot.to_dict())  # np.ndarray (float32) or None
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+EMBEDDING_FIELD = 'embedding'
+ENCODING_FIELD = 'embeddingEncoding'
+ENCODINGS = ('array', 'float32', 'float16', 'vector')
+DEFAULT_ENCODING = 'float32'
+EMBEDDING_DIMENSION = 768
+
+_DTYPES = {'float32': np.dtype('<f4'), 'float16': np.dtype('<f2')}
+
+
+def encode_embedding(values: Sequence[float], encoding: str = DEFAULT_ENCODING) -> Dict[str, Any]:
+    """Document fields holding values in the given encoding"""
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown embedding encoding '{encoding}', expected one of {ENCODINGS}")
+    if encoding == 'array':
+        # No encoding field, so these documents match the ones written before
+        return {EMBEDDING_FIELD: [float(x) for x in values]}
+    if encoding == 'vector':
+        from google.cloud.firestore_v1.vector import Vector
+        value = Vector(values)
+    else:
+        value = np.asarray(values, dtype=_DTYPES[encoding]).tobytes()
+    return {EMBEDDING_FIELD: value, ENCODING_FIELD: encoding}
+
+
+def _bytes_dtype(data: bytes, encoding: Optional[str]) -> np.dtype:
+    if encoding in _DTYPES:
+        return _DTYPES[encoding]
+    # No encoding recorded: tell the two apart by the expected dimension
+    if len(data) == EMBEDDING_DIMENSION * 2:
+        return _DTYPES['float16']
+    return _DTYPES['float32']
+
+
+def decode_embedding(value: Any, encoding: Optional[str] = None) -> Optional[np.ndarray]:
+    """float32 array from any stored form (array, bytes, Vector); None if empty or missing"""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        data = bytes(value)
+        vector = np.frombuffer(data, dtype=_bytes_dtype(data, encoding)).astype(np.float32)
+    elif isinstance(value, dict) and value.get('__type__') == '__vector__':
+        vector = np.asarray(value.get('value', ()), dtype=np.float32)
+    else:
+        # list, tuple or firestore Vector (a Sequence)
+        vector = np.asarray(list(value), dtype=np.float32)
+    return vector if vector.size else None
+
+
+def document_embedding(data: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+    """Decoded embedding of a document's data, None when it has none"""
+    if not data:
+        return None
+    return decode_embedding(data.get(EMBEDDING_FIELD), data.get(ENCODING_FIELD))
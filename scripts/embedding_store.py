@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Embeddings in side collections
+
+Catalog reads (map markers, cards, the destinations API) fetch whole
+documents, so an inline embedding made every one of them carry ~6 KB of
+floats nobody on that path uses. Embeddings now live in a parallel
+collection keyed by the same document ID:
+
+    destinations/{id}            catalog fields only
+    destination_embeddings/{id}  {embedding, embeddingEncoding}
+    umkm/{id}                    catalog fields only
+    umkm_embeddings/{id}         {embedding, embeddingEncoding}
+
+Documents written before still carry the embedding inline; readers here
+fall back to it, and migrate-embeddings.py moves it out. A catalog
+generation (catalog_generations.py) has its own side collection with the
+same suffix: destinations__g... -> destination_embeddings__g...
+
+Usage:
+    from embedding_store import embedding_ref, load_embeddings, split_embedding
+
+    catalog, side = split_embedding(record, 'float32')
+    batch.set(collection.document(doc_id), catalog)
+    batch.set(embedding_ref(db, 'destinations', doc_id), side)
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from embedding_codec import DEFAULT_ENCODING, EMBEDDING_FIELD, ENCODING_FIELD, document_embedding, encode_embedding
+from firestore_batches import CommitReport, commit_batches
+
+EMBEDDING_COLLECTIONS = {
+    'destinations': 'destination_embeddings',
+    'umkm': 'umkm_embeddings',
+}
+
+
+def embedding_collection(collection: str) -> str:
+    base, separator, generation = collection.partition('__')  # catalog_generations.GENERATION_SEPARATOR
+    if base not in EMBEDDING_COLLECTIONS:
+        raise ValueError(f"No embedding collection for '{collection}'")
+    return EMBEDDING_COLLECTIONS[base] + separator + generation
+
+
+def embedding_ref(db, collection: str, doc_id: str):
+    return db.collection(embedding_collection(collection)).document(doc_id)
+
+
+def split_embedding(record: Dict[str, Any],
+                    encoding: str = DEFAULT_ENCODING) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """(catalog fields, side document) of a record; the side document is None without an embedding"""
+    catalog = {key: value for key, value in record.items() if key not in (EMBEDDING_FIELD, ENCODING_FIELD)}
+    values = record.get(EMBEDDING_FIELD)
+    if values is None or len(values) == 0:
+        return catalog, None
+    return catalog, encode_embedding(values, encoding)
+
+
+def load_embeddings(db, collection: str, doc_ids: List[str]) -> Dict[str, np.ndarray]:
+    """{id: embedding} for the given documents, falling back to inline (unmigrated) ones"""
+    side = db.collection(embedding_collection(collection))
+    embeddings: Dict[str, np.ndarray] = {}
+    for snapshot in db.get_all([side.document(doc_id) for doc_id in doc_ids]):
+        embedding = document_embedding(snapshot.to_dict() if snapshot.exists else None)
+        if embedding is not None:
+            embeddings[snapshot.id] = embedding
+
+    missing = [doc_id for doc_id in doc_ids if doc_id not in embeddings]
+    if missing:
+        catalog = db.collection(collection)
+        refs = [catalog.document(doc_id) for doc_id in missing]
+        for snapshot in db.get_all(refs, field_paths=[EMBEDDING_FIELD, ENCODING_FIELD]):
+            embedding = document_embedding(snapshot.to_dict() if snapshot.exists else None)
+            if embedding is not None:
+                embeddings[snapshot.id] = embedding
+    return embeddings
+
+
+def load_embedding(db, collection: str, doc_id: str,
+                   data: Optional[Dict[str, Any]] = None) -> Optional[np.ndarray]:
+    """One document's embedding; data (the catalog document, if already read) saves the fallback read"""
+    snapshot = embedding_ref(db, collection, doc_id).get()
+    embedding = document_embedding(snapshot.to_dict() if snapshot.exists else None)
+    if embedding is None:
+        if data is None:
+            data = db.collection(collection).document(doc_id).get(field_paths=[EMBEDDING_FIELD, ENCODING_FIELD]).to_dict()
+        embedding = document_embedding(data)
+    return embedding
+
+
+def delete_embeddings(db, collection: str, doc_ids: List[str]) -> CommitReport:
+    side = db.collection(embedding_collection(collection))
+    return commit_batches(db, [(side.document(doc_id), None) for doc_id in doc_ids])
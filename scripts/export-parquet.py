@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Export Firestore collections to Parquet snapshots
+
+Writes a consistent, typed snapshot of a collection (see firestore_export.py)
+that analyses and index rebuilds can load offline instead of streaming the
+collection document by document:
+
+    import pandas as pd
+    df = pd.read_parquet('snapshots/destinations__g20261018T222249/20261019T101500')
+
+Usage:
+    uv run python scripts/export-parquet.py
+    uv run python scripts/export-parquet.py --collection umkm --no-embeddings
+    uv run python scripts/export-parquet.py --fields name,category,latitude,longitude
+    uv run python scripts/export-parquet.py --partitions 32 --workers 16
+"""
+
+import argparse
+import os
+import sys
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore, initialize_app
+
+from catalog_generations import active_collection
+from firestore_export import (DEFAULT_PAGE_SIZE, DEFAULT_PARTITIONS, DEFAULT_WORKERS, SPLIT_METHODS,
+                              PartitionResult, export_collection)
+
+DEFAULT_COLLECTIONS = ['destinations']
+DEFAULT_OUTPUT = './snapshots'
+
+
+def report(result: PartitionResult):
+    span = f"{result.start or '…'} → {result.end or '…'}"
+    print(f"   {result.file}: {result.rows} rows, {result.embeddings} embeddings "
+          f"({result.seconds:.1f}s, {span})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export Firestore collections to Parquet snapshots')
+    parser.add_argument('--collection', action='append',
+                        help=f"collection to export (repeatable, default: {', '.join(DEFAULT_COLLECTIONS)}; "
+                             f"destinations means the active generation)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help=f'snapshot root (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--fields', action='append',
+                        help='only export these fields (comma-separated or repeatable, default: all)')
+    parser.add_argument('--no-embeddings', action='store_true', help='skip the embedding column')
+    parser.add_argument('--partitions', type=int, default=DEFAULT_PARTITIONS)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--split', choices=SPLIT_METHODS, default=SPLIT_METHODS[0],
+                        help='how ID ranges are chosen (default: %(default)s)')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='read live data instead of one read time (for exports running longer than an hour)')
+    args = parser.parse_args()
+    fields = [field.strip() for value in args.fields or [] for field in value.split(',') if field.strip()]
+
+    load_dotenv('.env.local')
+    service_account_path = os.path.join(os.getcwd(), 'serviceAccountKey.json')
+    initialize_app(credentials.Certificate(service_account_path))
+    db = firestore.client()
+
+    for name in args.collection or DEFAULT_COLLECTIONS:
+        collection = active_collection(db, name) if name == 'destinations' else name
+        print(f"📦 Exporting {collection} in {args.partitions} partitions...")
+        manifest = export_collection(
+            db, collection, args.output, fields=fields or None, embeddings=not args.no_embeddings,
+            partitions=args.partitions, workers=args.workers, split=args.split,
+            page_size=args.page_size, consistent=not args.no_snapshot, progress=report,
+        )
+        rate = manifest['rows'] / manifest['seconds'] if manifest['seconds'] else 0
+        print(f"✅ {collection}: {manifest['rows']} rows, {manifest['embeddings']} embeddings, "
+              f"{len(manifest['partitions'])} files ({manifest['seconds']:.1f}s, {rate:.0f} docs/s)")
+        for field, n in sorted(manifest['coerced'].items()):
+            print(f"   ⚠️  {n} values of {field} did not fit their column and were written as null")
+        print(f"   📁 {manifest['path']}")
+
+
+if __name__ == '__main__':
+    main()
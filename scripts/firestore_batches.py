@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Firestore batch-commit engine
+
+Splits a list of (DocumentReference, data) writes into WriteBatches of at
+most 500 writes and a byte budget (documents carrying 768-float embeddings
+are ~6 KB each, so count alone can exceed the request size limit), commits
+up to `in_flight` batches at once on a thread pool and retries only the
+batches that failed with a transient error, in rounds with exponential
+backoff. A write whose data is None deletes the document.
+
+Usage:
+    from firestore_batches import commit_batches
+
+    report = commit_batches(db, [(collection.document(), data) for data in docs])
+    print(report.failed)  # indices into the writes list
+"""
+
+import datetime
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+from google.api_core import exceptions as gexc
+
+MAX_BATCH_WRITES = 500  # Firestore limit per commit
+# Estimated storage bytes per batch; the 10 MiB request limit applies to the
+# wire encoding, which runs ~1.5x the storage size for float arrays
+MAX_BATCH_BYTES = 4 * 1024 * 1024
+DEFAULT_IN_FLIGHT = 8
+MAX_ROUNDS = 5
+BACKOFF_SECONDS = 1.0
+
+RETRYABLE_ERRORS = (
+    gexc.Aborted,
+    gexc.DeadlineExceeded,
+    gexc.InternalServerError,
+    gexc.ResourceExhausted,
+    gexc.ServiceUnavailable,
+)
+
+
+class CommitReport(NamedTuple):
+    written: int
+    failed: List[int]  # indices of writes that were not committed
+    errors: List[str]  # one message per failed batch
+    batches: int
+    retried_batches: int
+    seconds: float
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.written / self.seconds if self.seconds else 0.0
+
+
+def estimate_size(value: Any) -> int:
+    """Firestore storage size of a value (strings are UTF-8 bytes + 1)"""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, datetime.datetime)):
+        return 8
+    if isinstance(value, str):
+        return len(value.encode('utf-8')) + 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(str(key).encode('utf-8')) + 1 + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(item) for item in value)
+    if hasattr(value, 'to_map_value'):  # Vector: a map holding an array of doubles
+        return estimate_size(value.to_map_value())
+    return 16  # Sentinels (SERVER_TIMESTAMP), GeoPoint, references
+
+
+def plan_batches(writes: Sequence[Tuple[Any, Dict[str, Any]]], max_writes: int = MAX_BATCH_WRITES,
+                 max_bytes: int = MAX_BATCH_BYTES) -> List[List[int]]:
+    """Group write indices into batches under both the count and byte budget"""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_bytes = 0
+    for i, (ref, data) in enumerate(writes):
+        size = estimate_size(data) + len(ref.path) + 32  # Document name and write overhead
+        if current and (len(current) >= max_writes or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(i)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _commit(db, writes, indices: List[int], merge: bool):
+    batch = db.batch()
+    for i in indices:
+        ref, data = writes[i]
+        if data is None:
+            batch.delete(ref)
+        else:
+            batch.set(ref, data, merge=merge)
+    batch.commit()
+
+
+def commit_batches(db, writes: Sequence[Tuple[Any, Dict[str, Any]]], in_flight: int = DEFAULT_IN_FLIGHT,
+                   max_writes: int = MAX_BATCH_WRITES, max_bytes: int = MAX_BATCH_BYTES,
+                   merge: bool = False, progress=None) -> CommitReport:
+    """Commit all writes with up to in_flight batches outstanding.
+
+    progress, when given, is updated (tqdm style) with the number of writes
+    of every committed batch. Batches that keep failing after MAX_ROUNDS, or
+    fail with a non-transient error, are reported in CommitReport.failed and
+    CommitReport.errors; nothing is printed.
+    """
+    start = time.perf_counter()
+    pending = plan_batches(writes, max_writes, max_bytes)
+    total_batches = len(pending)
+    failed: List[int] = []
+    errors: List[str] = []
+    retried = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, in_flight)) as executor:
+        for round_number in range(MAX_ROUNDS):
+            if not pending:
+                break
+            if round_number:
+                retried += len(pending)
+                # Exponential backoff with jitter before resending failed batches
+                time.sleep(BACKOFF_SECONDS * (2 ** (round_number - 1)) * (1 + random.random()))
+
+            futures = {executor.submit(_commit, db, writes, indices, merge): indices for indices in pending}
+            pending = []
+            for future in as_completed(futures):
+                indices = futures[future]
+                error = future.exception()
+                if error is None:
+                    if progress is not None:
+                        progress.update(len(indices))
+                elif isinstance(error, RETRYABLE_ERRORS):
+                    pending.append(indices)
+                else:
+                    errors.append(f"batch of {len(indices)} writes: {error}")
+                    failed.extend(indices)
+
+    for indices in pending:
+        errors.append(f"batch of {len(indices)} writes still failing after {MAX_ROUNDS} attempts")
+        failed.extend(indices)
+
+    return CommitReport(
+        written=len(writes) - len(failed),
+        failed=sorted(failed),
+        errors=errors,
+        batches=total_batches,
+        retried_batches=retried,
+        seconds=time.perf_counter() - start,
+    )
@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Partitioned Firestore export to Parquet snapshots
+
+Analyses and index rebuilds read the catalog straight from Firestore, a
+document at a time. This exports a collection once into typed Parquet
+files that pandas, pyarrow or FAISS can load without further reads:
+
+    snapshots/destinations__g20261018T222249/20261019T101500/
+        _manifest.json
+        part-00000.parquet
+        part-00001.parquet
+        ...
+
+The collection is split into document ID ranges: from a partition query
+(Firestore picks balanced split points) or, where that is unavailable,
+evenly between the first and last document ID (two keys-only reads;
+balanced when IDs are spread evenly, as auto IDs are). Ranges are read in
+parallel, a page at a time, with a projection when fields are given, all
+at the same read time so the snapshot is consistent. Embedding side documents (embedding_store.py) share
+their catalog document's ID, so each worker reads the same range of the
+side collection and joins the two by ID.
+
+Columns have fixed types (FIELD_TYPES); fields outside it are kept as a
+JSON object in `extra`. Embeddings are a fixed-size float32 list column.
+Values that do not fit their column's type are written as null and counted
+in the manifest.
+
+Usage:
+    from firestore_export import export_collection, read_snapshot, snapshot_embeddings
+
+    manifest = export_collection(db, 'destinations__g20261018T222249', './snapshots')
+    df = read_snapshot(manifest['path']).to_pandas()
+    ids, vectors = snapshot_embeddings(manifest['path'])
+"""
+
+import bisect
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from embedding_codec import EMBEDDING_DIMENSION, EMBEDDING_FIELD, ENCODING_FIELD, document_embedding
+from embedding_store import EMBEDDING_COLLECTIONS, embedding_collection
+
+MANIFEST_FILE = '_manifest.json'  # '_' prefix: skipped by pyarrow dataset discovery
+ID_COLUMN = 'id'
+EXTRA_COLUMN = 'extra'
+DEFAULT_PARTITIONS = 16
+DEFAULT_WORKERS = 8
+DEFAULT_PAGE_SIZE = 1000
+# Printable ASCII but '/', in the order Firestore sorts document IDs; split IDs are spelled in these
+ID_ALPHABET = ''.join(chr(code) for code in range(0x21, 0x7f) if chr(code) != '/')
+ID_SPLIT_CHARS = 4  # Characters after the common prefix that split IDs are interpolated over
+SPLIT_METHODS = ('partition-query', 'id-range')
+
+_STRING = pa.string()
+_FLOAT = pa.float64()
+_TIMESTAMP = pa.timestamp('us', tz='UTC')
+FIELD_TYPES: Dict[str, pa.DataType] = {
+    'name': _STRING,
+    'category': _STRING,
+    'description': _STRING,
+    'descriptionClean': _STRING,
+    'provinsi': _STRING,
+    'kotaKabupaten': _STRING,
+    'address': _STRING,
+    'latitude': _FLOAT,
+    'longitude': _FLOAT,
+    'rating': _FLOAT,
+    'priceRange': _STRING,
+    'timeMinutes': pa.int64(),
+    'isCultural': pa.bool_(),
+    'verified': pa.bool_(),
+    'phone': _STRING,
+    'whatsapp': _STRING,
+    'imageUrl': _STRING,
+    'source': _STRING,
+    'contentHash': _STRING,
+    'geohash': _STRING,
+    'geohash3': _STRING,
+    'geohash4': _STRING,
+    'geohash5': _STRING,
+    'geohash6': _STRING,
+    'searchTokens': pa.list_(_STRING),
+    'searchPrefixes': pa.list_(_STRING),
+    'createdAt': _TIMESTAMP,
+    'updatedAt': _TIMESTAMP,
+}
+
+
+class PartitionResult(NamedTuple):
+    file: str
+    start: Optional[str]  # First document ID of the range (inclusive), None from the start
+    end: Optional[str]  # First document ID after the range, None to the end
+    rows: int
+    embeddings: int
+    coerced: Dict[str, int]  # Values written as null because they did not fit their column
+    seconds: float
+
+
+def _coerce(value: Any, data_type: pa.DataType) -> Any:
+    """value as the Python type pyarrow expects for data_type; raises ValueError if it does not fit"""
+    if value is None:
+        return None
+    if data_type == _STRING:
+        return value if isinstance(value, str) else json.dumps(value, default=str, ensure_ascii=False)
+    if data_type == _FLOAT:
+        if isinstance(value, bool):
+            raise ValueError(value)
+        return float(value)
+    if pa.types.is_integer(data_type):
+        if isinstance(value, bool) or float(value) != int(float(value)):
+            raise ValueError(value)
+        return int(float(value))
+    if pa.types.is_boolean(data_type):
+        if not isinstance(value, bool):
+            raise ValueError(value)
+        return value
+    if pa.types.is_timestamp(data_type):
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if not isinstance(value, datetime):
+            raise ValueError(value)
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if pa.types.is_list(data_type):
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(value)
+        return [_coerce(item, data_type.value_type) for item in value]
+    raise ValueError(f"Unsupported column type {data_type}")
+
+
+def export_schema(fields: Optional[Sequence[str]], embedding_dimension: Optional[int]) -> pa.Schema:
+    """Columns of an export: id, the typed fields, extra (all fields only) and embedding"""
+    columns = [pa.field(ID_COLUMN, _STRING, nullable=False)]
+    if fields:
+        columns += [pa.field(field, FIELD_TYPES.get(field, _STRING)) for field in fields]
+    else:
+        columns += [pa.field(field, data_type) for field, data_type in FIELD_TYPES.items()]
+        columns.append(pa.field(EXTRA_COLUMN, _STRING))
+    if embedding_dimension:
+        columns.append(pa.field(EMBEDDING_FIELD, pa.list_(pa.float32(), embedding_dimension)))
+    return pa.schema(columns)
+
+
+def _embedding_array(vectors: List[Optional[np.ndarray]], dimension: int) -> Tuple[pa.Array, int]:
+    """Fixed-size float32 list column (null where missing or of another size) and its non-null count"""
+    valid = np.array([vector is not None and vector.shape == (dimension,) for vector in vectors], dtype=bool)
+    matrix = np.zeros((len(vectors), dimension), dtype=np.float32)
+    for i in np.flatnonzero(valid):
+        matrix[i] = vectors[i]
+    validity = None if valid.all() else pa.array(valid).buffers()[1]
+    array = pa.Array.from_buffers(pa.list_(pa.float32(), dimension), len(vectors), [validity],
+                                  children=[pa.array(matrix.ravel())])
+    return array, int(valid.sum())
+
+
+def page_table(rows: List[Tuple[str, Dict[str, Any]]], schema: pa.Schema,
+               embeddings: Optional[Dict[str, np.ndarray]], coerced: Dict[str, int]) -> Tuple[pa.Table, int]:
+    """(table of one page of (id, data) rows, embeddings in it); counts unfit values into coerced"""
+    arrays = [pa.array([doc_id for doc_id, _ in rows], _STRING)]
+    for column in schema:
+        if column.name in (ID_COLUMN, EMBEDDING_FIELD):
+            continue
+        if column.name == EXTRA_COLUMN:
+            extras = [{key: value for key, value in data.items()
+                       if key not in FIELD_TYPES and key not in (EMBEDDING_FIELD, ENCODING_FIELD)} for _, data in rows]
+            arrays.append(pa.array([json.dumps(extra, default=str, ensure_ascii=False) if extra else None
+                                    for extra in extras], _STRING))
+            continue
+        values = []
+        for _, data in rows:
+            try:
+                values.append(_coerce(data.get(column.name), column.type))
+            except (TypeError, ValueError):
+                values.append(None)
+                coerced[column.name] = coerced.get(column.name, 0) + 1
+        arrays.append(pa.array(values, column.type))
+
+    found = 0
+    if schema.get_field_index(EMBEDDING_FIELD) >= 0:
+        dimension = schema.field(EMBEDDING_FIELD).type.list_size
+        # The side document, else an embedding still stored inline
+        vectors = [embeddings.get(doc_id) if embeddings and doc_id in embeddings else document_embedding(data)
+                   for doc_id, data in rows]
+        array, found = _embedding_array(vectors, dimension)
+        arrays.append(array)
+    return pa.Table.from_arrays(arrays, schema=schema), found
+
+
+def _stream_range(query, start: Optional[str], end: Optional[str], page_size: int,
+                  read_time: Optional[datetime]) -> Iterator[list]:
+    """Pages of snapshots with start <= ID < end, in ID order"""
+    query = query.order_by('__name__')
+    if end is not None:
+        query = query.end_before({'__name__': end})
+    kwargs = {'read_time': read_time} if read_time else {}
+    page_query = query.start_at({'__name__': start}) if start is not None else query
+    while True:
+        page = list(page_query.limit(page_size).stream(**kwargs))
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        page_query = query.start_after(page[-1])
+
+
+def export_range(db, collection: str, start: Optional[str], end: Optional[str], path: str,
+                 schema: pa.Schema, fields: Optional[Sequence[str]] = None,
+                 page_size: int = DEFAULT_PAGE_SIZE, read_time: Optional[datetime] = None) -> PartitionResult:
+    """Write the documents of one ID range to a Parquet file, a row group per page"""
+    started = time.perf_counter()
+    query = db.collection(collection)
+    if fields:
+        query = query.select(list(fields))
+    side = None
+    if schema.get_field_index(EMBEDDING_FIELD) >= 0 and collection.partition('__')[0] in EMBEDDING_COLLECTIONS:
+        side = _stream_range(db.collection(embedding_collection(collection)), start, end, page_size, read_time)
+    pending: Dict[str, np.ndarray] = {}  # Side embeddings read ahead of the catalog page that needs them
+    side_last = ''  # Last side document ID read
+
+    rows_written, embeddings_found, coerced = 0, 0, {}
+    with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+        for page in _stream_range(query, start, end, page_size, read_time):
+            rows = [(snapshot.id, snapshot.to_dict() or {}) for snapshot in page]
+            last_id = rows[-1][0]
+            # Both streams are in ID order: read side pages up to this page's last ID
+            while side is not None and side_last < last_id:
+                side_page = next(side, None)
+                if side_page is None:
+                    side = None
+                    break
+                side_last = side_page[-1].id
+                for snapshot in side_page:
+                    embedding = document_embedding(snapshot.to_dict())
+                    if embedding is not None:
+                        pending[snapshot.id] = embedding
+            page_embeddings = {doc_id: pending.pop(doc_id) for doc_id, _ in rows if doc_id in pending}
+            pending = {doc_id: vector for doc_id, vector in pending.items() if doc_id > last_id}
+
+            table, found = page_table(rows, schema, page_embeddings, coerced)
+            writer.write_table(table)
+            rows_written += len(rows)
+            embeddings_found += found
+    return PartitionResult(os.path.basename(path), start, end, rows_written, embeddings_found, coerced,
+                           time.perf_counter() - started)
+
+
+def partition_query_bounds(db, collection: str, partitions: int,
+                           read_time: Optional[datetime] = None) -> List[str]:
+    """Split IDs chosen by Firestore's partition query (collection group of the same ID, top level only)"""
+    kwargs = {'read_time': read_time} if read_time else {}
+    bounds = []
+    for partition in db.collection_group(collection).get_partitions(partitions, **kwargs):
+        ref = partition.end_at
+        if ref is not None and ref.path.rsplit('/', 1)[0] == collection:
+            bounds.append(ref.id)
+    return bounds
+
+
+def _id_number(doc_id: str) -> int:
+    """Position of the first ID_SPLIT_CHARS characters in ID order, as a base-len(ID_ALPHABET) number"""
+    number = 0
+    for char in doc_id[:ID_SPLIT_CHARS].ljust(ID_SPLIT_CHARS, ID_ALPHABET[0]):
+        digit = min(bisect.bisect_left(ID_ALPHABET, char), len(ID_ALPHABET) - 1)
+        number = number * len(ID_ALPHABET) + digit
+    return number
+
+
+def _id_string(number: int) -> str:
+    chars = []
+    for _ in range(ID_SPLIT_CHARS):
+        number, digit = divmod(number, len(ID_ALPHABET))
+        chars.append(ID_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def id_range_bounds(db, collection: str, partitions: int,
+                    read_time: Optional[datetime] = None) -> List[str]:
+    """Split IDs spaced evenly between the first and last document ID"""
+    kwargs = {'read_time': read_time} if read_time else {}
+    keys = db.collection(collection).select([]).limit(1)
+    first = [snapshot.id for snapshot in keys.order_by('__name__').stream(**kwargs)]
+    last = [snapshot.id for snapshot in keys.order_by('__name__', direction='DESCENDING').stream(**kwargs)]
+    if not first or first == last:
+        return []
+    prefix = os.path.commonprefix([first[0], last[0]])
+    low, high = _id_number(first[0][len(prefix):]), _id_number(last[0][len(prefix):])
+    return [prefix + _id_string(low + (high - low) * i // partitions) for i in range(1, partitions)]
+
+
+def plan_ranges(bounds: Sequence[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    points = sorted(set(bounds))
+    edges: List[Optional[str]] = [None, *points, None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def export_collection(db, collection: str, output_dir: str, fields: Optional[Sequence[str]] = None,
+                      embeddings: bool = True, embedding_dimension: int = EMBEDDING_DIMENSION,
+                      partitions: int = DEFAULT_PARTITIONS, workers: int = DEFAULT_WORKERS,
+                      split: str = 'partition-query', page_size: int = DEFAULT_PAGE_SIZE,
+                      consistent: bool = True,
+                      progress: Optional[Callable[[PartitionResult], None]] = None) -> Dict[str, Any]:
+    """Export a collection to output_dir/<collection>/<timestamp>/; returns the manifest (with its path)"""
+    started = time.perf_counter()
+    created = datetime.now(timezone.utc)
+    read_time = created.replace(microsecond=0) if consistent else None
+    path = os.path.join(output_dir, collection, created.strftime('%Y%m%dT%H%M%S'))
+    os.makedirs(path, exist_ok=True)
+
+    if split not in SPLIT_METHODS:
+        raise ValueError(f"Unknown split method '{split}', expected one of: {', '.join(SPLIT_METHODS)}")
+    bounds = []
+    if split == 'partition-query' and partitions > 1:
+        try:
+            bounds = partition_query_bounds(db, collection, partitions, read_time)
+        except Exception as e:  # Not every backend (e.g. some emulator versions) implements it
+            print(f"⚠️  Partition query failed ({e}), splitting between the first and last ID")
+            split = 'id-range'
+    if split == 'id-range' and partitions > 1:
+        bounds = id_range_bounds(db, collection, partitions, read_time)
+    ranges = plan_ranges(bounds)
+
+    schema = export_schema(fields, embedding_dimension if embeddings else None)
+
+    def run(item):
+        i, (start, end) = item
+        result = export_range(db, collection, start, end, os.path.join(path, f'part-{i:05d}.parquet'),
+                              schema, fields, page_size, read_time)
+        if progress is not None:
+            progress(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(ranges)))) as executor:
+        results = list(executor.map(run, enumerate(ranges)))
+
+    coerced: Dict[str, int] = {}
+    for result in results:
+        for field, n in result.coerced.items():
+            coerced[field] = coerced.get(field, 0) + n
+    seconds = time.perf_counter() - started
+    rows = sum(result.rows for result in results)
+    manifest = {
+        'collection': collection,
+        'createdAt': created.isoformat(),
+        'readTime': read_time.isoformat() if read_time else None,
+        'split': split,
+        'fields': list(fields) if fields else None,
+        'rows': rows,
+        'embeddings': sum(result.embeddings for result in results),
+        'embeddingDimension': embedding_dimension if embeddings else None,
+        'coerced': coerced,
+        'seconds': round(seconds, 3),
+        'schema': [{'name': column.name, 'type': str(column.type)} for column in schema],
+        'partitions': [{'file': r.file, 'start': r.start, 'end': r.end, 'rows': r.rows,
+                        'embeddings': r.embeddings, 'seconds': round(r.seconds, 3)} for r in results],
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return {**manifest, 'path': path}
+
+
+def load_manifest(snapshot_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(snapshot_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_snapshot(snapshot_dir: str, columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """All partitions of a snapshot as one table, in ID order"""
+    manifest = load_manifest(snapshot_dir)
+    files = [os.path.join(snapshot_dir, partition['file']) for partition in manifest['partitions']]
+    return pa.concat_tables([pq.read_table(file, columns=list(columns) if columns else None) for file in files])
+
+
+def snapshot_embeddings(snapshot_dir: str) -> Tuple[List[str], np.ndarray]:
+    """(document IDs, float32 matrix) of the snapshot rows that have an embedding"""
+    table = read_snapshot(snapshot_dir, [ID_COLUMN, EMBEDDING_FIELD])
+    table = table.filter(table[EMBEDDING_FIELD].is_valid())
+    column = table[EMBEDDING_FIELD].combine_chunks()
+    dimension = column.type.list_size
+    vectors = column.flatten().to_numpy(zero_copy_only=False).reshape(-1, dimension)
+    return table[ID_COLUMN].to_pylist(), vectors.astype(np.float32, copy=False)
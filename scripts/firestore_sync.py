@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diff-based Firestore sync
+
+With deterministic IDs (doc_ids.py) a refresh still rewrote every
+document. Here every synced document carries a `contentHash` of the record
+it was built from, and a small hash index (one meta document plus shards of
+{id: hash} maps under _sync_index/{collection}) lets a refresh pull all
+remote hashes in a few reads. The delta against the new dataset
+(inserts / updates / deletes) is computed locally, so only changed records
+are rebuilt and written. A refresh of an unchanged catalog costs zero
+writes.
+
+Without an index (first sync, or verify=True) the hashes are read with a
+projection query instead, which touches every document once but transfers
+only the hash field. Documents written before sync existed have no hash
+and are rewritten once.
+
+Usage:
+    from firestore_sync import content_hash, load_remote_hashes, plan_sync
+
+    remote, source = load_remote_hashes(db, 'destinations')
+    plan = plan_sync(remote, {doc_id: content_hash(record) for doc_id, record in records.items()})
+"""
+
+import hashlib
+import json
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from firestore_batches import CommitReport, commit_batches
+
+HASH_FIELD = 'contentHash'
+HASH_LENGTH = 16
+INDEX_COLLECTION = '_sync_index'
+INDEX_SHARD_SIZE = 5000  # ~250 KB per shard, well under the 1 MiB document limit
+# Not part of a record's content
+VOLATILE_FIELDS = {'createdAt', 'updatedAt', HASH_FIELD}
+
+
+class SyncPlan(NamedTuple):
+    inserts: List[str]
+    updates: List[str]
+    deletes: List[str]
+    unchanged: List[str]
+
+    @property
+    def changed(self) -> List[str]:
+        return self.inserts + self.updates
+
+    def summary(self) -> str:
+        return (f"{len(self.inserts)} new, {len(self.updates)} changed, "
+                f"{len(self.deletes)} removed, {len(self.unchanged)} unchanged")
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    """Stable hash of a record's content (key order and volatile fields ignored)"""
+    canonical = {key: value for key, value in record.items() if key not in VOLATILE_FIELDS}
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+
+def plan_sync(remote: Dict[str, str], local: Dict[str, str]) -> SyncPlan:
+    """Compare {id: hash} maps; local order is kept for inserts and updates"""
+    inserts, updates, unchanged = [], [], []
+    for doc_id, digest in local.items():
+        if doc_id not in remote:
+            inserts.append(doc_id)
+        elif remote[doc_id] != digest:
+            updates.append(doc_id)
+        else:
+            unchanged.append(doc_id)
+    deletes = sorted(doc_id for doc_id in remote if doc_id not in local)
+    return SyncPlan(inserts, updates, deletes, unchanged)
+
+
+def _index_ref(db, collection: str):
+    return db.collection(INDEX_COLLECTION).document(collection)
+
+
+def _shard_ref(db, collection: str, shard: int):
+    return _index_ref(db, collection).collection('shards').document(str(shard))
+
+
+def _shard_of(doc_id: str, shards: int) -> int:
+    return int(hashlib.sha256(doc_id.encode('utf-8')).hexdigest()[:8], 16) % shards
+
+
+def _group_shards(hashes: Dict[str, str], shards: int) -> List[Dict[str, str]]:
+    grouped: List[Dict[str, str]] = [{} for _ in range(shards)]
+    for doc_id, digest in hashes.items():
+        grouped[_shard_of(doc_id, shards)][doc_id] = digest
+    return grouped
+
+
+def load_hash_index(db, collection: str) -> Tuple[Optional[Dict[str, str]], int]:
+    """({id: hash}, shard count) from the index, (None, 0) when there is none"""
+    meta = _index_ref(db, collection).get()
+    if not meta.exists:
+        return None, 0
+    shards = int((meta.to_dict() or {}).get('shards', 0))
+    hashes: Dict[str, str] = {}
+    for snapshot in db.get_all([_shard_ref(db, collection, shard) for shard in range(shards)]):
+        hashes.update((snapshot.to_dict() or {}).get('hashes', {}))
+    return hashes, shards
+
+
+def projected_hashes(db, collection: str) -> Dict[str, str]:
+    """{id: hash} read from the documents themselves ('' where a document has none)"""
+    return {
+        snapshot.id: (snapshot.to_dict() or {}).get(HASH_FIELD, '')
+        for snapshot in db.collection(collection).select([HASH_FIELD]).stream()
+    }
+
+
+def load_remote_hashes(db, collection: str, verify: bool = False) -> Tuple[Dict[str, str], str]:
+    """Remote {id: hash} and where it came from ('index' or 'projection').
+
+    verify=True skips the index and reads the documents, e.g. after other
+    tools wrote to the collection.
+    """
+    if not verify:
+        hashes, _ = load_hash_index(db, collection)
+        if hashes is not None:
+            return hashes, 'index'
+    return projected_hashes(db, collection), 'projection'
+
+
+def save_hash_index(db, collection: str, hashes: Dict[str, str]) -> CommitReport:
+    """Store hashes as the collection's index, writing only shards that changed"""
+    previous, previous_shards = load_hash_index(db, collection)
+    shards = max(1, math.ceil(len(hashes) / INDEX_SHARD_SIZE))
+    grouped = _group_shards(hashes, shards)
+    old_grouped = _group_shards(previous, shards) if previous is not None and previous_shards == shards else None
+
+    writes = [
+        (_shard_ref(db, collection, shard), {'hashes': grouped[shard]})
+        for shard in range(shards)
+        if old_grouped is None or grouped[shard] != old_grouped[shard]
+    ]
+    if shards != previous_shards:
+        writes.append((_index_ref(db, collection), {'collection': collection, 'shards': shards}))
+        writes.extend((_shard_ref(db, collection, shard), None) for shard in range(shards, previous_shards))
+    return commit_batches(db, writes)
+
+
+def delete_hash_index(db, collection: str) -> CommitReport:
+    meta = _index_ref(db, collection).get()
+    if not meta.exists:
+        return commit_batches(db, [])
+    shards = int((meta.to_dict() or {}).get('shards', 0))
+    writes = [(_shard_ref(db, collection, shard), None) for shard in range(shards)]
+    return commit_batches(db, writes + [(_index_ref(db, collection), None)])
+
+
+def delete_documents(db, collection: str, doc_ids: List[str]) -> CommitReport:
+    ref = db.collection(collection)
+    return commit_batches(db, [(ref.document(doc_id), None) for doc_id in doc_ids])
+
+
+def build_report(collection: str, plan: SyncPlan, remote_source: str, names: Dict[str, str],
+                 failed: List[str], index_writes: int) -> Dict[str, Any]:
+    """JSON-ready change report of one sync run"""
+    def entries(doc_ids):
+        return [{'id': doc_id, 'name': names.get(doc_id, '')} for doc_id in doc_ids]
+
+    failed_set = set(failed)
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'collection': collection,
+        'remoteHashes': remote_source,
+        'counts': {
+            'inserted': len(plan.inserts),
+            'updated': len(plan.updates),
+            'deleted': len(plan.deletes),
+            'unchanged': len(plan.unchanged),
+            'failed': len(failed),
+            'documentWrites': len(plan.changed) + len(plan.deletes) - len(failed),
+            'indexWrites': index_writes,
+        },
+        'inserted': entries(i for i in plan.inserts if i not in failed_set),
+        'updated': entries(i for i in plan.updates if i not in failed_set),
+        'deleted': entries(i for i in plan.deletes if i not in failed_set),
+        'failed': entries(failed),
+    }
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geohash cell fields for proximity queries
+
+Proximity lookups (MapService.getDestinationsNear) loaded the whole
+collection and filtered by distance in the client. Every destination and
+UMKM now carries its geohash at several precisions:
+
+    geohash    precision 9 (~5 m), for prefix range queries
+    geohash3   ~156 x 156 km
+    geohash4   ~39 x 20 km
+    geohash5   ~4.9 x 4.9 km
+    geohash6   ~1.2 x 0.6 km
+
+so a lookup becomes one `in` query on the cells around a point at the
+finest precision that covers the radius in at most 30 cells (Firestore's
+`in` limit), followed by the exact distance filter. Equality on a single
+field is served by Firestore's automatic index, which matters for catalog
+generations (catalog_generations.py): their collection IDs change with
+every import, so composite indexes do not follow them.
+
+Cells are computed for a whole list of records at once with numpy; the
+TypeScript side (lib/geo-cells.ts) computes the same cells for queries.
+
+Usage:
+    from geo_cells import add_geo_fields
+
+    add_geo_fields(destinations)   # in place, records without coordinates are left alone
+"""
+
+from typing import Any, Dict, List
+
+import numpy as np
+
+BASE32 = np.frombuffer(b'0123456789bcdefghjkmnpqrstuvwxyz', dtype=np.uint8)
+GEOHASH_FIELD = 'geohash'
+GEOHASH_PRECISION = 9
+CELL_PRECISIONS = (3, 4, 5, 6)
+
+
+def cell_field(precision: int) -> str:
+    return f"{GEOHASH_FIELD}{precision}"
+
+
+def encode_geohashes(latitudes: np.ndarray, longitudes: np.ndarray,
+                     precision: int = GEOHASH_PRECISION) -> np.ndarray:
+    """Geohashes of coordinate arrays (array of str)"""
+    bits = 5 * precision
+    lng_bits, lat_bits = (bits + 1) // 2, bits // 2  # Bits alternate, longitude first
+    lat = np.clip(np.asarray(latitudes, dtype=np.float64), -90, 90)
+    lng = np.clip(np.asarray(longitudes, dtype=np.float64), -180, 180)
+    lat_cells = np.minimum(((lat + 90) / 180 * (1 << lat_bits)).astype(np.uint64), (1 << lat_bits) - 1)
+    lng_cells = np.minimum(((lng + 180) / 360 * (1 << lng_bits)).astype(np.uint64), (1 << lng_bits) - 1)
+
+    interleaved = np.zeros(lat.shape, dtype=np.uint64)
+    for bit in range(bits):
+        # Bit 0 of the hash is the top longitude bit, bit 1 the top latitude bit, ...
+        if bit % 2 == 0:
+            source, shift = lng_cells, lng_bits - 1 - bit // 2
+        else:
+            source, shift = lat_cells, lat_bits - 1 - bit // 2
+        interleaved = (interleaved << np.uint64(1)) | ((source >> np.uint64(shift)) & np.uint64(1))
+
+    shifts = np.arange(precision - 1, -1, -1, dtype=np.uint64) * np.uint64(5)
+    digits = (interleaved[:, None] >> shifts) & np.uint64(31)
+    chars = BASE32[digits.astype(np.intp)]
+    return chars.view(f'S{precision}').ravel().astype(str)
+
+
+def geo_fields(latitudes: np.ndarray, longitudes: np.ndarray) -> List[Dict[str, str]]:
+    """Cell fields for each coordinate pair"""
+    hashes = encode_geohashes(latitudes, longitudes)
+    return [
+        {GEOHASH_FIELD: geohash, **{cell_field(precision): geohash[:precision] for precision in CELL_PRECISIONS}}
+        for geohash in hashes.tolist()
+    ]
+
+
+def has_coordinates(record: Dict[str, Any]) -> bool:
+    try:
+        lat, lng = float(record.get('latitude')), float(record.get('longitude'))
+    except (TypeError, ValueError):
+        return False
+    # 0, 0 is what the importers write for a missing coordinate
+    return np.isfinite(lat) and np.isfinite(lng) and (lat, lng) != (0.0, 0.0) and abs(lat) <= 90 and abs(lng) <= 180
+
+
+def add_geo_fields(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add the cell fields to every record with coordinates, in place; returns records"""
+    located = [record for record in records if has_coordinates(record)]
+    if located:
+        latitudes = np.array([float(record['latitude']) for record in located])
+        longitudes = np.array([float(record['longitude']) for record in located])
+        for record, fields in zip(located, geo_fields(latitudes, longitudes)):
+            record.update(fields)
+    return records
@@ -3,6 +3,10 @@
 """
 PALAPA Data Import Script - OPTIMIZED VERSION
 Import CSV data to Firestore and FAISS with proper batching
+
+Like import-data.py, each run writes a new catalog generation and its FAISS
+index, and switches the app to it only once both are complete
+(catalog_generations.py).
 """
 
 import os
@@ -23,11 +27,19 @@ from firebase_admin import initialize_app, firestore, credentials
 from google import genai
 import time
 
+from catalog_generations import (activate, garbage_collect, generation_collection, generation_index_path,
+                                  new_generation)
+from catalog_stats import compute_stats, write_stats
+from doc_ids import destination_id, unique_by_id
+from firestore_batches import commit_batches
+from geo_cells import add_geo_fields
+from search_tokens import add_search_fields
+
 # Load environment
 load_dotenv('.env.local')
 
 # Constants
-BATCH_SIZE = 100  # Firestore batch write limit
+UPLOAD_IN_FLIGHT = 8  # Concurrent batch commits (batch size: see firestore_batches.py)
 EMBEDDING_MODEL = "text-embedding-004"
 EMBEDDING_DIMENSION = 768
 EMBEDDING_BATCH_SIZE = 50  # Process embeddings in batches
@@ -149,28 +161,29 @@ class PALAPADataImporter:
         print(f"[PROCESS] OK - {len(destinations)} valid destinations")
         return destinations
 
-    def upload_to_firestore(self, destinations: List[Dict[str, Any]]):
-        """Upload destinations to Firestore in batches"""
-        print(f"[FIRESTORE] Uploading {len(destinations)} documents...")
-
-        batch_num = 0
-        for i in tqdm(range(0, len(destinations), BATCH_SIZE), desc="Batches"):
-            batch = self.db.batch()
-            batch_items = destinations[i:i+BATCH_SIZE]
-
-            for dest in batch_items:
-                # Create reference with auto ID
-                doc_ref = self.db.collection('destinations').document()
-                batch.set(doc_ref, {
-                    **dest,
-                    'createdAt': firestore.SERVER_TIMESTAMP,
-                    'updatedAt': firestore.SERVER_TIMESTAMP,
-                })
-
-            batch.commit()
-            batch_num += 1
-
-        print(f"[FIRESTORE] OK - Uploaded in {batch_num} batches")
+    def upload_to_firestore(self, destinations: List[Dict[str, Any]], collection_name: str) -> int:
+        """Upload destinations to Firestore in batches, several commits in flight at once; returns the failures"""
+        print(f"[FIRESTORE] Uploading {len(destinations)} documents to {collection_name}...")
+
+        collection = self.db.collection(collection_name)
+        writes = [
+            (collection.document(destination_id(dest)), {
+                **dest,
+                'createdAt': firestore.SERVER_TIMESTAMP,
+                'updatedAt': firestore.SERVER_TIMESTAMP,
+            })
+            for dest in destinations
+        ]
+        with tqdm(total=len(writes), desc="Documents") as pbar:
+            report = commit_batches(self.db, writes, in_flight=UPLOAD_IN_FLIGHT, progress=pbar)
+
+        print(f"[FIRESTORE] OK - Uploaded {report.written} documents in {report.batches} batches "
+              f"({report.docs_per_second:.0f} docs/sec)")
+        if report.failed:
+            print(f"[FIRESTORE] WARNING - {len(report.failed)} documents failed to upload")
+            for error in report.errors[:5]:
+                print(f"[FIRESTORE]   {error}")
+        return len(report.failed)
 
     def build_faiss_index(self, destinations: List[Dict[str, Any]]):
         """Build FAISS index with embeddings"""
@@ -190,7 +203,7 @@ class PALAPADataImporter:
                 # Store mapping
                 for j, dest in enumerate(batch_items):
                     self.index_mapping.append({
-                        'id': i + j,
+                        'id': destination_id(dest),
                         'name': dest['name'],
                         'category': dest['category'],
                         'provinsi': dest.get('provinsi', ''),
@@ -212,17 +225,17 @@ class PALAPADataImporter:
         else:
             print(f"[FAISS] WARN - No embeddings generated")
 
-    def save_faiss_index(self):
+    def save_faiss_index(self, index_path: str):
         """Save FAISS index and mapping"""
-        print("[FAISS] Saving index files...")
+        print(f"[FAISS] Saving index files to {index_path}...")
 
-        os.makedirs('faiss_index', exist_ok=True)
+        os.makedirs(index_path, exist_ok=True)
 
         # Save index
-        faiss.write_index(self.faiss_index, 'faiss_index/faiss_index.idx')
+        faiss.write_index(self.faiss_index, os.path.join(index_path, 'faiss_index.idx'))
 
         # Save mapping
-        with open('faiss_index/index_mapping.json', 'w', encoding='utf-8') as f:
+        with open(os.path.join(index_path, 'index_mapping.json'), 'w', encoding='utf-8') as f:
             json.dump(self.index_mapping, f, ensure_ascii=False, indent=2)
 
         print(f"[FAISS] OK - Saved {len(self.index_mapping)} entries")
@@ -234,20 +247,46 @@ class PALAPADataImporter:
             print("PALAPA DATA IMPORT - OPTIMIZED VERSION")
             print("="*60 + "\n")
 
+            index_root = os.getenv('FAISS_INDEX_PATH', './faiss_index')
+            generation = new_generation()
+            collection = generation_collection('destinations', generation)
+            print(f"[GENERATION] Writing catalog generation {generation} ({collection})")
+
             # Load CSV
             df = self.load_csv(csv_path)
 
             # Process data
             destinations = self.process_destinations(df)
 
+            # Deterministic document IDs: a rerun overwrites instead of duplicating
+            pairs, dropped = unique_by_id(destinations, destination_id)
+            if dropped:
+                print(f"[PROCESS] Dropped {dropped} rows with the same name and coordinates as an earlier row")
+            # Geohash cells for proximity queries, tokens for name lookups
+            destinations = add_search_fields(add_geo_fields([dest for _, dest in pairs]))
+
             # Upload to Firestore
-            self.upload_to_firestore(destinations)
+            failed = self.upload_to_firestore(destinations, collection)
+            if failed:
+                raise RuntimeError(f"{failed} destinations failed to upload, generation {generation} not activated")
+
+            write_stats(self.db, collection, compute_stats(destinations))
 
             # Build FAISS index
             self.build_faiss_index(destinations)
 
             # Save FAISS
-            self.save_faiss_index()
+            self.save_faiss_index(generation_index_path(index_root, generation))
+
+            # Switch readers to the new generation, then drop the old ones (catalog_generations.py)
+            pointer = activate(self.db, 'destinations', generation, documents=len(destinations))
+            print(f"[GENERATION] Activated generation {generation} (previous: {pointer.previous or 'destinations'})")
+            try:
+                deleted = garbage_collect(self.db, 'destinations', index_root=index_root)
+                if deleted:
+                    print(f"[GENERATION] Deleted {sum(deleted.values())} documents of {len(deleted)} old generation collections")
+            except Exception as e:
+                print(f"[GENERATION] WARNING - Old generations not cleaned up ({e}), run manage-generations.py gc later")
 
             print("\n" + "="*60)
             print("IMPORT COMPLETE")
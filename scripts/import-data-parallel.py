@@ -3,6 +3,10 @@
 """
 PALAPA Data Import Script - PARALLEL MULTIPROCESSING VERSION
 Import CSV data to Firestore and FAISS with parallel processing
+
+Like import-data.py, each run writes a new catalog generation and its FAISS
+index, and switches the app to it only once both are complete
+(catalog_generations.py).
 """
 
 import os
@@ -26,6 +30,14 @@ from multiprocessing import Pool, cpu_count
 from concurrent.futures import ThreadPoolExecutor
 import time
 
+from catalog_generations import (activate, garbage_collect, generation_collection, generation_index_path,
+                                  new_generation)
+from catalog_stats import compute_stats, write_stats
+from doc_ids import destination_id, unique_by_id
+from firestore_batches import commit_batches
+from geo_cells import add_geo_fields
+from search_tokens import add_search_fields
+
 # Load environment
 load_dotenv('.env.local')
 
@@ -33,6 +45,7 @@ load_dotenv('.env.local')
 EMBEDDING_MODEL = "text-embedding-004"
 EMBEDDING_DIMENSION = 768
 NUM_WORKERS = min(4, cpu_count() - 1)  # Use 4 workers or CPU count - 1
+UPLOAD_IN_FLIGHT = 8  # Concurrent batch commits
 
 print(f"[CONFIG] Using {NUM_WORKERS} worker threads")
 
@@ -181,31 +194,29 @@ class PALAPADataImporter:
 
         return embeddings_array
 
-    def upload_to_firestore(self, destinations: List[Dict[str, Any]]):
-        """Upload destinations to Firestore"""
-        print(f"[FIRESTORE] Uploading {len(destinations)} documents to Firestore...")
-
-        total_uploaded = 0
-        batch_size = 50  # Firestore batch size
-
-        with tqdm(total=len(destinations), desc="Uploading to Firestore") as pbar:
-            for i in range(0, len(destinations), batch_size):
-                batch = self.db.batch()
-                batch_items = destinations[i:i+batch_size]
-
-                for dest in batch_items:
-                    doc_ref = self.db.collection('destinations').document()
-                    batch.set(doc_ref, {
-                        **dest,
-                        'createdAt': firestore.SERVER_TIMESTAMP,
-                        'updatedAt': firestore.SERVER_TIMESTAMP,
-                    })
+    def upload_to_firestore(self, destinations: List[Dict[str, Any]], collection_name: str) -> int:
+        """Upload destinations to Firestore, several batch commits in flight at once; returns the failures"""
+        print(f"[FIRESTORE] Uploading {len(destinations)} documents to {collection_name}...")
 
-                batch.commit()
-                total_uploaded += len(batch_items)
-                pbar.update(len(batch_items))
-
-        print(f"[FIRESTORE] OK - Uploaded {total_uploaded} documents")
+        collection = self.db.collection(collection_name)
+        writes = [
+            (collection.document(destination_id(dest)), {
+                **dest,
+                'createdAt': firestore.SERVER_TIMESTAMP,
+                'updatedAt': firestore.SERVER_TIMESTAMP,
+            })
+            for dest in destinations
+        ]
+        with tqdm(total=len(writes), desc="Uploading to Firestore") as pbar:
+            report = commit_batches(self.db, writes, in_flight=UPLOAD_IN_FLIGHT, progress=pbar)
+
+        print(f"[FIRESTORE] OK - Uploaded {report.written} documents in {report.batches} batches "
+              f"({report.docs_per_second:.0f} docs/sec, {report.retried_batches} retried)")
+        if report.failed:
+            print(f"[FIRESTORE] WARNING - {len(report.failed)} documents failed to upload")
+            for error in report.errors[:5]:
+                print(f"[FIRESTORE]   {error}")
+        return len(report.failed)
 
     def build_faiss_index(self, destinations: List[Dict[str, Any]], embeddings: np.ndarray):
         """Build FAISS index with embeddings"""
@@ -217,7 +228,7 @@ class PALAPADataImporter:
         # Create mapping
         for idx, dest in enumerate(destinations):
             self.index_mapping.append({
-                'id': idx,
+                'id': destination_id(dest),
                 'name': dest['name'],
                 'category': dest['category'],
                 'provinsi': dest.get('provinsi', ''),
@@ -228,17 +239,17 @@ class PALAPADataImporter:
 
         print(f"[FAISS] OK - Added {len(embeddings)} embeddings to index")
 
-    def save_faiss_index(self):
+    def save_faiss_index(self, index_path: str):
         """Save FAISS index and mapping"""
-        print("[FAISS] Saving FAISS index files...")
+        print(f"[FAISS] Saving FAISS index files to {index_path}...")
 
-        os.makedirs('faiss_index', exist_ok=True)
+        os.makedirs(index_path, exist_ok=True)
 
         # Save index
-        faiss.write_index(self.faiss_index, 'faiss_index/faiss_index.idx')
+        faiss.write_index(self.faiss_index, os.path.join(index_path, 'faiss_index.idx'))
 
         # Save mapping
-        with open('faiss_index/index_mapping.json', 'w', encoding='utf-8') as f:
+        with open(os.path.join(index_path, 'index_mapping.json'), 'w', encoding='utf-8') as f:
             json.dump(self.index_mapping, f, ensure_ascii=False, indent=2)
 
         print(f"[FAISS] OK - Saved {len(self.index_mapping)} entries to index_mapping.json")
@@ -251,6 +262,10 @@ class PALAPADataImporter:
             print("="*70 + "\n")
 
             start_time = time.time()
+            index_root = os.getenv('FAISS_INDEX_PATH', './faiss_index')
+            generation = new_generation()
+            collection = generation_collection('destinations', generation)
+            print(f"[GENERATION] Writing catalog generation {generation} ({collection})")
 
             # Load CSV
             df = self.load_csv(csv_path)
@@ -258,17 +273,38 @@ class PALAPADataImporter:
             # Process data in parallel
             destinations = self.process_destinations_parallel(df)
 
+            # Deterministic document IDs: a rerun overwrites instead of duplicating
+            pairs, dropped = unique_by_id(destinations, destination_id)
+            if dropped:
+                print(f"[PROCESS] Dropped {dropped} rows with the same name and coordinates as an earlier row")
+            # Geohash cells for proximity queries, tokens for name lookups
+            destinations = add_search_fields(add_geo_fields([dest for _, dest in pairs]))
+
             # Generate embeddings in parallel
             embeddings = self.generate_embeddings_parallel(destinations)
 
             # Upload to Firestore
-            self.upload_to_firestore(destinations)
+            failed = self.upload_to_firestore(destinations, collection)
+            if failed:
+                raise RuntimeError(f"{failed} destinations failed to upload, generation {generation} not activated")
+
+            write_stats(self.db, collection, compute_stats(destinations))
 
             # Build FAISS index
             self.build_faiss_index(destinations, embeddings)
 
             # Save FAISS
-            self.save_faiss_index()
+            self.save_faiss_index(generation_index_path(index_root, generation))
+
+            # Switch readers to the new generation, then drop the old ones (catalog_generations.py)
+            pointer = activate(self.db, 'destinations', generation, documents=len(destinations))
+            print(f"[GENERATION] Activated generation {generation} (previous: {pointer.previous or 'destinations'})")
+            try:
+                deleted = garbage_collect(self.db, 'destinations', index_root=index_root)
+                if deleted:
+                    print(f"[GENERATION] Deleted {sum(deleted.values())} documents of {len(deleted)} old generation collections")
+            except Exception as e:
+                print(f"[GENERATION] WARNING - Old generations not cleaned up ({e}), run manage-generations.py gc later")
 
             elapsed = time.time() - start_time
 
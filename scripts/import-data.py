@@ -6,11 +6,26 @@ Import CSV data to Firestore and FAISS
 
 Usage:
     uv run python scripts/import-data.py
+    uv run python scripts/import-data.py path/to/destinations.csv
+    uv run python scripts/import-data.py --merge   # merge source CSVs in-process
+    uv run python scripts/import-data.py --semantic-dedupe   # drop embedding near-duplicates before upload
+    uv run python scripts/import-data.py --resume   # continue a crashed import from its journal
+
+A full import writes a new catalog generation and switches the app to it
+only once it is complete (catalog_generations.py, manage-generations.py
+to list, roll back or clean up). --sync updates the active generation.
+    uv run python scripts/import-data.py --sync   # write only rows that changed since the last import
+    uv run python scripts/import-data.py --sync --verify   # diff against the documents, not the hash index
+    uv run python scripts/import-data.py --embedding-encoding float16   # array, float32 (default), float16 or vector
+                                                                        # (or EMBEDDING_ENCODING in .env.local)
 """
 
+import argparse
 import os
 import sys
 import json
+import threading
+import time
 from dotenv import load_dotenv
 
 # Fix for Windows Unicode issues
@@ -21,23 +36,49 @@ import pandas as pd
 import numpy as np
 import faiss
 from tqdm import tqdm
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from firebase_admin import initialize_app, firestore, credentials
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions, SendMode
 from google import genai
 from google.genai import types
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import multiprocessing
 
+from catalog_generations import (activate, active_collection, active_index_path, garbage_collect,
+                                  generation_collection, generation_index_path, new_generation, read_pointer)
+from catalog_stats import compute_stats, load_stats, write_stats
+from doc_ids import destination_id, unique_by_id
+from embedding_codec import DEFAULT_ENCODING, ENCODINGS
+from embedding_store import delete_embeddings, embedding_ref, load_embeddings, split_embedding
+from geo_cells import add_geo_fields
+from import_journal import JOURNAL_FILE, ImportJournal
+from search_tokens import add_search_fields
+from firestore_sync import (HASH_FIELD, build_report, content_hash, delete_documents, load_hash_index,
+                            load_remote_hashes, plan_sync, save_hash_index)
+
 # Constants
 BATCH_SIZE = 500  # Firestore batch write limit
 EMBEDDING_MODEL = "text-embedding-004"  # Updated model
 EMBEDDING_DIMENSION = 768
+# BulkWriter ramp-up: starts at INITIAL ops/s and grows 50% every 5 minutes up to MAX
+BULK_INITIAL_OPS_PER_SECOND = 500
+BULK_MAX_OPS_PER_SECOND = 10000
+BULK_MAX_ATTEMPTS = 8
+# gRPC codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, INTERNAL, UNAVAILABLE
+RETRYABLE_CODES = {4, 8, 10, 13, 14}
+SYNC_REPORT_FILE = 'sync_report.json'
+WRITE_CHUNK_SIZE = 2000  # Destinations uploaded between journal checkpoints
+# index_mapping fields besides the document ID
+MAPPING_FIELDS = ['name', 'category', 'provinsi', 'isCultural', 'latitude', 'longitude']
+DATASET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'dataset-wisata')
 
 class PALAPADataImporter:
-    def __init__(self):
+    def __init__(self, semantic_dedupe: bool = False, embedding_encoding: str = DEFAULT_ENCODING):
         # Environment variables should already be loaded in main()
         print(f"🔍 Initializing importer... GEMINI_API_KEY found: {bool(os.getenv('GEMINI_API_KEY'))}")
 
+        self.semantic_dedupe = semantic_dedupe  # Drop embedding near-duplicates before upload
+        self.embedding_encoding = embedding_encoding  # How embeddings are stored, see embedding_codec.py
         self.db = None
         self.genai_client = None
         self.faiss_index = None
@@ -94,7 +135,20 @@ class PALAPADataImporter:
         df = pd.read_csv(csv_path, encoding='utf-8')
 
         print(f"✅ Loaded {len(df)} rows from CSV")
+        return self.prepare_dataframe(df)
+
+    def load_merged_data(self) -> pd.DataFrame:
+        """Run the dataset merge in-process instead of reading its CSV output"""
+        print(f"📄 Merging source datasets from {DATASET_DIR}...")
+        sys.path.insert(0, DATASET_DIR)
+        from merge_datasets import merge
 
+        df = merge()
+        print(f"✅ Merged {len(df)} rows")
+        return self.prepare_dataframe(df)
+
+    def prepare_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Map column name variations to the names used by the importer"""
         # Basic data validation
         print(f"📊 CSV columns found: {list(df.columns)}")
 
@@ -128,8 +182,8 @@ class PALAPADataImporter:
 
         print(f"✅ Column mapping: {actual_columns}")
 
-        # Rename columns to standard names
-        df = df.rename(columns=actual_columns)
+        # Rename columns to standard names (actual_columns maps standard -> found)
+        df = df.rename(columns={found: standard for standard, found in actual_columns.items()})
 
         return df
 
@@ -154,8 +208,13 @@ class PALAPADataImporter:
                     # Return zero vector as fallback after retries
                     return [0.0] * EMBEDDING_DIMENSION
 
-    def generate_embeddings_batch(self, texts: List[str], max_workers: int = None) -> List[List[float]]:
-        """Generate embeddings for multiple texts using threads with per-item progress"""
+    def generate_embeddings_batch(self, texts: List[str], max_workers: int = None,
+                                  on_result: Optional[Callable[[int, List[float]], None]] = None) -> List[List[float]]:
+        """Generate embeddings for multiple texts using threads with per-item progress.
+
+        on_result(index, embedding), when given, is called on this thread as
+        each embedding arrives (not for failed ones).
+        """
         cpu = multiprocessing.cpu_count()
         max_workers = max_workers or min(cpu, 10)
         print(f"🤖 Generating embeddings for {len(texts)} texts using {max_workers} threads...")
@@ -172,6 +231,8 @@ class PALAPADataImporter:
                     try:
                         idx, emb = fut.result()
                         embeddings[idx] = emb
+                        if on_result is not None and any(emb):  # Zeros are generate_embedding's fallback
+                            on_result(idx, emb)
                     except Exception as e:
                         print(f"⚠️  Embedding worker failed: {e}")
                         embeddings[futures[fut]] = [0.0] * EMBEDDING_DIMENSION
@@ -210,10 +271,27 @@ class PALAPADataImporter:
             print(f"⚠️  Search failed: {e}")
             return []
 
+    def _source_id(self, row: pd.Series) -> str:
+        """Document ID of a row, the same one destination_id gives its normalized destination"""
+        return destination_id({
+            'name': str(row.get('Place_Name', '')),
+            'latitude': float(row.get('Latitude', 0)),
+            'longitude': float(row.get('Longitude', 0)),
+        })
+
+    def _source_hash(self, row: pd.Series) -> str:
+        """Content hash of the source row; Gemini output and embeddings derive from it"""
+        return content_hash({key: value for key, value in row.items() if pd.notna(value)})
+
     def normalize_destination_data(self, row: pd.Series) -> Dict[str, Any]:
         """Normalize CSV row to Firestore destination format"""
-        # Map CSV columns to Firestore schema
-        destination = {
+        destination = self._base_destination(row)
+        destination.update(self._enrich_destination(row))
+        return destination
+
+    def _base_destination(self, row: pd.Series) -> Dict[str, Any]:
+        """CSV columns mapped to the Firestore schema"""
+        return {
             'name': str(row.get('Place_Name', '')),
             'category': self._map_category(str(row.get('Category', 'alam'))),
             'latitude': float(row.get('Latitude', 0)),
@@ -232,16 +310,32 @@ class PALAPADataImporter:
             'umkmId': None,
         }
 
-        # Generate additional data using Gemini AI
-        generated_data = self._generate_destination_data_with_gemini(
+    def _enrich_destination(self, row: pd.Series) -> Dict[str, Any]:
+        """Additional fields generated with Gemini AI"""
+        return self._generate_destination_data_with_gemini(
             str(row.get('Category', '')), 
             str(row.get('Price', '')), 
             str(row.get('Place_Name', ''))
         )
 
-        # Add generated data to destination
-        destination.update(generated_data)
-
+    def _journaled_destination(self, row: pd.Series, journal: ImportJournal) -> Dict[str, Any]:
+        """normalize_destination_data, reusing and recording journaled stages"""
+        doc_id, row_hash = self._source_id(row), self._source_hash(row)
+        done = journal.completed(doc_id, row_hash)
+
+        destination = done.get('normalize')
+        if destination is None:
+            destination = self._base_destination(row)
+            journal.record(doc_id, row_hash, 'normalize', destination)
+        generated = done.get('enrich')
+        if generated is None:
+            generated = self._enrich_destination(row)
+            # Fallback defaults are not kept, so a resume asks Gemini again
+            if generated != self._default_destination_data():
+                journal.record(doc_id, row_hash, 'enrich', generated)
+
+        destination = {**destination, **generated}
+        destination[HASH_FIELD] = row_hash
         return destination
 
     def _map_category(self, category: str) -> str:
@@ -358,31 +452,7 @@ class PALAPADataImporter:
         try:
             data = json.loads(response)
             # Validate and provide defaults for missing fields
-            default_data = {
-                'facilities': {
-                    'wifi': False,
-                    'toilet': True,
-                    'parking': True,
-                    'accessibility': False,
-                    'restaurant': False,
-                    'prayer_room': False,
-                    'locker': False,
-                    'guide_service': False,
-                    'audio_guide': False,
-                    'shop': False
-                },
-                'transport_modes': ["mobil_pribadi", "taksi", "jalan_kaki"],
-                'best_visit_times': ["pagi", "siang", "sore"],
-                'ticket_pricing': {
-                    'currency': 'IDR',
-                    'adult': 20000,
-                    'child': 10000,
-                    'senior': 15000,
-                    'foreign_adult': 50000,
-                    'foreign_child': 25000,
-                    'notes': ''
-                }
-            }
+            default_data = self._default_destination_data()
 
             # Update defaults with generated data
             if 'facilities' in data:
@@ -398,65 +468,144 @@ class PALAPADataImporter:
 
         except json.JSONDecodeError:
             print(f"⚠️  Failed to parse generated data JSON for {name}, response: {response[:200]}..., using defaults")
-            return {
-                'facilities': {
-                    'wifi': False,
-                    'toilet': True,
-                    'parking': True,
-                    'accessibility': False,
-                    'restaurant': False,
-                    'prayer_room': False,
-                    'locker': False,
-                    'guide_service': False,
-                    'audio_guide': False,
-                    'shop': False
-                },
-                'transport_modes': ["mobil_pribadi", "taksi", "jalan_kaki"],
-                'best_visit_times': ["pagi", "siang", "sore"],
-                'ticket_pricing': {
-                    'currency': 'IDR',
-                    'adult': 20000,
-                    'child': 10000,
-                    'senior': 15000,
-                    'foreign_adult': 50000,
-                    'foreign_child': 25000,
-                    'notes': ''
-                }
+            return self._default_destination_data()
+
+    @staticmethod
+    def _default_destination_data() -> Dict[str, Any]:
+        """Fields used when Gemini gives no (valid) answer"""
+        return {
+            'facilities': {
+                'wifi': False,
+                'toilet': True,
+                'parking': True,
+                'accessibility': False,
+                'restaurant': False,
+                'prayer_room': False,
+                'locker': False,
+                'guide_service': False,
+                'audio_guide': False,
+                'shop': False
+            },
+            'transport_modes': ["mobil_pribadi", "taksi", "jalan_kaki"],
+            'best_visit_times': ["pagi", "siang", "sore"],
+            'ticket_pricing': {
+                'currency': 'IDR',
+                'adult': 20000,
+                'child': 10000,
+                'senior': 15000,
+                'foreign_adult': 50000,
+                'foreign_child': 25000,
+                'notes': ''
             }
+        }
 
-    def import_to_firestore(self, destinations: List[Dict[str, Any]]) -> List[str]:
-        """Import destinations to Firestore in batches"""
-        print(f"💾 Importing {len(destinations)} destinations to Firestore...")
-        # Generate embeddings for all destinations first (with per-item progress)
+    def add_embeddings(self, destinations: List[Dict[str, Any]],
+                       on_embedding: Optional[Callable[[Dict[str, Any], List[float]], None]] = None):
+        """Generate embeddings for all destinations (with per-item progress)"""
         embedding_texts = [
             f"{dest['name']} {dest['description']} {dest['category']} {dest['provinsi']}"
             for dest in destinations
         ]
 
-        embeddings = self.generate_embeddings_batch(embedding_texts)
+        on_result = None
+        if on_embedding is not None:
+            on_result = lambda i, embedding: on_embedding(destinations[i], embedding)
+        embeddings = self.generate_embeddings_batch(embedding_texts, on_result=on_result)
 
         # Add embeddings to destinations
         for dest, embedding in zip(destinations, embeddings):
             dest['embedding'] = embedding
 
-        document_ids = []
-
-        # Upload documents one-by-one so progress is visible per item
-        from time import sleep
-        for dest in tqdm(destinations, desc="Uploading to Firestore"):
-            try:
-                doc_ref = self.db.collection('destinations').document()
-                doc_ref.set(dest)
-                document_ids.append(doc_ref.id)
-            except Exception as e:
-                print(f"❌ Failed to upload document for '{dest.get('name', '')}': {e}")
-                # continue with next document
-                continue
-            # Optional slight delay to be gentle with API rate limits
-            sleep(0.01)
+    def drop_semantic_duplicates(self, destinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Remove destinations whose embedding near-duplicates an earlier nearby one"""
+        from semantic_dedupe import REPORT_FILE, build_report, cluster_pairs, drop_duplicates, find_semantic_pairs
 
-        print(f"✅ Successfully imported {len(document_ids)} destinations to Firestore")
-        return document_ids
+        print("🔍 Looking for semantic near-duplicates...")
+        pairs = find_semantic_pairs(
+            [dest['embedding'] for dest in destinations],
+            [dest['latitude'] for dest in destinations],
+            [dest['longitude'] for dest in destinations],
+        )
+        clusters = cluster_pairs(pairs, len(destinations))
+        if clusters.empty:
+            print("✅ No semantic near-duplicates found")
+            return destinations
+
+        # Keep a report of what was merged next to the FAISS index
+        report_dir = os.getenv('FAISS_INDEX_PATH', './faiss_index')
+        os.makedirs(report_dir, exist_ok=True)
+        records = [{'name': dest['name'], 'latitude': dest['latitude'], 'longitude': dest['longitude']}
+                   for dest in destinations]
+        with open(os.path.join(report_dir, REPORT_FILE), 'w', encoding='utf-8') as f:
+            json.dump(build_report(clusters, pairs, records), f, ensure_ascii=False, indent=2)
+
+        kept = drop_duplicates(destinations, clusters)
+        print(f"✅ Merged {clusters['cluster'].nunique()} semantic clusters "
+              f"({len(destinations) - len(kept)} destinations dropped, report in {report_dir}/{REPORT_FILE})")
+        return kept
+
+    def import_to_firestore(self, destinations: List[Dict[str, Any]],
+                            collection: str = 'destinations') -> List[Optional[str]]:
+        """Import destinations (with embeddings already added) to Firestore.
+
+        Writes go through a BulkWriter: batches are committed in parallel on
+        its thread pool, throttled by the 500/50/5 ramp-up, and contention or
+        quota errors are retried with exponential backoff. Document IDs are
+        deterministic (doc_ids.py), so a rerun upserts the same documents.
+        Embeddings go to destination_embeddings (of the same generation)
+        under the same ID, in self.embedding_encoding (embedding_store.py,
+        embedding_codec.py). Returns the document ID for each destination, None where the write
+        failed.
+        """
+        print(f"💾 Importing {len(destinations)} destinations to Firestore ({collection})...")
+        catalog = self.db.collection(collection)
+        refs = [catalog.document(destination_id(dest)) for dest in destinations]
+        # (destination index, ref, data); a destination fails if either its document or its embedding does
+        writes = []
+        for i, (ref, dest) in enumerate(zip(refs, destinations)):
+            catalog, embedding = split_embedding(dest, self.embedding_encoding)
+            writes.append((i, ref, catalog))
+            if embedding is not None:
+                writes.append((i, embedding_ref(self.db, collection, ref.id), embedding))
+        position = {ref.path: i for i, ref, _ in writes}
+        failures: Dict[int, str] = {}
+        lock = threading.Lock()
+        progress = tqdm(total=len(writes), desc="Uploading to Firestore")
+
+        def on_success(reference, result, bulk_writer):
+            with lock:
+                progress.update(1)
+
+        def on_error(failure, bulk_writer) -> bool:
+            if failure.code in RETRYABLE_CODES and failure.attempts < BULK_MAX_ATTEMPTS:
+                return True  # Retried after a backoff
+            with lock:
+                failures[position[failure.operation.reference.path]] = failure.message
+                progress.update(1)
+            return False
+
+        writer = self.db.bulk_writer(BulkWriterOptions(
+            initial_ops_per_second=BULK_INITIAL_OPS_PER_SECOND,
+            max_ops_per_second=BULK_MAX_OPS_PER_SECOND,
+            mode=SendMode.parallel,
+            retry=BulkRetry.exponential,
+        ))
+        writer.on_write_result(on_success)
+        writer.on_write_error(on_error)
+
+        start = time.perf_counter()
+        for _, ref, data in writes:
+            writer.set(ref, data)
+        writer.close()  # Flushes and waits for every write, retries included
+        elapsed = time.perf_counter() - start
+        progress.close()
+
+        for i, message in sorted(failures.items())[:10]:
+            print(f"❌ Failed to upload document for '{destinations[i].get('name', '')}': {message}")
+        written = len(destinations) - len(failures)
+        print(f"✅ Successfully imported {written} destinations to Firestore "
+              f"in {elapsed:.1f}s ({written / max(elapsed, 1e-9):.0f} docs/s, {len(failures)} failed)")
+        return [None if i in failures else ref.id for i, ref in enumerate(refs)]
 
     def build_faiss_index(self, destinations: List[Dict[str, Any]], document_ids: List[str]):
         """Build FAISS index from destination embeddings"""
@@ -466,15 +615,11 @@ class PALAPADataImporter:
         self.index_mapping = []
 
         for dest, doc_id in zip(destinations, document_ids):
+            if doc_id is None:
+                continue  # Upload failed, keep the index in sync with Firestore
             if 'embedding' in dest and dest['embedding']:
                 embeddings.append(dest['embedding'])
-                self.index_mapping.append({
-                    'id': doc_id,
-                    'name': dest['name'],
-                    'category': dest['category'],
-                    'provinsi': dest['provinsi'],
-                    'isCultural': dest['isCultural']
-                })
+                self.index_mapping.append({'id': doc_id, **{field: dest[field] for field in MAPPING_FIELDS}})
 
         if not embeddings:
             raise ValueError("No embeddings found to build FAISS index")
@@ -490,6 +635,47 @@ class PALAPADataImporter:
 
         print(f"✅ FAISS index built with {len(embeddings)} vectors")
 
+    def update_hash_index(self, destinations: List[Dict[str, Any]], document_ids: List[Optional[str]],
+                          collection: str = 'destinations'):
+        """Record written content hashes in the collection's sync index"""
+        hashes, _ = load_hash_index(self.db, collection)
+        hashes = hashes or {}  # A new generation starts its index with the documents written to it
+        for dest, doc_id in zip(destinations, document_ids):
+            if doc_id is not None:
+                hashes[doc_id] = dest[HASH_FIELD]
+        save_hash_index(self.db, collection, hashes)
+
+    def rebuild_faiss_index(self, destinations: List[Dict[str, Any]], document_ids: List[Optional[str]],
+                            keep_ids: List[str], index_path: str, collection: str = 'destinations'):
+        """FAISS index of the written destinations plus the kept ones.
+
+        Kept vectors come from the saved index; those it lacks are read from
+        Firestore (mapping fields plus the destination_embeddings document).
+        """
+        previous = {}
+        if os.path.exists(os.path.join(index_path, 'faiss_index.idx')):
+            from semantic_dedupe import load_index
+            vectors, mapping = load_index(index_path)
+            previous = {
+                entry['id']: {**entry, 'embedding': vector.tolist()}
+                for entry, vector in zip(mapping, vectors)
+                if all(field in entry for field in MAPPING_FIELDS)
+            }
+
+        kept = [previous[doc_id] for doc_id in keep_ids if doc_id in previous]
+        missing = [doc_id for doc_id in keep_ids if doc_id not in previous]
+        if missing:
+            print(f"📥 Reading {len(missing)} embeddings missing from the saved index...")
+            catalog = self.db.collection(collection)
+            refs = [catalog.document(doc_id) for doc_id in missing]
+            embeddings = load_embeddings(self.db, collection, missing)
+            for snapshot in self.db.get_all(refs, field_paths=MAPPING_FIELDS):
+                data = snapshot.to_dict() if snapshot.exists else None
+                if snapshot.id in embeddings and data and all(field in data for field in MAPPING_FIELDS):
+                    kept.append({**data, 'id': snapshot.id, 'embedding': embeddings[snapshot.id].tolist()})
+
+        self.build_faiss_index(kept + destinations, [dest['id'] for dest in kept] + document_ids)
+
     def save_faiss_index(self, index_path: str):
         """Save FAISS index and mapping to disk"""
         print(f"💾 Saving FAISS index to {index_path}...")
@@ -527,41 +713,119 @@ class PALAPADataImporter:
 
         return results
 
-    def run_import(self, csv_path: str):
-        """Run the complete import process"""
+    def run_import(self, csv_path: Optional[str], resume: bool = False):
+        """Run the complete import process (csv_path None merges the sources in-process).
+
+        Every completed stage of a row is journaled (import_journal.py);
+        resume=True skips what the journal of an interrupted run holds.
+        Documents and the FAISS index go to a new catalog generation, which
+        is activated once complete; older generations are then deleted
+        (catalog_generations.py).
+        """
+        faiss_index_path = os.getenv('FAISS_INDEX_PATH', './faiss_index')
+        journal = ImportJournal(os.path.join(faiss_index_path, JOURNAL_FILE), resume=resume)
         try:
             print("🚀 Starting PALAPA Data Import Process...")
             print("=" * 50)
-
-            # Load CSV data
-            df = self.load_csv_data(csv_path)
+            if resume:
+                print(f"📒 Resuming from {journal.path} ({journal.summary()})")
+
+            # Load CSV data (before the journal is touched, so a bad path costs no journal)
+            df = self.load_csv_data(csv_path) if csv_path else self.load_merged_data()
+
+            # A resume continues the generation the journal was writing; journaled
+            # writes of a journal without one went to another collection
+            generation = journal.meta.get('generation')
+            if generation is not None and (journal.meta.get('activated') == generation
+                                           or read_pointer(self.db, 'destinations').generation == generation):
+                # Writing into the live generation would serve a half-imported catalog;
+                # journaled Gemini outputs and embeddings are still reused
+                print(f"📒 Journaled generation {generation} is already active, writing a new one")
+                generation = None
+            reuse_writes = generation is not None
+            if generation is None:
+                generation = new_generation()
+                journal.annotate(generation=generation)
+            collection = generation_collection('destinations', generation)
+            print(f"🧬 Writing catalog generation {generation} ({collection})")
 
             # Convert to destination format
             print("🔄 Normalizing destination data...")
             destinations = []
             for _, row in tqdm(df.iterrows(), total=len(df), desc="Processing"):
                 try:
-                    dest = self.normalize_destination_data(row)
-                    destinations.append(dest)
+                    destinations.append(self._journaled_destination(row, journal))
                 except Exception as e:
                     print(f"⚠️  Failed to process row: {e}")
                     continue
 
             print(f"✅ Processed {len(destinations)} destinations")
 
-            # Import to Firestore
-            document_ids = self.import_to_firestore(destinations)
+            # Deterministic document IDs: a rerun overwrites instead of duplicating
+            pairs, dropped = unique_by_id(destinations, destination_id)
+            if dropped:
+                print(f"⚠️  Dropped {dropped} rows with the same name and coordinates as an earlier row")
+            # Geohash cells for proximity queries, search tokens for name lookups
+            destinations = add_search_fields(add_geo_fields([dest for _, dest in pairs]))
+
+            # Generate embeddings (journaled ones are reused), then optionally drop semantic near-duplicates
+            missing = []
+            for dest in destinations:
+                embedding = journal.embedding(destination_id(dest), dest[HASH_FIELD])
+                if embedding is None:
+                    missing.append(dest)
+                else:
+                    dest['embedding'] = embedding
+            if len(missing) < len(destinations):
+                print(f"📒 Reusing {len(destinations) - len(missing)} journaled embeddings")
+            if missing:
+                self.add_embeddings(missing, on_embedding=lambda dest, embedding: journal.record_embedding(
+                    destination_id(dest), dest[HASH_FIELD], embedding))
+            if self.semantic_dedupe:
+                destinations = self.drop_semantic_duplicates(destinations)
+
+            # Import to Firestore in chunks, journaling each committed chunk
+            document_ids = [journal.completed(destination_id(dest), dest[HASH_FIELD]).get('write', {}).get('id')
+                            if reuse_writes else None for dest in destinations]
+            pending = [i for i, doc_id in enumerate(document_ids) if doc_id is None]
+            if len(pending) < len(destinations):
+                print(f"📒 Skipping {len(destinations) - len(pending)} destinations already written")
+            for start in range(0, len(pending), WRITE_CHUNK_SIZE):
+                chunk = pending[start:start + WRITE_CHUNK_SIZE]
+                for i, doc_id in zip(chunk, self.import_to_firestore([destinations[i] for i in chunk], collection)):
+                    document_ids[i] = doc_id
+                    row_hash = destinations[i][HASH_FIELD]
+                    # Only a document built from journaled outputs counts as written; one carrying
+                    # fallback defaults or a zero embedding is rewritten once a resume regenerates them
+                    if doc_id is not None and {'enrich', 'embed'} <= set(journal.completed(doc_id, row_hash)):
+                        journal.record(doc_id, row_hash, 'write', {'id': doc_id})
+            self.update_hash_index(destinations, document_ids, collection)
+            failed = sum(doc_id is None for doc_id in document_ids)
+            if failed:
+                raise RuntimeError(f"{failed} destinations failed to upload, generation {generation} not activated")
+
+            write_stats(self.db, collection, compute_stats(destinations))
 
             # Build FAISS index
             self.build_faiss_index(destinations, document_ids)
 
             # Save FAISS index
-            faiss_index_path = os.getenv('FAISS_INDEX_PATH', './faiss_index')
-            self.save_faiss_index(faiss_index_path)
+            self.save_faiss_index(generation_index_path(faiss_index_path, generation))
+
+            # Switch readers to the new generation, then drop the old ones
+            pointer = activate(self.db, 'destinations', generation, documents=len(destinations))
+            journal.annotate(activated=generation)
+            print(f"🔀 Activated generation {generation} (previous: {pointer.previous or 'destinations'})")
+            try:
+                deleted = garbage_collect(self.db, 'destinations', index_root=faiss_index_path)
+                if deleted:
+                    print(f"🗑️  Deleted {sum(deleted.values())} documents of {len(deleted)} old generation collections")
+            except Exception as e:
+                print(f"⚠️  Old generations not cleaned up ({e}), run manage-generations.py gc later")
 
             print("\n" + "=" * 50)
             print("🎉 PALAPA Data Import Completed Successfully!")
-            print(f"📊 Imported {len(document_ids)} destinations")
+            print(f"📊 Imported {len(destinations)} destinations")
             print(f"🔍 FAISS index ready with {len(self.index_mapping)} searchable items")
 
             # Test search
@@ -573,11 +837,119 @@ class PALAPADataImporter:
 
         except Exception as e:
             print(f"❌ Import failed: {e}")
+            print(f"📒 Completed work is journaled in {journal.path}, rerun with --resume to continue")
+            sys.exit(1)
+        finally:
+            journal.close()
+
+    def run_sync(self, csv_path: Optional[str], verify: bool = False):
+        """Write only destinations whose source row changed since the last import or sync.
+
+        Unchanged rows cost no Gemini call, no embedding and no write; rows
+        gone from the dataset are deleted. See firestore_sync.py. The active
+        catalog generation and its FAISS index are updated in place.
+        """
+        try:
+            print("🔄 Starting PALAPA Data Sync...")
+            print("=" * 50)
+            faiss_index_path = os.getenv('FAISS_INDEX_PATH', './faiss_index')
+            collection = active_collection(self.db, 'destinations')
+            index_path = active_index_path(self.db, 'destinations', faiss_index_path)
+            print(f"🧬 Syncing {collection}")
+
+            df = self.load_csv_data(csv_path) if csv_path else self.load_merged_data()
+            rows, local = {}, {}
+            for _, row in df.iterrows():
+                doc_id = self._source_id(row)
+                if doc_id not in rows:  # Later rows with the same name and coordinates are dropped
+                    rows[doc_id] = row
+                    local[doc_id] = self._source_hash(row)
+
+            remote, remote_source = load_remote_hashes(self.db, collection, verify)
+            plan = plan_sync(remote, local)
+            print(f"📋 Compared with {len(remote)} remote hashes ({remote_source}): {plan.summary()}")
+
+            destinations = []
+            for doc_id in tqdm(plan.changed, desc="Processing changed rows"):
+                try:
+                    dest = self.normalize_destination_data(rows[doc_id])
+                    dest[HASH_FIELD] = local[doc_id]
+                    destinations.append(dest)
+                except Exception as e:
+                    print(f"⚠️  Failed to process row: {e}")
+            add_search_fields(add_geo_fields(destinations))
+
+            document_ids = []
+            if destinations:
+                self.add_embeddings(destinations)
+                document_ids = self.import_to_firestore(destinations, collection)
+            written = {doc_id for doc_id in document_ids if doc_id is not None}
+
+            failed_deletes = set()
+            if plan.deletes:
+                print(f"🗑️  Deleting {len(plan.deletes)} destinations no longer in the dataset...")
+                report = delete_documents(self.db, collection, plan.deletes)
+                delete_embeddings(self.db, collection, plan.deletes)
+                failed_deletes = {plan.deletes[i] for i in report.failed}
+
+            # Index the hashes Firestore now holds
+            deleted = set(plan.deletes) - failed_deletes
+            synced = {doc_id: digest for doc_id, digest in remote.items() if doc_id not in deleted}
+            synced.update((doc_id, local[doc_id]) for doc_id in written)
+            index_report = save_hash_index(self.db, collection, synced)
+            if written or deleted:
+                # Catalog fields of every synced row; none of them needs Gemini
+                previous = load_stats(self.db, collection) or {}
+                stats = compute_stats(add_search_fields(add_geo_fields(
+                    [self._base_destination(rows[doc_id]) for doc_id in synced if doc_id in rows])))
+                for flag in ('geoIndexed', 'searchIndexed'):
+                    if not previous.get(flag):
+                        stats[flag] = False  # Unchanged documents may predate the derived fields
+                write_stats(self.db, collection, stats)
+
+            if written or deleted or remote_source == 'projection':
+                keep_ids = [doc_id for doc_id in synced if doc_id not in written]
+                self.rebuild_faiss_index(destinations, document_ids, keep_ids, index_path, collection)
+                self.save_faiss_index(index_path)
+            else:
+                print("✅ Nothing changed, FAISS index left as is")
+
+            failed = [doc_id for doc_id in plan.changed if doc_id not in written] + sorted(failed_deletes)
+            names = {doc_id: str(row.get('Place_Name', '')) for doc_id, row in rows.items()}
+            report = build_report(collection, plan, remote_source, names, failed, index_report.written)
+            os.makedirs(faiss_index_path, exist_ok=True)
+            report_path = os.path.join(faiss_index_path, SYNC_REPORT_FILE)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+            counts = report['counts']
+            print("\n" + "=" * 50)
+            print("🎉 PALAPA Data Sync Completed!")
+            print(f"📊 {counts['inserted']} inserted, {counts['updated']} updated, {counts['deleted']} deleted, "
+                  f"{counts['unchanged']} unchanged, {counts['failed']} failed")
+            print(f"✍️  {counts['documentWrites']} document writes + {counts['indexWrites']} index writes")
+            print(f"💾 Change report saved to {report_path}")
+
+        except Exception as e:
+            print(f"❌ Sync failed: {e}")
             sys.exit(1)
 
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='Import destinations into Firestore and the FAISS index')
+    parser.add_argument('csv_path', nargs='?', default='./dataset-wisata/wisata_indonesia_merged_clean.csv',
+                        help='destinations CSV (default: %(default)s)')
+    parser.add_argument('--merge', action='store_true',
+                        help='run dataset-wisata/merge_datasets.py in-process instead of reading a CSV')
+    parser.add_argument('--semantic-dedupe', action='store_true', help='drop embedding near-duplicates before upload')
+    parser.add_argument('--resume', action='store_true', help='continue a crashed import from its journal')
+    parser.add_argument('--sync', action='store_true', help='write only rows that changed since the last import')
+    parser.add_argument('--verify', action='store_true', help='with --sync, diff against the documents')
+    parser.add_argument('--embedding-encoding', choices=ENCODINGS,
+                        help=f'embedding storage (default: EMBEDDING_ENCODING or {DEFAULT_ENCODING})')
+    args = parser.parse_args()
+
     # Load environment variables first
     load_dotenv('.env.local')
 
@@ -590,12 +962,23 @@ def main():
         print("Please set them in .env.local file")
         sys.exit(1)
 
-    # Get CSV path from command line or use default
-    csv_path = sys.argv[1] if len(sys.argv) > 1 else './dataset-wisata/wisata_indonesia_merged_clean.csv'
+    encoding = args.embedding_encoding or os.getenv('EMBEDDING_ENCODING', DEFAULT_ENCODING)
+    if encoding not in ENCODINGS:
+        print(f"❌ Unknown embedding encoding '{encoding}', expected one of: {', '.join(ENCODINGS)}")
+        sys.exit(1)
+    csv_path = None if args.merge else args.csv_path
 
     # Run import
-    importer = PALAPADataImporter()
-    importer.run_import(csv_path)
+    if args.sync:
+        if args.semantic_dedupe:
+            print("⚠️  --semantic-dedupe needs every embedding and is ignored with --sync")
+        if args.resume:
+            print("⚠️  --resume applies to full imports; --sync already skips unchanged rows")
+        PALAPADataImporter(embedding_encoding=encoding).run_sync(csv_path, verify=args.verify)
+        return
+
+    importer = PALAPADataImporter(semantic_dedupe=args.semantic_dedupe, embedding_encoding=encoding)
+    importer.run_import(csv_path, resume=args.resume)
 
 
 if __name__ == '__main__':
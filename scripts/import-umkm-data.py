@@ -2,17 +2,30 @@
 """
 Import UMKM Data to Firestore
 Import the 30 UMKM entries to Firestore with embeddings
+
+Embeddings go to umkm_embeddings under the same document ID (see
+embedding_store.py), stored as EMBEDDING_ENCODING from .env.local (array,
+float32, float16 or vector; float32 by default), see embedding_codec.py.
 """
 
 import os
 import sys
 import json
+import numpy as np
 from dotenv import load_dotenv
 from firebase_admin import initialize_app, firestore, credentials
 from google import genai
 from google.genai import types
 from typing import List, Dict, Any
 
+from catalog_stats import collection_stats, write_stats
+from collection_checks import count, embedding_count, inline_embedding_count, run_checks
+from doc_ids import umkm_id
+from embedding_codec import DEFAULT_ENCODING
+from embedding_store import embedding_ref, load_embedding, split_embedding
+from geo_cells import add_geo_fields
+from search_tokens import add_search_fields
+
 # Constants
 EMBEDDING_MODEL = "gemini-embedding-001"
 EMBEDDING_DIMENSION = 768
@@ -24,6 +37,7 @@ class UMKMImporter:
 
         self.db = None
         self.genai_client = None
+        self.embedding_encoding = os.getenv('EMBEDDING_ENCODING', DEFAULT_ENCODING)
 
         self._initialize_firebase()
         self._initialize_genai()
@@ -102,6 +116,8 @@ class UMKMImporter:
 
         total_imported = 0
         total_batches = (len(umkm_data) + batch_size - 1) // batch_size
+        add_geo_fields(umkm_data)  # Geohash cells for proximity queries, all records at once
+        add_search_fields(umkm_data)  # Tokens for name lookups
 
         for batch_idx in range(total_batches):
             start_idx = batch_idx * batch_size
@@ -120,9 +136,12 @@ class UMKMImporter:
                 # Prepare document data
                 doc_data = self.prepare_umkm_for_firestore(umkm)
 
-                # Create document reference
-                doc_ref = self.db.collection('umkm').document()
-                firestore_batch.set(doc_ref, doc_data)
+                # Deterministic ID: a rerun overwrites instead of duplicating
+                doc_ref = self.db.collection('umkm').document(umkm_id(umkm))
+                catalog, embedding = split_embedding(doc_data, self.embedding_encoding)
+                firestore_batch.set(doc_ref, catalog)
+                if embedding is not None:
+                    firestore_batch.set(embedding_ref(self.db, 'umkm', doc_ref.id), embedding)
                 batch_docs.append((doc_ref.id, umkm['name']))
 
             # Commit batch
@@ -139,22 +158,39 @@ class UMKMImporter:
                 print(f"   ❌ Batch {batch_idx + 1} failed: {e}")
                 continue
 
+        # Summary the app checks before using geohash cell and token queries
+        write_stats(self.db, 'umkm', collection_stats(self.db, 'umkm'))
         return total_imported
 
     def verify_import(self):
         """Verify the imported UMKM data"""
         print("\n🔍 Verifying UMKM import...")
 
-        # Count total documents
-        docs = list(self.db.collection('umkm').stream())
-        print(f"✅ Found {len(docs)} UMKM documents in Firestore")
+        # Counted by the server, with one sample document
+        umkm_ref = self.db.collection('umkm')
+        results = run_checks({
+            'count': lambda: count(umkm_ref),
+            'embeddings': lambda: embedding_count(self.db, 'umkm'),
+            'inline': lambda: inline_embedding_count(self.db, 'umkm'),
+            'sample': lambda: umkm_ref.limit(1).get(),
+        })
+        errors = {name: result.error for name, result in results.items() if result.error}
+        if errors:
+            for name, error in errors.items():
+                print(f"❌ {name} check failed: {error}")
+            return False
+
+        total = results['count'].value
+        print(f"✅ Found {total} UMKM documents in Firestore ({results['embeddings'].value} with embeddings)")
+        if results['inline'].value:
+            print(f"   {results['inline'].value} still carry a legacy inline embedding (run scripts/migrate-embeddings.py)")
 
-        if len(docs) == 0:
+        if total == 0:
             print("❌ No UMKM documents found!")
             return False
 
         # Sample check
-        sample_doc = docs[0]
+        sample_doc = results['sample'].value[0]
         sample_data = sample_doc.to_dict()
 
         print(f"\n📄 Sample UMKM document:")
@@ -162,14 +198,14 @@ class UMKMImporter:
         print(f"   Name: {sample_data.get('name', 'N/A')}")
         print(f"   Category: {sample_data.get('category', 'N/A')}")
         print(f"   Type: {sample_data.get('type', 'N/A')}")
-        print(f"   Has embedding: {'embedding' in sample_data}")
-        if 'embedding' in sample_data:
-            embedding = sample_data['embedding']
+        embedding = load_embedding(self.db, 'umkm', sample_doc.id, sample_data)
+        print(f"   Has embedding: {embedding is not None}")
+        if embedding is not None:
             print(f"   Embedding size: {len(embedding)}")
-            non_zero = sum(1 for x in embedding if x != 0.0)
+            non_zero = int(np.count_nonzero(embedding))
             print(f"   Non-zero values: {non_zero}/{len(embedding)} ({non_zero/len(embedding)*100:.1f}%)")
 
-        return len(docs) > 0
+        return total > 0
 
 def main():
     """Main entry point"""
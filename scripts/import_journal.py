@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checkpoint journal for import-data.py
+
+A full import spends hours on Gemini calls, and a crash (quota, network)
+used to throw all of it away. The importer appends one JSON line per
+completed stage of a row to a local journal:
+
+    normalize  the CSV fields mapped to the destination schema
+    enrich     the Gemini-generated fields
+    embed      the embedding (float32, base64)
+    write      the Firestore document ID once the upload committed
+
+Lines are keyed by the row's document ID and content hash, so an edited
+row starts over while unchanged rows keep their outputs. `--resume`
+loads the journal and skips every stage it already holds; a torn last
+line (crash mid-write) is ignored. Without `--resume` a new journal is
+started, but only on the first record of a run that got that far: the
+previous journal is then kept as import_journal.jsonl.prev, so a run
+started without `--resume` by mistake loses nothing (rename it back).
+Run-level values (the catalog generation being written, and whether it
+was activated) are kept in `meta` and survive a resume as well.
+
+Usage:
+    from import_journal import JOURNAL_FILE, ImportJournal
+
+    journal = ImportJournal(os.path.join(index_path, JOURNAL_FILE), resume=True)
+    done = journal.completed(doc_id, row_hash)   # {'normalize': {...}, 'embed': [...], ...}
+    journal.record(doc_id, row_hash, 'write', {'id': doc_id})
+"""
+
+import base64
+import json
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+JOURNAL_FILE = 'import_journal.jsonl'
+PREVIOUS_SUFFIX = '.prev'  # The journal a fresh run replaced
+STAGES = ('normalize', 'enrich', 'embed', 'write')
+
+
+class ImportJournal:
+    def __init__(self, path: str, resume: bool = False):
+        self.path = path
+        self._entries: Dict[str, Dict[str, Any]] = {}  # doc_id -> {'hash': ..., stage: data}
+        self._lock = threading.Lock()
+        self.torn_lines = 0
+        self.meta: Dict[str, Any] = {}
+        self._resume = resume
+        self._file = None  # Opened on the first record, see _open
+
+        if resume and os.path.exists(path):
+            self._load()
+
+    def _open(self):
+        path = self.path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if self._resume:
+            torn = os.path.exists(path) and os.path.getsize(path) > 0 and not self._ends_with_newline()
+            self._file = open(path, 'a', encoding='utf-8')
+            if torn:
+                self._file.write('\n')  # Keep the next entry off the torn line
+        else:
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                os.replace(path, path + PREVIOUS_SUFFIX)
+            self._file = open(path, 'w', encoding='utf-8')
+        if not self._resume or not self._entries:
+            self._file.write(json.dumps({'journal': 1, 'started': datetime.now(timezone.utc).isoformat(
+                timespec='seconds')}) + '\n')
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    self.torn_lines += 1
+                    continue
+                if 'stage' in entry:
+                    self._apply(entry)
+                elif 'meta' in entry:
+                    self.meta.update(entry['meta'])
+
+    def _apply(self, entry: Dict[str, Any]):
+        current = self._entries.get(entry['id'])
+        if current is None or current['hash'] != entry['hash']:
+            current = self._entries[entry['id']] = {'hash': entry['hash']}
+        current[entry['stage']] = entry.get('data')
+
+    def _append(self, entry: Dict[str, Any]):
+        if self._file is None:
+            self._open()
+        self._file.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':'), default=str) + '\n')
+        self._file.flush()
+
+    def completed(self, doc_id: str, row_hash: str) -> Dict[str, Any]:
+        """Stages already done for this row, {} if none or the row changed since"""
+        entry = self._entries.get(doc_id)
+        if entry is None or entry['hash'] != row_hash:
+            return {}
+        return {stage: data for stage, data in entry.items() if stage != 'hash'}
+
+    def record(self, doc_id: str, row_hash: str, stage: str, data: Any = None):
+        if stage not in STAGES:
+            raise ValueError(f"Unknown journal stage '{stage}'")
+        entry = {'id': doc_id, 'hash': row_hash, 'stage': stage, 'data': data}
+        with self._lock:
+            self._append(entry)
+            self._apply(entry)
+
+    def annotate(self, **meta: Any):
+        """Record run-level values, e.g. annotate(generation='g2026...')"""
+        with self._lock:
+            self._append({'meta': meta})
+            self.meta.update(meta)
+
+    def record_embedding(self, doc_id: str, row_hash: str, values: List[float]):
+        encoded = base64.b64encode(np.asarray(values, dtype='<f4').tobytes()).decode('ascii')
+        self.record(doc_id, row_hash, 'embed', encoded)
+
+    def embedding(self, doc_id: str, row_hash: str) -> Optional[List[float]]:
+        encoded = self.completed(doc_id, row_hash).get('embed')
+        if encoded is None:
+            return None
+        return np.frombuffer(base64.b64decode(encoded), dtype='<f4').tolist()
+
+    def summary(self) -> str:
+        counts = Counter(stage for entry in self._entries.values() for stage in entry if stage != 'hash')
+        return ', '.join(f"{stage} {counts[stage]}" for stage in STAGES)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
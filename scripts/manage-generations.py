@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Manage catalog generations
+
+Lists the destination generations written by import-data.py, switches the
+app between them and deletes old ones (see catalog_generations.py).
+Switching is a single write to _catalog/destinations, so a rollback is
+instant as long as the generation has not been collected.
+
+Usage:
+    uv run python scripts/manage-generations.py list
+    uv run python scripts/manage-generations.py rollback             # back to the previous generation
+    uv run python scripts/manage-generations.py activate g20261018T222249
+    uv run python scripts/manage-generations.py gc --keep 2 --dry-run
+    uv run python scripts/manage-generations.py gc --include-base    # also the pre-generation collection
+"""
+
+import argparse
+import os
+import sys
+import time
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore, initialize_app
+
+from catalog_generations import (DEFAULT_KEEP, activate, garbage_collect, generation_collection,
+                                 generation_index_path, list_generations, read_pointer)
+
+BASE = 'destinations'
+
+
+def show(db, index_root: str):
+    pointer = read_pointer(db, BASE)
+    generations = list_generations(db, BASE)
+    print(f"📚 {len(generations)} generations of {BASE}")
+    for generation in generations:
+        marker = '▶' if generation == pointer.generation else ('↩' if generation == pointer.previous else ' ')
+        index = 'index' if os.path.isdir(generation_index_path(index_root, generation)) else 'no index'
+        print(f"  {marker} {generation}  {generation_collection(BASE, generation)}  ({index})")
+    if pointer.generation is None:
+        print(f"  ▶ no generation active, serving {BASE}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List, switch and garbage-collect catalog generations')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='show generations and the active one')
+    commands.add_parser('rollback', help='activate the previous generation')
+    activate_parser = commands.add_parser('activate', help='activate a generation')
+    activate_parser.add_argument('generation', help="generation ID, or 'none' for the base collection")
+    gc_parser = commands.add_parser('gc', help='delete old generations')
+    gc_parser.add_argument('--keep', type=int, default=DEFAULT_KEEP, help='generations kept up to the active one')
+    gc_parser.add_argument('--include-base', action='store_true', help=f'also delete the plain {BASE} collection')
+    gc_parser.add_argument('--dry-run', action='store_true', help='only list what would be deleted')
+    args = parser.parse_args()
+
+    load_dotenv('.env.local')
+    service_account_path = os.path.join(os.getcwd(), 'serviceAccountKey.json')
+    initialize_app(credentials.Certificate(service_account_path))
+    db = firestore.client()
+    index_root = os.getenv('FAISS_INDEX_PATH', './faiss_index')
+
+    if args.command == 'list':
+        show(db, index_root)
+        return
+
+    if args.command in ('activate', 'rollback'):
+        if args.command == 'rollback':
+            target = read_pointer(db, BASE).previous
+        else:
+            target = None if args.generation == 'none' else args.generation
+        if target is not None and target not in list_generations(db, BASE):
+            print(f"❌ Generation {target} not found")
+            sys.exit(1)
+        if target is not None and not os.path.isdir(generation_index_path(index_root, target)):
+            print(f"⚠️  No FAISS index for {target} under {index_root}, search keeps the root index")
+        pointer = activate(db, BASE, target)
+        print(f"🔀 Serving {pointer.collection} (previous: {pointer.previous or BASE})")
+        return
+
+    start = time.perf_counter()
+    deleted = garbage_collect(db, BASE, keep=args.keep, index_root=index_root,
+                              include_base=args.include_base, dry_run=args.dry_run)
+    if not deleted:
+        print("✅ Nothing to collect")
+        return
+    for collection, count in deleted.items():
+        print(f"  🗑️  {collection}" + ('' if args.dry_run else f": {count} documents"))
+    if not args.dry_run:
+        print(f"✅ Deleted {sum(deleted.values())} documents in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
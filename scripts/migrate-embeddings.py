@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Migrate inline embeddings to their side collections
+
+Moves the `embedding` field of existing destinations and UMKM documents
+into destination_embeddings / umkm_embeddings (see embedding_store.py),
+re-encoded on the way (float32 bytes by default). Collections are read a
+page at a time; per page the side documents are written first and the
+inline fields are only removed from documents whose copy was committed,
+so an interrupted run loses nothing and a rerun picks up where it stopped.
+
+Usage:
+    uv run python scripts/migrate-embeddings.py --dry-run
+    uv run python scripts/migrate-embeddings.py
+    uv run python scripts/migrate-embeddings.py --collection umkm --encoding float16
+    uv run python scripts/migrate-embeddings.py --keep-inline   # copy only
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore, initialize_app
+
+from embedding_codec import DEFAULT_ENCODING, EMBEDDING_FIELD, ENCODING_FIELD, ENCODINGS, document_embedding, encode_embedding
+from embedding_store import EMBEDDING_COLLECTIONS, embedding_ref
+from firestore_batches import commit_batches, estimate_size
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+def migrate_collection(db, collection: str, encoding: str, keep_inline: bool = False,
+                       dry_run: bool = False, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """Move one collection's inline embeddings; returns counts and bytes"""
+    stats = {'documents': 0, 'inline': 0, 'copied': 0, 'stripped': 0, 'failed': 0,
+             'inlineBytes': 0, 'sideBytes': 0}
+    query = db.collection(collection).select([EMBEDDING_FIELD, ENCODING_FIELD]).order_by('__name__').limit(page_size)
+    last = None
+
+    while True:
+        page = list((query.start_after(last) if last is not None else query).stream())
+        if not page:
+            break
+        last = page[-1]
+        stats['documents'] += len(page)
+
+        moves = []  # (doc_id, side document)
+        for snapshot in page:
+            data = snapshot.to_dict() or {}
+            if EMBEDDING_FIELD not in data:
+                continue  # Already migrated
+            embedding = document_embedding(data)
+            stats['inline'] += 1
+            stats['inlineBytes'] += estimate_size({key: data[key] for key in (EMBEDDING_FIELD, ENCODING_FIELD) if key in data})
+            side = encode_embedding(embedding, encoding) if embedding is not None else None
+            if side is not None:
+                stats['sideBytes'] += estimate_size(side)
+            moves.append((snapshot.id, side))
+        if dry_run or not moves:
+            continue
+
+        # Copy first; empty embeddings have nothing to copy and are only stripped
+        copies = [(doc_id, side) for doc_id, side in moves if side is not None]
+        report = commit_batches(db, [(embedding_ref(db, collection, doc_id), side) for doc_id, side in copies])
+        failed = {copies[i][0] for i in report.failed}
+        stats['copied'] += report.written
+        stats['failed'] += len(failed)
+        for error in report.errors[:3]:
+            print(f"   ⚠️  {error}")
+        if keep_inline:
+            continue
+
+        strip = {EMBEDDING_FIELD: firestore.DELETE_FIELD, ENCODING_FIELD: firestore.DELETE_FIELD}
+        catalog = db.collection(collection)
+        report = commit_batches(db, [(catalog.document(doc_id), strip) for doc_id, _ in moves if doc_id not in failed],
+                                merge=True)
+        stats['stripped'] += report.written
+        stats['failed'] += len(report.failed)
+        for error in report.errors[:3]:
+            print(f"   ⚠️  {error}")
+        print(f"   {stats['documents']} documents read, {stats['copied']} embeddings moved")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move inline embeddings into their side collections')
+    parser.add_argument('--collection', choices=sorted(EMBEDDING_COLLECTIONS), action='append',
+                        help='collection to migrate (repeatable, default: all)')
+    parser.add_argument('--encoding', choices=ENCODINGS, default=os.getenv('EMBEDDING_ENCODING', DEFAULT_ENCODING))
+    parser.add_argument('--keep-inline', action='store_true', help='copy without removing the inline field')
+    parser.add_argument('--dry-run', action='store_true', help='only count what would be moved')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args()
+
+    load_dotenv('.env.local')
+    service_account_path = os.path.join(os.getcwd(), 'serviceAccountKey.json')
+    initialize_app(credentials.Certificate(service_account_path))
+    db = firestore.client()
+
+    failed = 0
+    for collection in args.collection or sorted(EMBEDDING_COLLECTIONS):
+        target = EMBEDDING_COLLECTIONS[collection]
+        print(f"🚚 {'Checking' if args.dry_run else 'Migrating'} {collection} -> {target} ({args.encoding})...")
+        start = time.perf_counter()
+        stats = migrate_collection(db, collection, args.encoding, args.keep_inline, args.dry_run, args.page_size)
+        elapsed = time.perf_counter() - start
+        failed += stats['failed']
+
+        print(f"✅ {collection}: {stats['documents']} documents, {stats['inline']} with an inline embedding "
+              f"({stats['inlineBytes'] / 1e6:.1f} MB)")
+        if stats['inline']:
+            print(f"   Catalog documents shrink by {stats['inlineBytes'] / stats['inline'] / 1024:.1f} KB each; "
+                  f"side documents are {stats['sideBytes'] / stats['inline'] / 1024:.1f} KB")
+        if not args.dry_run:
+            print(f"   {stats['copied']} copied, {stats['stripped']} stripped, {stats['failed']} failed "
+                  f"in {elapsed:.1f}s")
+
+    if failed:
+        print(f"❌ {failed} documents failed, rerun to retry them")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
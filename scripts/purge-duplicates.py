@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Purge duplicate documents
+
+The importers and seeders used auto IDs before doc_ids.py, so every rerun
+left another copy of each record. This groups a collection's documents by
+the same identity the importers now use (destination_id / umkm_id /
+guide_id: normalized name plus coordinates or city), keeps one survivor
+per group at its deterministic ID and deletes the rest.
+
+Only the identity and timestamp fields are read (a projection query, a
+page at a time), so scanning 100k documents moves a few MB. Losers are
+deleted through a BulkWriter: batches in parallel, throttled to --rate
+ops/s, contention and quota errors retried with backoff. Their
+embedding side documents (embedding_store.py) go with them.
+
+The survivor of a group is the document already at the deterministic ID
+when there is one (the next import upserts it), otherwise the most
+recently updated one, which is then moved to the deterministic ID (with
+its embedding side document) so the next import upserts it too instead of
+writing the duplicate again. Lone auto-ID documents are moved the same
+way. Copies are flushed before any delete is sent, in the same BulkWriter,
+so a failed copy keeps its original.
+
+What refers to documents by ID follows the purge: the collection's sync
+index (firestore_sync.py) moves hashes to the new IDs and forgets deleted
+documents, and its stats document (catalog_stats.py) is recomputed. For a
+destination collection the FAISS index_mapping.json of that generation
+(or the root index for the base collection) points moved and deleted
+documents at their survivor; the vectors of deleted copies stay in the
+index until the next import rebuilds it, so a search may return a
+survivor twice but never a missing document.
+
+Usage:
+    uv run python scripts/purge-duplicates.py --dry-run
+    uv run python scripts/purge-duplicates.py --collection umkm --collection local_guides
+    uv run python scripts/purge-duplicates.py --collection destinations__g20261018T222249 --rate 2000
+    uv run python scripts/purge-duplicates.py --collection destinations --index ./faiss_index
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+from dotenv import load_dotenv
+from firebase_admin import credentials, firestore, initialize_app
+from google.cloud.firestore_v1.bulk_writer import BulkRetry, BulkWriterOptions, SendMode
+
+from catalog_generations import GENERATION_SEPARATOR, generation_index_path
+from catalog_stats import collection_stats, load_stats, write_stats
+from doc_ids import destination_id, guide_id, umkm_id
+from embedding_store import EMBEDDING_COLLECTIONS, embedding_collection
+from firestore_sync import load_hash_index, save_hash_index
+
+# Identity of a record, by base collection
+IDENTITIES: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    'destinations': destination_id,
+    'umkm': umkm_id,
+    'local_guides': guide_id,
+}
+FAISS_COLLECTIONS = {'destinations'}  # Base collections with a FAISS index (import-data.py)
+MAPPING_FILE = 'index_mapping.json'
+IDENTITY_FIELDS = ['name', 'latitude', 'longitude', 'source', 'location', 'createdAt', 'updatedAt']
+DEFAULT_PAGE_SIZE = 2000
+DEFAULT_RATE = 5000  # Writes per second, after the BulkWriter ramp-up
+GET_ALL_CHUNK = 300  # Survivors read per get_all call before they are moved
+BULK_INITIAL_OPS_PER_SECOND = 500
+BULK_MAX_ATTEMPTS = 8
+# gRPC codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, INTERNAL, UNAVAILABLE
+RETRYABLE_CODES = {4, 8, 10, 13, 14}
+
+
+class DuplicateGroup(NamedTuple):
+    identity: str
+    name: str
+    survivor: str
+    losers: List[str]
+    target: Optional[str]  # Deterministic ID the survivor moves to, None if it stays
+
+
+def _timestamp(value: Any) -> float:
+    """Seconds since the epoch of a Firestore timestamp, datetime or ISO string; 0 if unknown"""
+    if hasattr(value, 'timestamp'):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def scan_identities(db, collection: str, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, List[Dict[str, Any]]]:
+    """{identity: [{'id': ..., fields}]} of a collection, read with a projection a page at a time"""
+    identity = IDENTITIES[collection.partition('__')[0]]
+    query = db.collection(collection).select(IDENTITY_FIELDS).order_by('__name__').limit(page_size)
+    groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    last, scanned = None, 0
+    while True:
+        page = list((query.start_after(last) if last is not None else query).stream())
+        if not page:
+            break
+        last = page[-1]
+        scanned += len(page)
+        for snapshot in page:
+            data = snapshot.to_dict() or {}
+            if not data.get('name'):
+                continue  # Nothing to identify it by
+            groups[identity(data)].append({'id': snapshot.id, **data})
+        print(f"   {scanned} documents scanned, {len(groups)} distinct records")
+    return groups
+
+
+def plan_purge(groups: Dict[str, List[Dict[str, Any]]]) -> List[DuplicateGroup]:
+    """One survivor per identity: the document at the deterministic ID, else the newest, moved there"""
+    owners = {doc['id']: identity for identity, members in groups.items() for doc in members}
+    plan = []
+    for identity, members in groups.items():
+        ranked = sorted(members, key=lambda doc: (doc['id'] == identity,
+                                                 _timestamp(doc.get('updatedAt')),
+                                                 _timestamp(doc.get('createdAt')),
+                                                 doc['id']), reverse=True)
+        survivor = ranked[0]['id']
+        # A document of another record sitting at the ID (edited since it was written) is not overwritten
+        target = identity if survivor != identity and owners.get(identity, identity) == identity else None
+        if len(members) < 2 and target is None:
+            continue
+        plan.append(DuplicateGroup(identity, str(ranked[0].get('name', '')), survivor,
+                                   [doc['id'] for doc in ranked[1:]], target))
+    return sorted(plan, key=lambda group: -len(group.losers))
+
+
+def _read_documents(db, collection_ref, doc_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """{id: data} of the documents that exist"""
+    documents = {}
+    for start in range(0, len(doc_ids), GET_ALL_CHUNK):
+        refs = [collection_ref.document(doc_id) for doc_id in doc_ids[start:start + GET_ALL_CHUNK]]
+        for snapshot in db.get_all(refs):
+            if snapshot.exists:
+                documents[snapshot.id] = snapshot.to_dict()
+    return documents
+
+
+def apply_purge(db, collection: str, plan: List[DuplicateGroup], rate: int = DEFAULT_RATE) -> Dict[str, Any]:
+    """Move survivors to their deterministic IDs, then delete losers and moved originals (with their
+    embedding side documents), all through one throttled BulkWriter"""
+    catalog = db.collection(collection)
+    side = None
+    if collection.partition('__')[0] in EMBEDDING_COLLECTIONS:
+        side = db.collection(embedding_collection(collection))
+    failures: Dict[str, str] = {}  # document path -> error
+    lock = threading.Lock()
+
+    def on_error(failure, bulk_writer) -> bool:
+        if failure.code in RETRYABLE_CODES and failure.attempts < BULK_MAX_ATTEMPTS:
+            return True  # Retried after a backoff
+        with lock:
+            failures[failure.operation.reference.path] = failure.message
+        return False
+
+    writer = db.bulk_writer(BulkWriterOptions(
+        initial_ops_per_second=min(BULK_INITIAL_OPS_PER_SECOND, rate),
+        max_ops_per_second=rate,
+        mode=SendMode.parallel,
+        retry=BulkRetry.exponential,
+    ))
+    writer.on_write_error(on_error)
+    start = time.perf_counter()
+
+    # Copy moving survivors first; only those copied completely lose their original
+    moves = {group.survivor: group.target for group in plan if group.target}
+    documents = _read_documents(db, catalog, list(moves))
+    side_documents = _read_documents(db, side, list(documents)) if side is not None else {}
+    for source, data in documents.items():
+        writer.set(catalog.document(moves[source]), data)
+        if source in side_documents:
+            writer.set(side.document(moves[source]), side_documents[source])
+    writer.flush()  # Waits for every copy, retries included
+    moved = [source for source in documents
+             if catalog.document(moves[source]).path not in failures
+             and (side is None or side.document(moves[source]).path not in failures)]
+    failed = [f"{source} -> {moves[source]}: copy failed" for source in documents if source not in moved]
+    # A catalog copy whose side document did not follow would win the next purge without its embedding
+    for source in documents:
+        if source not in moved and catalog.document(moves[source]).path not in failures:
+            writer.delete(catalog.document(moves[source]))
+
+    losers = [doc_id for group in plan for doc_id in group.losers]
+    refs = [catalog.document(doc_id) for doc_id in losers + moved]
+    side_refs = [side.document(doc_id) for doc_id in losers + moved] if side is not None else []
+    for ref in refs + side_refs:
+        writer.delete(ref)
+    writer.close()  # Flushes and waits for every delete, retries included
+    failed += [f"{ref.id}: {failures[ref.path]}" for ref in refs if ref.path in failures]
+    # Where each deleted loser's record lives now, for the ID references updated afterwards
+    final = {group.survivor: moves[group.survivor] if group.survivor in moved else group.survivor
+             for group in plan}
+    merged = {doc_id: final[group.survivor] for group in plan for doc_id in group.losers
+              if catalog.document(doc_id).path not in failures}
+    return {'deleted': len(merged), 'moved': len(moved), 'failed': failed,
+            'moves': {source: moves[source] for source in moved}, 'merged': merged,
+            'sideFailed': sum(ref.path in failures for ref in side_refs), 'seconds': time.perf_counter() - start}
+
+
+def remap_hash_index(db, collection: str, moves: Dict[str, str], merged: Dict[str, str]) -> Optional[int]:
+    """Move hashes of moved documents to their new IDs and drop deleted ones; None without an index"""
+    hashes, _ = load_hash_index(db, collection)
+    if hashes is None:
+        return None
+    for source, target in moves.items():
+        if source in hashes:
+            hashes[target] = hashes.pop(source)
+    for doc_id in merged:
+        hashes.pop(doc_id, None)
+    report = save_hash_index(db, collection, hashes)
+    return len(report.failed)
+
+
+def remap_faiss_mapping(index_path: str, remap: Dict[str, str]) -> Optional[int]:
+    """Point mapping entries of moved or deleted documents at their survivor; None without a mapping.
+
+    Entries keep their positions, so the FAISS vectors still line up.
+    """
+    mapping_file = os.path.join(index_path, MAPPING_FILE)
+    if not os.path.exists(mapping_file):
+        return None
+    with open(mapping_file, 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+    changed = 0
+    for entry in mapping:
+        if entry.get('id') in remap:
+            entry['id'] = remap[entry['id']]
+            changed += 1
+    if changed:
+        # Replace, not rewrite in place, so a reader never loads half a file
+        with open(mapping_file + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(mapping, f, ensure_ascii=False, indent=2)
+        os.replace(mapping_file + '.tmp', mapping_file)
+    return changed
+
+
+def update_references(db, collection: str, result: Dict[str, Any], index_root: str):
+    """Bring the sync index, stats and FAISS mapping of a purged collection up to date"""
+    moves, merged = result['moves'], result['merged']
+    if not moves and not merged:
+        return
+    failed = remap_hash_index(db, collection, moves, merged)
+    if failed:
+        print(f"   ⚠️  {failed} sync index shards not written, the next --sync should use --verify")
+    if load_stats(db, collection) is not None:
+        write_stats(db, collection, collection_stats(db, collection))
+        print(f"   📊 Stats of {collection} recomputed")
+
+    base, _, generation = collection.partition(GENERATION_SEPARATOR)
+    if base in FAISS_COLLECTIONS:
+        index_path = generation_index_path(index_root, generation or None)
+        changed = remap_faiss_mapping(index_path, {**moves, **merged})
+        if changed is None:
+            print(f"   ⚠️  No {MAPPING_FILE} in {index_path}: if this collection's FAISS index lives elsewhere, "
+                  f"rerun with --index or rebuild it with import-data.py")
+        else:
+            print(f"   🔗 {changed} FAISS mapping entries of {index_path} point at their survivor")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Delete duplicate documents, keeping one per record')
+    parser.add_argument('--collection', action='append',
+                        help=f"collection to purge (repeatable, default: {', '.join(IDENTITIES)}); "
+                             f"catalog generations such as destinations__g... are accepted")
+    parser.add_argument('--dry-run', action='store_true', help='only report what would be deleted or moved')
+    parser.add_argument('--rate', type=int, default=DEFAULT_RATE, help='maximum writes per second')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--show', type=int, default=10, help='duplicate groups listed per collection')
+    parser.add_argument('--index', default=os.getenv('FAISS_INDEX_PATH', './faiss_index'),
+                        help='FAISS index root whose mapping follows destination purges')
+    args = parser.parse_args()
+
+    collections = args.collection or list(IDENTITIES)
+    unknown = [collection for collection in collections if collection.partition('__')[0] not in IDENTITIES]
+    if unknown:
+        print(f"❌ No identity for {', '.join(unknown)}, expected one of: {', '.join(IDENTITIES)}")
+        sys.exit(1)
+
+    load_dotenv('.env.local')
+    service_account_path = os.path.join(os.getcwd(), 'serviceAccountKey.json')
+    initialize_app(credentials.Certificate(service_account_path))
+    db = firestore.client()
+
+    failed = 0
+    for collection in collections:
+        print(f"🔍 Scanning {collection}...")
+        start = time.perf_counter()
+        groups = scan_identities(db, collection, args.page_size)
+        plan = plan_purge(groups)
+        losers = sum(len(group.losers) for group in plan)
+        moves = sum(group.target is not None for group in plan)
+        documents = sum(len(members) for members in groups.values())
+        print(f"📋 {collection}: {documents} documents, {len(groups)} distinct records, "
+              f"{sum(len(group.losers) > 0 for group in plan)} duplicated, {losers} to delete, "
+              f"{moves} to move to their deterministic ID ({time.perf_counter() - start:.1f}s)")
+        for group in [group for group in plan if group.losers][:args.show]:
+            kept = f"{group.survivor} -> {group.target}" if group.target else group.survivor
+            print(f"   {group.name!r}: keep {kept}, delete {len(group.losers)}")
+        if args.dry_run or not plan:
+            continue
+
+        result = apply_purge(db, collection, plan, args.rate)
+        failed += len(result['failed']) + result['sideFailed']
+        for error in result['failed'][:3]:
+            print(f"   ⚠️  {error}")
+        print(f"✅ {collection}: {result['deleted']} documents deleted, {result['moved']} moved in "
+              f"{result['seconds']:.1f}s, {len(result['failed'])} failed")
+        update_references(db, collection, result, args.index)
+
+    if failed:
+        print(f"❌ {failed} writes failed, rerun to retry them")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
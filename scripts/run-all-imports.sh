@@ -1,7 +1,8 @@
 #!/bin/bash
 
 # PALAPA Complete Data Import Orchestrator
-# Runs all import scripts in sequence
+# Runs all import scripts in sequence. Safe to re-run: document IDs are
+# deterministic (scripts/doc_ids.py), so every import upserts.
 
 set -e
 
@@ -54,7 +55,7 @@ echo "ALL IMPORTS COMPLETED SUCCESSFULLY!"
 echo "======================================================================"
 echo ""
 echo "Database Status:"
-echo "  - Destinations: 1,432 documents + FAISS embeddings"
+echo "  - Destinations: new active catalog generation + FAISS index"
 echo "  - UMKM: 21 businesses"
 echo "  - Local Guides: 10 professional guides"
 echo "  - Ready for production!"
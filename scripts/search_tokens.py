@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Search token fields for indexed name lookups
+
+Name search (MapService.searchDestinations, DestinationService.searchByName)
+loaded the collection and filtered it in the client, and the verify scripts'
+`name >= x` range only matches case-sensitive whole-name prefixes. Every
+destination and UMKM now carries two array fields:
+
+    searchTokens     folded words of name, category, provinsi, kotaKabupaten
+                     e.g. ['candi', 'borobudur', 'budaya', 'jawa', 'tengah']
+    searchPrefixes   every prefix of those words from 2 to 10 characters
+                     e.g. ['ca', 'can', 'cand', 'candi', 'bo', 'bor', ...]
+
+Folding is the one doc_ids.normalize_key uses: accents stripped, lowercase,
+anything but ASCII letters and digits separates words. A keyword lookup is
+`array-contains` on searchTokens, a type-ahead lookup `array-contains` on
+searchPrefixes (longer input is cut to 10 characters and checked against
+the tokens afterwards). Both are served by Firestore's automatic array
+index, so they also work on catalog generations. lib/search-tokens.ts folds
+queries the same way. Arrays are bounded so a long name cannot blow up the
+index entries of a document.
+
+Usage:
+    from search_tokens import add_search_fields
+
+    add_search_fields(destinations)   # in place
+    find_by_name(db.collection('umkm'), 'Gudeg Yu Djum')   # matching snapshots
+"""
+
+import math
+from typing import Any, Dict, List
+
+from doc_ids import normalize_key
+
+TOKENS_FIELD = 'searchTokens'
+PREFIXES_FIELD = 'searchPrefixes'
+SOURCE_FIELDS = ('name', 'category', 'provinsi', 'kotaKabupaten')  # Name first, caps drop the rest first
+MIN_TOKEN_LENGTH = 2
+MIN_PREFIX_LENGTH = 2
+MAX_PREFIX_LENGTH = 10
+MAX_TOKENS = 24
+MAX_PREFIXES = 150
+
+
+def search_terms(text: Any) -> List[str]:
+    """Folded words of a text, in order, without repeats; NaN and 'nan' (missing CSV cells) have none"""
+    if isinstance(text, float) and math.isnan(text) or str(text).strip().lower() == 'nan':
+        return []
+    words = [word for word in normalize_key(text).split('-') if len(word) >= MIN_TOKEN_LENGTH]
+    return list(dict.fromkeys(words))
+
+
+def search_fields(record: Dict[str, Any]) -> Dict[str, List[str]]:
+    tokens = list(dict.fromkeys(
+        term for field in SOURCE_FIELDS for term in search_terms(record.get(field))
+    ))[:MAX_TOKENS]
+    prefixes = list(dict.fromkeys(
+        token[:length]
+        for token in tokens
+        for length in range(MIN_PREFIX_LENGTH, min(len(token), MAX_PREFIX_LENGTH) + 1)
+    ))[:MAX_PREFIXES]
+    return {TOKENS_FIELD: tokens, PREFIXES_FIELD: prefixes}
+
+
+def add_search_fields(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Add the token fields to every record, in place; returns records"""
+    for record in records:
+        record.update(search_fields(record))
+    return records
+
+
+def find_by_name(collection_ref, text: Any, limit: int = 20) -> List[Any]:
+    """Documents whose tokens contain every word of text (one indexed array-contains query)"""
+    terms = search_terms(text)
+    if not terms:
+        return []
+    # The longest word is usually the rarest; every candidate is streamed, so none is missed
+    query = collection_ref.where(TOKENS_FIELD, 'array_contains', max(terms, key=len))
+    matches = []
+    for snapshot in query.stream():
+        tokens = set((snapshot.to_dict() or {}).get(TOKENS_FIELD, []))
+        if tokens.issuperset(terms):
+            matches.append(snapshot)
+            if len(matches) >= limit:
+                break
+    return matches
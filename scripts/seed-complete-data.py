@@ -11,6 +11,12 @@ from dotenv import load_dotenv
 from firebase_admin import initialize_app, firestore, credentials
 from datetime import datetime
 
+from catalog_stats import collection_stats, write_stats
+from collection_checks import count, run_checks
+from doc_ids import guide_id, umkm_id
+from geo_cells import add_geo_fields
+from search_tokens import add_search_fields
+
 # Fix Windows Unicode
 if sys.stdout.encoding != 'utf-8':
     import io
@@ -130,17 +136,22 @@ class DataSeeder:
             },
         ]
 
+        add_geo_fields(umkm_data)  # Geohash cells for proximity queries
+        add_search_fields(umkm_data)  # Tokens for name lookups
         batch = self.db.batch()
         for i, umkm in enumerate(umkm_data):
             umkm['createdAt'] = datetime.now()
             umkm['updatedAt'] = datetime.now()
-            doc_ref = self.db.collection('umkm').document()
+            # Deterministic ID: a rerun overwrites instead of duplicating
+            doc_ref = self.db.collection('umkm').document(umkm_id(umkm))
             batch.set(doc_ref, umkm)
 
             if (i + 1) % 50 == 0 or i == len(umkm_data) - 1:
                 batch.commit()
                 batch = self.db.batch()
 
+        # Summary the app checks before using geohash cell and token queries
+        write_stats(self.db, 'umkm', collection_stats(self.db, 'umkm'))
         print(f"✅ Seeded {len(umkm_data)} UMKM entries\n")
 
     def seed_local_guides(self):
@@ -242,7 +253,8 @@ class DataSeeder:
         for i, guide in enumerate(guides_data):
             guide['createdAt'] = datetime.now()
             guide['updatedAt'] = datetime.now()
-            doc_ref = self.db.collection('local_guides').document()
+            # Deterministic ID: a rerun overwrites instead of duplicating
+            doc_ref = self.db.collection('local_guides').document(guide_id(guide))
             batch.set(doc_ref, guide)
 
             if (i + 1) % 50 == 0 or i == len(guides_data) - 1:
@@ -256,10 +268,15 @@ class DataSeeder:
         print("🔍 Verification:\n")
 
         collections = ['destinations', 'umkm', 'local_guides']
+        # Server-side counts, all collections at once
+        results = run_checks({col_name: (lambda col_name=col_name: count(self.db.collection(col_name)))
+                              for col_name in collections})
         for col_name in collections:
-            docs = list(self.db.collection(col_name).limit(1000).stream())
-            count = len(docs)
-            print(f"   ✅ {col_name:15} : {count:5} documents")
+            result = results[col_name]
+            if result.error:
+                print(f"   ❌ {col_name:15} : Error - {result.error[:30]}")
+            else:
+                print(f"   ✅ {col_name:15} : {result.value:5} documents")
 
 def main():
     print("\n" + "="*70)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Semantic Dedupe - near-duplicate destinations by embedding similarity
+
+Duplicates that share no name tokens (the same temple described by two
+datasets) get past dataset-wisata/dedupe.py. This pass compares embedding
+vectors instead. Pairs within a spatial radius (grid-blocked, see
+dedupe.candidate_pairs) are scored by cosine similarity of the L2-normalized
+float32 vectors; without a radius, a batched FAISS range_search compares all
+pairs on every OpenMP thread. Pairs above the threshold are clustered with
+union-find.
+
+Usage:
+    uv run python scripts/semantic_dedupe.py
+    uv run python scripts/semantic_dedupe.py --index ./faiss_index --min-similarity 0.95 --radius 500
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import faiss
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dataset-wisata'))
+
+from dedupe import candidate_pairs, union_find
+
+DEFAULT_MIN_SIMILARITY = 0.92
+DEFAULT_RADIUS_M = 1000.0
+DEFAULT_BATCH_SIZE = 4096
+REPORT_FILE = 'semantic_duplicates.json'
+
+
+def normalized_matrix(embeddings) -> np.ndarray:
+    """Contiguous float32 copy with unit-length rows (zero rows stay zero)"""
+    matrix = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32)).copy()
+    faiss.normalize_L2(matrix)
+    return matrix
+
+
+def _pair_similarities(matrix: np.ndarray, a: np.ndarray, b: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    """Cosine similarity of each (a, b) row pair of a normalized matrix"""
+    similarity = np.empty(len(a), dtype=np.float32)
+    for start in range(0, len(a), chunk):
+        end = start + chunk
+        similarity[start:end] = np.einsum('ij,ij->i', matrix[a[start:end]], matrix[b[start:end]])
+    return similarity
+
+
+def _range_search_pairs(matrix: np.ndarray, min_similarity: float, batch_size: int) -> pd.DataFrame:
+    """All pairs above min_similarity via batched FAISS range_search"""
+    index = faiss.IndexFlatIP(matrix.shape[1])
+    index.add(matrix)
+
+    found = []
+    for start in range(0, len(matrix), batch_size):
+        lims, similarities, neighbours = index.range_search(matrix[start:start + batch_size], min_similarity)
+        rows = start + np.repeat(np.arange(len(lims) - 1), np.diff(lims).astype(np.int64))
+        # Each pair once, no self matches
+        keep = neighbours > rows
+        found.append(pd.DataFrame({'a': rows[keep], 'b': neighbours[keep], 'similarity': similarities[keep]}))
+
+    if not found:
+        return pd.DataFrame({'a': np.empty(0, np.int64), 'b': np.empty(0, np.int64),
+                             'similarity': np.empty(0, np.float32)})
+    return pd.concat(found, ignore_index=True)
+
+
+def find_semantic_pairs(embeddings, latitude=None, longitude=None,
+                        min_similarity: float = DEFAULT_MIN_SIMILARITY,
+                        radius_m: Optional[float] = DEFAULT_RADIUS_M,
+                        batch_size: int = DEFAULT_BATCH_SIZE,
+                        threads: Optional[int] = None) -> pd.DataFrame:
+    """Row pairs (a < b) with cosine similarity >= min_similarity.
+
+    With coordinates and a radius, only pairs within radius_m are scored, so
+    two different beaches with near-identical boilerplate descriptions on
+    opposite ends of the country never match. Candidates come from the same
+    grid blocking as dedupe.py and cost grows with the number of nearby
+    pairs, not n^2. Without a radius every pair is compared with FAISS.
+    """
+    matrix = normalized_matrix(embeddings)
+    faiss.omp_set_num_threads(threads or os.cpu_count() or 1)
+
+    if radius_m is None or latitude is None or longitude is None:
+        pairs = _range_search_pairs(matrix, min_similarity, batch_size)
+        pairs['distance_m'] = np.nan
+        return pairs
+
+    pairs = candidate_pairs(np.asarray(latitude, dtype=float), np.asarray(longitude, dtype=float), radius_m)
+    pairs['similarity'] = _pair_similarities(matrix, pairs['a'].to_numpy(), pairs['b'].to_numpy())
+    pairs = pairs[pairs['similarity'] >= min_similarity]
+    return pairs[['a', 'b', 'similarity', 'distance_m']].reset_index(drop=True)
+
+
+def cluster_pairs(pairs: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Rows of every multi-member cluster with its best match score.
+
+    The survivor of a cluster is its first row (merge order, like the exact
+    dedupe in merge_datasets.py).
+    """
+    cluster = union_find(n, list(zip(pairs['a'].tolist(), pairs['b'].tolist())))
+    best = pd.concat([
+        pairs[['a', 'similarity']].rename(columns={'a': 'row'}),
+        pairs[['b', 'similarity']].rename(columns={'b': 'row'}),
+    ]).groupby('row')['similarity'].max()
+
+    members = best.index.to_numpy()
+    clusters = pd.DataFrame({
+        'row': members,
+        'cluster': cluster[members],
+        'survivor': cluster[members] == members,
+        'best_similarity': best.to_numpy(),
+    })
+    return clusters.sort_values(['cluster', 'row']).reset_index(drop=True)
+
+
+def drop_duplicates(items: List[Any], clusters: pd.DataFrame) -> List[Any]:
+    """Items without the non-surviving members of each cluster"""
+    dropped = set(clusters.loc[~clusters['survivor'], 'row'].tolist())
+    return [item for i, item in enumerate(items) if i not in dropped]
+
+
+def build_report(clusters: pd.DataFrame, pairs: pd.DataFrame, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """JSON-ready candidate clusters with their member records and pair scores"""
+    report = []
+    pair_cluster = clusters.set_index('row')['cluster'].reindex(pairs['a']).to_numpy()
+    pairs_by_cluster = dict(tuple(pairs.groupby(pair_cluster)))
+    for cluster_id, members in clusters.groupby('cluster'):
+        report.append({
+            'cluster': int(cluster_id),
+            'members': [
+                {**records[row], 'row': int(row), 'survivor': bool(survivor)}
+                for row, survivor in zip(members['row'], members['survivor'])
+            ],
+            'pairs': [
+                {'a': int(p.a), 'b': int(p.b), 'similarity': round(float(p.similarity), 4),
+                 'distanceM': None if np.isnan(p.distance_m) else round(float(p.distance_m), 1)}
+                for p in pairs_by_cluster[cluster_id].itertuples(index=False)
+            ],
+        })
+    return report
+
+
+def load_index(index_path: str) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """Vectors and mapping saved by import-data.py"""
+    index = faiss.read_index(os.path.join(index_path, 'faiss_index.idx'))
+    with open(os.path.join(index_path, 'index_mapping.json'), 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+    return index.reconstruct_n(0, index.ntotal), mapping
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find near-duplicate destinations by embedding similarity')
+    parser.add_argument('--index', default=os.getenv('FAISS_INDEX_PATH', './faiss_index'), help='FAISS index directory')
+    parser.add_argument('--min-similarity', type=float, default=DEFAULT_MIN_SIMILARITY)
+    parser.add_argument('--radius', type=float, default=DEFAULT_RADIUS_M, help='max distance in meters (0 = no limit)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--threads', type=int, help='OpenMP threads (default: all cores)')
+    parser.add_argument('--output', help=f'report path (default: <index>/{REPORT_FILE})')
+    args = parser.parse_args()
+
+    print(f"🔍 Loading FAISS index from {args.index}...")
+    embeddings, mapping = load_index(args.index)
+    print(f"✅ Loaded {len(embeddings)} vectors")
+
+    has_coordinates = mapping and all('latitude' in m and 'longitude' in m for m in mapping)
+    radius_m = args.radius or None
+    if radius_m and not has_coordinates:
+        print("⚠️  Index mapping has no coordinates, comparing without a spatial radius")
+        radius_m = None
+
+    start = time.perf_counter()
+    pairs = find_semantic_pairs(
+        embeddings,
+        [m.get('latitude') for m in mapping] if has_coordinates else None,
+        [m.get('longitude') for m in mapping] if has_coordinates else None,
+        min_similarity=args.min_similarity, radius_m=radius_m,
+        batch_size=args.batch_size, threads=args.threads,
+    )
+    clusters = cluster_pairs(pairs, len(embeddings))
+    elapsed = time.perf_counter() - start
+    print(f"✅ {len(pairs)} pairs >= {args.min_similarity} in {clusters['cluster'].nunique()} clusters "
+          f"({(~clusters['survivor']).sum()} duplicates) in {elapsed:.1f}s")
+
+    output = args.output or os.path.join(args.index, REPORT_FILE)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(build_report(clusters, pairs, mapping), f, ensure_ascii=False, indent=2)
+    print(f"💾 Report saved to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,14 @@ from firebase_admin import initialize_app, firestore, credentials
 from tqdm import tqdm
 from datetime import datetime
 
+from catalog_generations import read_pointer
+from catalog_stats import compute_stats, load_stats, write_stats
+from collection_checks import count, run_checks
+from doc_ids import destination_id, unique_by_id
+from geo_cells import add_geo_fields
+from search_tokens import add_search_fields
+from firestore_batches import commit_batches
+
 # Fix Windows Unicode
 if sys.stdout.encoding != 'utf-8':
     import io
@@ -59,6 +67,15 @@ class FirebaseDataSetup:
             print(f"❌ CSV file not found: {csv_path}")
             return False
 
+        # This writes the base collection without a FAISS index; once a catalog
+        # generation is active the app no longer reads it
+        pointer = read_pointer(self.db, 'destinations')
+        if pointer.generation is not None:
+            print(f"❌ Catalog generation {pointer.generation} is active ({pointer.collection}), "
+                  f"destinations written here would not be served")
+            print("   Use scripts/import-data.py, or scripts/manage-generations.py activate none first")
+            return False
+
         try:
             # Load CSV
             df = pd.read_csv(csv_path, encoding='utf-8')
@@ -66,11 +83,10 @@ class FirebaseDataSetup:
 
             # Prepare data
             print("🔄 Processing destinations...")
-            batch = self.db.batch()
-            batch_count = 0
-            success_count = 0
+            collection = self.db.collection('destinations')
+            docs = []
 
-            for idx, row in tqdm(df.iterrows(), total=len(df), desc="Importing destinations"):
+            for idx, row in tqdm(df.iterrows(), total=len(df), desc="Preparing destinations"):
                 try:
                     # Build document
                     doc_data = {
@@ -96,27 +112,30 @@ class FirebaseDataSetup:
                     if not doc_data['name'] or not doc_data['provinsi']:
                         continue
 
-                    # Add to batch
-                    doc_ref = self.db.collection('destinations').document()
-                    batch.set(doc_ref, doc_data)
-                    batch_count += 1
-                    success_count += 1
-
-                    # Commit every 500 documents
-                    if batch_count >= 500:
-                        batch.commit()
-                        batch = self.db.batch()
-                        batch_count = 0
+                    docs.append(doc_data)
 
                 except Exception as e:
                     print(f"\n⚠️  Error processing row {idx}: {e}")
                     continue
 
-            # Commit remaining batch
-            if batch_count > 0:
-                batch.commit()
-
-            print(f"\n✅ Successfully imported {success_count} destinations to Firestore\n")
+            # Deterministic document IDs: a rerun overwrites instead of duplicating
+            pairs, dropped = unique_by_id(add_search_fields(add_geo_fields(docs)), destination_id)
+            if dropped:
+                print(f"⚠️  Skipped {dropped} rows with the same name and coordinates as an earlier row")
+            writes = [(collection.document(doc_id), doc_data) for doc_id, doc_data in pairs]
+
+            # Commit in batches of up to 500, several in flight at once
+            with tqdm(total=len(writes), desc="Importing destinations") as pbar:
+                report = commit_batches(self.db, writes, progress=pbar)
+            for error in report.errors:
+                print(f"\n⚠️  {error}")
+            success_count = report.written
+            failed = set(report.failed)
+            write_stats(self.db, 'destinations',
+                        compute_stats([doc_data for i, (_, doc_data) in enumerate(writes) if i not in failed]))
+
+            print(f"\n✅ Successfully imported {success_count} destinations to Firestore "
+                  f"({report.docs_per_second:.0f} docs/s)\n")
             return True
 
         except Exception as e:
@@ -140,26 +159,31 @@ class FirebaseDataSetup:
             print("Collection Status:")
             print("-" * 50)
 
-            all_ok = True
-            for collection_name, display_name in collections_to_check.items():
-                try:
-                    docs = self.db.collection(collection_name).limit(1).stream()
-                    count = len(list(docs))
-
-                    # Get actual count via query
-                    all_docs = self.db.collection(collection_name).stream()
-                    total_count = sum(1 for _ in all_docs)
+            def collection_count(collection_name):
+                # The import's summary document, else a server-side count
+                stats = load_stats(self.db, collection_name)
+                if stats is not None:
+                    return stats['count'], True
+                return count(self.db.collection(collection_name)), False
 
-                    if total_count > 0:
-                        print(f"✅ {display_name:20} : {total_count:5} documents")
-                    else:
-                        print(f"⚠️  {display_name:20} : {total_count:5} documents (EMPTY)")
-                        if collection_name == 'destinations':
-                            all_ok = False
+            # All collections at once
+            results = run_checks({name: (lambda name=name: collection_count(name)) for name in collections_to_check})
 
-                except Exception as e:
-                    print(f"❌ {display_name:20} : Error - {str(e)[:30]}")
+            all_ok = True
+            for collection_name, display_name in collections_to_check.items():
+                result = results[collection_name]
+                if result.error:
+                    print(f"❌ {display_name:20} : Error - {result.error[:30]}")
                     all_ok = False
+                    continue
+
+                total_count, from_stats = result.value
+                if total_count > 0:
+                    print(f"✅ {display_name:20} : {total_count:5} documents" + (" (stats)" if from_stats else ""))
+                else:
+                    print(f"⚠️  {display_name:20} : {total_count:5} documents (EMPTY)")
+                    if collection_name == 'destinations':
+                        all_ok = False
 
             print("-" * 50)
 
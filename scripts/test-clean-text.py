@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test Clean Text - equivalence check and benchmark for clean_text_series
+
+Checks that the vectorized cleaner in dataset-wisata/text_cleaning.py is
+byte-identical to the scalar clean_text on every name/description in the
+current source CSVs, then measures throughput on synthetic descriptions.
+
+Usage:
+    uv run python scripts/test-clean-text.py
+    uv run python scripts/test-clean-text.py --rows 2000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+if sys.stdout.encoding != 'utf-8':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+import numpy as np
+import pandas as pd
+
+DATASET_DIR = Path(__file__).resolve().parent.parent / 'dataset-wisata'
+sys.path.insert(0, str(DATASET_DIR))
+
+from text_cleaning import clean_text, clean_text_series
+
+# Text columns that go through clean_text in merge_datasets.py
+SOURCE_COLUMNS = {
+    'tourism_with_id.csv': ['Place_Name', 'Description'],
+    'wisata_indonesia_final.csv': ['nama_wisata', 'deskripsi'],
+    'wisata_indonesia_new.csv': ['nama_wisata', 'deskripsi_bersih'],
+}
+
+# Fragments used to build messy synthetic descriptions
+SYNTHETIC_FRAGMENTS = [
+    'Pantai Parangtritis', 'adalah', 'salah satu', 'destinasi wisata',
+    'di Yogyakarta,', 'Jawa Tengah.', '(buka 24 jam)', 'tiket: Rp10.000',
+    'pemandangan 😍', 'indah!!!', '#wisata', 'Café', 'Ubud – Bali',
+    '\n', '\t', '\r\n', '  ', '★★★★', 'Kab. Malang/Batu', 'dst…',
+]
+
+
+def check_equivalence() -> bool:
+    """Compare clean_text and clean_text_series on the current CSVs"""
+    print("🔍 Checking equivalence on source CSVs...")
+    all_ok = True
+
+    for file_name, columns in SOURCE_COLUMNS.items():
+        df = pd.read_csv(DATASET_DIR / file_name)
+        for column in columns:
+            values = df[column].fillna('')
+            expected = [clean_text(v) for v in values]
+            actual = clean_text_series(values).tolist()
+
+            mismatches = [i for i, (e, a) in enumerate(zip(expected, actual)) if e != a]
+            if len(expected) != len(actual) or mismatches:
+                all_ok = False
+                print(f"❌ {file_name}:{column} - {len(mismatches)} mismatches")
+                for i in mismatches[:3]:
+                    print(f"   row {i}: {expected[i]!r} != {actual[i]!r}")
+            else:
+                print(f"✅ {file_name}:{column} - {len(actual)} values identical")
+
+    return all_ok
+
+
+def make_synthetic_descriptions(rows: int, seed: int = 42) -> pd.Series:
+    """Build rows of distinct messy descriptions from random fragments"""
+    rng = np.random.default_rng(seed)
+    fragments = np.array(SYNTHETIC_FRAGMENTS, dtype=object)
+    pool_size = min(rows, 10000)
+    pool = [' '.join(rng.choice(fragments, size=rng.integers(5, 40))) for _ in range(pool_size)]
+    # Suffix the row number so every description is unique and the dedup in
+    # clean_text_series gets no free wins
+    return pd.Series([f"{pool[i % pool_size]} No.{i}" for i in range(rows)], dtype=object)
+
+
+def run_benchmark(rows: int, scalar_rows: int):
+    """Measure throughput of the scalar and vectorized cleaners"""
+    print(f"\n⏱️  Benchmarking on {rows:,} synthetic descriptions...")
+    descriptions = make_synthetic_descriptions(rows)
+    total_mb = descriptions.str.len().sum() / 1e6
+
+    # Speedup is measured on the same prefix for both cleaners
+    sample = descriptions.iloc[:scalar_rows]
+    start = time.perf_counter()
+    expected = sample.apply(lambda x: clean_text(x) if pd.notna(x) and x != '' else '')
+    scalar_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cleaned_sample = clean_text_series(sample)
+    sample_elapsed = time.perf_counter() - start
+
+    if not cleaned_sample.equals(expected):
+        print("❌ Synthetic output differs from clean_text")
+        return False
+
+    start = time.perf_counter()
+    clean_text_series(descriptions)
+    vector_elapsed = time.perf_counter() - start
+
+    print(f"   Scalar apply    : {len(sample) / scalar_elapsed:12,.0f} rows/sec ({len(sample):,} rows)")
+    print(f"   Vectorized      : {len(sample) / sample_elapsed:12,.0f} rows/sec ({len(sample):,} rows)")
+    print(f"   Speedup         : {scalar_elapsed / sample_elapsed:.2f}x")
+    print(f"   Full run        : {rows / vector_elapsed:12,.0f} rows/sec ({rows:,} rows, {vector_elapsed:.2f}s, {total_mb / vector_elapsed:.1f} MB/s)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Equivalence test and benchmark for clean_text_series')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='synthetic rows for the benchmark')
+    parser.add_argument('--scalar-rows', type=int, default=200_000, help='rows timed with the scalar cleaner')
+    parser.add_argument('--skip-benchmark', action='store_true')
+    args = parser.parse_args()
+
+    ok = check_equivalence()
+    if ok and not args.skip_benchmark:
+        ok = run_benchmark(args.rows, min(args.scalar_rows, args.rows))
+
+    print("\n✅ clean_text_series test PASSED!" if ok else "\n❌ clean_text_series test FAILED!")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,13 @@ from firebase_admin import initialize_app, firestore, credentials
 from google import genai
 from google.genai import types
 
+from catalog_generations import read_pointer
+from catalog_stats import collection_stats, write_stats
+from doc_ids import destination_id
+from embedding_store import embedding_ref, split_embedding
+from geo_cells import add_geo_fields
+from search_tokens import add_search_fields
+
 # Constants
 EMBEDDING_MODEL = "gemini-embedding-001"
 EMBEDDING_DIMENSION = 768
@@ -92,6 +99,14 @@ class QuickImporter:
         print("🚀 Starting Quick Import Test (10 destinations)...")
         print("=" * 50)
 
+        # This writes the base collection, which is not served while a generation is active
+        pointer = read_pointer(self.db, 'destinations')
+        if pointer.generation is not None:
+            print(f"❌ Catalog generation {pointer.generation} is active ({pointer.collection}), "
+                  f"destinations written here would not be served")
+            print("   Use scripts/import-data.py, or scripts/manage-generations.py activate none first")
+            return []
+
         # Load CSV
         print(f"📄 Loading CSV from {csv_path}...")
         df = pd.read_csv(csv_path, encoding='utf-8')
@@ -113,6 +128,8 @@ class QuickImporter:
                 print(f"   ❌ Failed: {e}")
                 continue
 
+        add_geo_fields(destinations)  # Geohash cells for proximity queries
+        add_search_fields(destinations)  # Tokens for name lookups
         print(f"✅ Processed {len(destinations)} destinations")
 
         # Import to Firestore
@@ -132,12 +149,18 @@ class QuickImporter:
             else:
                 dest['embedding'] = list(embedding)
 
-            # Add to Firestore
-            doc_ref = self.db.collection('destinations').document()
-            doc_ref.set(dest)
+            # Add to Firestore, the embedding in destination_embeddings; the
+            # deterministic ID makes a rerun overwrite instead of duplicating
+            doc_ref = self.db.collection('destinations').document(destination_id(dest))
+            catalog, embedding = split_embedding(dest)
+            doc_ref.set(catalog)
+            embedding_ref(self.db, 'destinations', doc_ref.id).set(embedding)
             document_ids.append(doc_ref.id)
             print(f"   ✅ Saved to Firestore: {doc_ref.id}")
 
+        # The other base destinations are untouched, so summarize what is stored
+        write_stats(self.db, 'destinations', collection_stats(self.db, 'destinations'))
+
         print("\n" + "=" * 50)
         print("🎉 Quick Import Test Completed!")
         print(f"📊 Successfully imported {len(document_ids)} destinations")
@@ -8,6 +8,10 @@ import os
 from dotenv import load_dotenv
 from firebase_admin import initialize_app, firestore, credentials
 
+from catalog_generations import active_collection
+from collection_checks import count, embedding_count, inline_embedding_count, run_checks, sample
+from embedding_store import load_embeddings
+
 def verify_imported_data():
     """Verify the 10 imported destinations"""
     print("🔍 Verifying Imported Data...")
@@ -23,28 +27,42 @@ def verify_imported_data():
         initialize_app(cred)
         db = firestore.client()
 
-        # Query destinations collection
-        print("📋 Fetching destinations from Firestore...")
-        destinations_ref = db.collection('destinations')
-        docs = destinations_ref.limit(15).get()  # Get up to 15 to see if more than 10
+        # Counts come from aggregation queries; only the listed rows are read
+        print("📋 Checking destinations in Firestore...")
+        collection = active_collection(db, 'destinations')
+        destinations_ref = db.collection(collection)
+        results = run_checks({
+            'total': lambda: count(destinations_ref),
+            'jakarta': lambda: count(destinations_ref.where('provinsi', '==', 'DKI Jakarta')),
+            'embeddings': lambda: embedding_count(db, collection),
+            'inline': lambda: inline_embedding_count(db, collection),
+            'rows': lambda: sample(destinations_ref, ['name', 'category', 'provinsi', 'rating'], limit=15),
+        })
+        errors = {name: result.error for name, result in results.items() if result.error}
+        if errors:
+            for name, error in errors.items():
+                print(f"❌ {name} check failed: {error}")
+            return False
 
-        print(f"✅ Found {len(docs)} documents in destinations collection")
+        total = results['total'].value
+        rows = results['rows'].value
+        print(f"✅ Found {total} documents in {collection}")
+        embeddings = load_embeddings(db, collection, [doc_id for doc_id, _ in rows])
 
-        if len(docs) == 0:
+        if total == 0:
             print("❌ No destinations found!")
             return False
 
-        print("\n📍 Imported Destinations:")
+        print(f"\n📍 Imported Destinations (first {len(rows)}):")
         print("-" * 60)
 
-        jakarta_count = 0
-        for i, doc in enumerate(docs, 1):
-            data = doc.to_dict()
+        for i, (doc_id, data) in enumerate(rows, 1):
             name = data.get('name', 'Unknown')
             category = data.get('category', 'Unknown')
             provinsi = data.get('provinsi', 'Unknown')
             rating = data.get('rating', 0)
-            has_embedding = 'embedding' in data
+            embedding = embeddings.get(doc_id)
+            has_embedding = embedding is not None
 
             print(f"{i:2d}. {name}")
             print(f"    📂 Category: {category}")
@@ -52,24 +70,22 @@ def verify_imported_data():
             print(f"    ⭐ Rating: {rating}")
             print(f"    🤖 Embedding: {'✅' if has_embedding else '❌'}")
             if has_embedding:
-                embedding_len = len(data['embedding'])
-                print(f"    📊 Embedding size: {embedding_len}")
+                print(f"    📊 Embedding size: {len(embedding)}")
             print()
 
-            if provinsi.lower() == 'dki jakarta':
-                jakarta_count += 1
-
         print("=" * 60)
         print(f"📊 Summary:")
-        print(f"   • Total destinations: {len(docs)}")
-        print(f"   • Jakarta destinations: {jakarta_count}")
-        print(f"   • Destinations with embeddings: {sum(1 for doc in docs if 'embedding' in doc.to_dict())}")
+        print(f"   • Total destinations: {total}")
+        print(f"   • Jakarta destinations: {results['jakarta'].value}")
+        print(f"   • Destinations with embeddings: {results['embeddings'].value}")
+        if results['inline'].value:
+            print(f"   • Legacy inline embeddings: {results['inline'].value} (run scripts/migrate-embeddings.py)")
 
-        if len(docs) >= 10:
+        if total >= 10:
             print("✅ Import test PASSED - Data successfully imported!")
             return True
         else:
-            print(f"❌ Import test FAILED - Expected at least 10 destinations, got {len(docs)}")
+            print(f"❌ Import test FAILED - Expected at least 10 destinations, got {total}")
             return False
 
     except Exception as e:
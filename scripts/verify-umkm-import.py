@@ -8,6 +8,13 @@ import os
 from dotenv import load_dotenv
 from firebase_admin import initialize_app, firestore, credentials
 
+from catalog_stats import load_stats
+from collection_checks import count, count_by, embedding_count, inline_embedding_count, run_checks, sample
+from search_tokens import find_by_name
+
+YOGYAKARTA_PROVINCES = ['DI Yogyakarta', 'Yogyakarta', 'Daerah Istimewa Yogyakarta']
+FAMOUS_UMKM = ['Gudeg Yu Djum', 'Batik Keris Jogja', 'Perak Kotagede Indah']
+
 def verify_umkm_import():
     """Verify the imported UMKM data"""
     print("🔍 Verifying UMKM Import...")
@@ -23,28 +30,45 @@ def verify_umkm_import():
         initialize_app(cred)
         db = firestore.client()
 
-        # Query UMKM collection
+        # Counts come from aggregation queries; only the listed rows are read
         umkm_ref = db.collection('umkm')
-        docs = list(umkm_ref.limit(35).get())  # Get up to 35 to see if more than 30
+        stats = load_stats(db, 'umkm')
+        checks = {
+            'total': lambda: count(umkm_ref),
+            'yogyakarta': lambda: count(umkm_ref.where('provinsi', 'in', YOGYAKARTA_PROVINCES)),
+            'embeddings': lambda: embedding_count(db, 'umkm'),
+            'inline': lambda: inline_embedding_count(db, 'umkm'),
+            'rows': lambda: sample(umkm_ref, ['name', 'category', 'rating', 'provinsi'], limit=35),
+        }
+        checks.update({name: (lambda name=name: bool(find_by_name(umkm_ref, name, limit=1))) for name in FAMOUS_UMKM})
+        results = run_checks(checks)
+        errors = {name: result.error for name, result in results.items() if result.error}
+        if errors:
+            for name, error in errors.items():
+                print(f"❌ {name} check failed: {error}")
+            return False
 
-        print(f"✅ Found {len(docs)} UMKM documents in Firestore")
+        total = results['total'].value
+        yogyakarta_umkm = results['yogyakarta'].value
+        has_embeddings = results['embeddings'].value
+        # Categories from the import's summary document, else those of the listed rows
+        if stats and stats.get('byCategory'):
+            category_counts = stats['byCategory']
+        else:
+            categories = {data['category'] for _, data in results['rows'].value if data.get('category')}
+            category_counts = count_by(umkm_ref, 'category', sorted(categories))
+        print(f"✅ Found {total} UMKM documents in Firestore")
 
-        if len(docs) == 0:
+        if total == 0:
             print("❌ No UMKM documents found!")
             return False
 
-        # Group by category
-        categories = {}
-        jakarta_umkm = 0
-        has_embeddings = 0
-
         print("\n📍 Imported UMKM:")
         print("-" * 80)
         print(f"{'No.':<3} {'Name':<25} {'Category':<12} {'Rating':<6} {'Provinsi':<12}")
         print("-" * 80)
 
-        for i, doc in enumerate(docs, 1):
-            data = doc.to_dict()
+        for i, (_, data) in enumerate(results['rows'].value, 1):
             name = data.get('name', 'Unknown')[:24]
             category = data.get('category', 'Unknown')[:11]
             rating = data.get('rating', 0)
@@ -52,52 +76,43 @@ def verify_umkm_import():
 
             print(f"{i:<3} {name:<25} {category:<12} {rating:<6} {provinsi:<12}")
 
-            # Count categories
-            categories[category] = categories.get(category, 0) + 1
-
-            # Count Yogyakarta UMKM
-            if 'Yogyakarta' in str(provinsi) or 'DI Yogyakarta' in str(provinsi):
-                jakarta_umkm += 1
-
-            # Check embeddings
-            if 'embedding' in data and len(data['embedding']) > 0:
-                has_embeddings += 1
-
         print("-" * 80)
 
         # Show summary
         print(f"\n📊 Summary:")
-        print(f"   • Total UMKM: {len(docs)}")
-        print(f"   • Yogyakarta UMKM: {jakarta_umkm}")
+        print(f"   • Total UMKM: {total}")
+        print(f"   • Yogyakarta UMKM: {yogyakarta_umkm}")
         print(f"   • UMKM with embeddings: {has_embeddings}")
-        print(f"   • Categories: {len(categories)}")
+        if results['inline'].value:
+            print(f"   • Legacy inline embeddings: {results['inline'].value} (run scripts/migrate-embeddings.py)")
+        print(f"   • Categories: {len(category_counts)}")
 
         print(f"\n📂 Category Breakdown:")
-        for cat, count in sorted(categories.items()):
-            print(f"   • {cat}: {count} UMKM")
+        for cat, n in sorted(category_counts.items()):
+            print(f"   • {cat}: {n} UMKM")
 
         # Check specific famous ones
         print(f"\n🔍 Checking specific UMKM:")
-        famous_umkm = ['Gudeg Yu Djum', 'Batik Keris Jogja', 'Perak Kotagede Indah']
-        for name in famous_umkm:
-            query = umkm_ref.where('name', '>=', name).where('name', '<=', name + '\uf8ff').limit(1)
-            results = list(query.stream())
-            status = "✅ FOUND" if results else "❌ NOT FOUND"
+        for name in FAMOUS_UMKM:
+            status = "✅ FOUND" if results[name].value else "❌ NOT FOUND"
             print(f"   • {name}: {status}")
 
-        success = len(docs) >= 30 and has_embeddings >= 30 and jakarta_umkm >= 30
+        elapsed = max(result.seconds for result in results.values())
+        print(f"\n⏱️  {len(results)} checks in {elapsed:.2f}s")
+
+        success = total >= 30 and has_embeddings >= 30 and yogyakarta_umkm >= 30
 
         if success:
             print(f"\n✅ UMKM Import Verification PASSED!")
             print("   🎉 All 30 UMKM successfully imported with embeddings!")
         else:
             print(f"\n❌ UMKM Import Verification FAILED!")
-            if len(docs) < 30:
-                print(f"   Expected 30 UMKM, found {len(docs)}")
+            if total < 30:
+                print(f"   Expected 30 UMKM, found {total}")
             if has_embeddings < 30:
                 print(f"   Expected 30 with embeddings, found {has_embeddings}")
-            if jakarta_umkm < 30:
-                print(f"   Expected 30 Yogyakarta UMKM, found {jakarta_umkm}")
+            if yogyakarta_umkm < 30:
+                print(f"   Expected 30 Yogyakarta UMKM, found {yogyakarta_umkm}")
 
         return success
 
@@ -2,6 +2,7 @@
 // Based on Firestore Collections Schema
 
 import { Timestamp } from 'firebase/firestore';
+import type { Bytes, VectorValue } from 'firebase/firestore';
 
 // Base types
 export type PriceRange = 'murah' | 'sedang' | 'mahal';
@@ -40,6 +41,14 @@ export interface TicketPricing {
   notes?: string; // Additional pricing notes
 }
 
+// Embeddings as the import scripts store them (scripts/embedding_codec.py):
+// a number array, little-endian float32/float16 bytes or a Firestore vector.
+// The Admin SDK returns bytes as a Buffer, the web SDK as Bytes.
+// They live in destination_embeddings / umkm_embeddings under the catalog
+// document's ID; catalog documents only carry them until migrated.
+export type EmbeddingEncoding = 'array' | 'float32' | 'float16' | 'vector';
+export type StoredEmbedding = number[] | Bytes | Uint8Array | VectorValue;
+
 // Firestore Document Base
 export interface FirestoreDoc {
   id?: string; // Auto-generated by Firestore
@@ -48,7 +57,22 @@ export interface FirestoreDoc {
 }
 
 // Destinations Collection
-export interface Destination extends FirestoreDoc {
+// Geohash cells written by the importers (scripts/geo_cells.py, lib/geo-cells.ts)
+export interface GeoCells {
+  geohash?: string; // Precision 9
+  geohash3?: string;
+  geohash4?: string;
+  geohash5?: string;
+  geohash6?: string;
+}
+
+// Search tokens written by the importers (scripts/search_tokens.py, lib/search-tokens.ts)
+export interface SearchTokens {
+  searchTokens?: string[];
+  searchPrefixes?: string[];
+}
+
+export interface Destination extends FirestoreDoc, GeoCells, SearchTokens {
   name: string;
   category: Category;
   latitude: number;
@@ -69,10 +93,12 @@ export interface Destination extends FirestoreDoc {
   transport_modes?: TransportMode[]; // Available transport options
   best_visit_times?: string[]; // Best times to visit
   ticket_pricing?: TicketPricing; // Specific ticket prices
+  embedding?: StoredEmbedding; // Legacy inline copy, decode with lib/embedding-codec.ts
+  embeddingEncoding?: EmbeddingEncoding; // Absent for plain arrays
 }
 
 // UMKM Collection
-export interface UMKM extends FirestoreDoc {
+export interface UMKM extends FirestoreDoc, GeoCells, SearchTokens {
   name: string;
   category: 'batik' | 'kuliner' | 'kerajinan';
   latitude: number;
@@ -81,6 +107,38 @@ export interface UMKM extends FirestoreDoc {
   phone: string;
   whatsapp: string;
   verified: boolean;
+  embedding?: StoredEmbedding; // Legacy inline copy
+  embeddingEncoding?: EmbeddingEncoding;
+}
+
+// destination_embeddings/{id} and umkm_embeddings/{id}
+export interface EmbeddingDoc {
+  embedding: StoredEmbedding;
+  embeddingEncoding?: EmbeddingEncoding;
+}
+
+// _catalog/{collection}: the catalog generation readers are pointed at
+// (written by scripts/catalog_generations.py)
+export interface CatalogPointer {
+  generation: string | null;
+  collection: string;
+  faissIndex: string | null; // Relative to FAISS_INDEX_PATH
+  previous?: string | null;
+}
+
+// _stats/{collection}: counts written at import time (scripts/catalog_stats.py)
+export interface CatalogStats {
+  collection: string;
+  count: number;
+  byProvinsi?: Record<string, number>;
+  byCategory?: Record<string, number>;
+  byKotaKabupaten?: Record<string, number>;
+  byPriceRange?: Record<string, number>;
+  rating?: { edges: number[]; counts: number[]; mean: number | null };
+  culturalCount?: number;
+  geoIndexed?: boolean; // Every document with coordinates has geohash cells
+  searchIndexed?: boolean; // Every document has search tokens
+  taxonomy?: { category: string; count: number; culturalCount?: number; provinces?: string[] }[];
 }
 
 // Users Collection (extends Firebase Auth)